@@ -0,0 +1,189 @@
+import os
+import json
+import time
+import fcntl
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+# download cache for the mono/gecko/dxvk archives. each file keeps the server's ETag and Last-Modified
+# next to it, once the ttl runs out we ask the server with a conditional GET and a 304 costs no body
+# with PSO_SHARED_CACHE_DIR set, downloads land in a machine wide cache instead and every user reads from it.
+# one flock per file makes downloads single flight, everyone else waits and then finds it fresh
+# zeroz/tj
+
+# seconds a cached file is trusted before asking the server again, PSO_CACHE_TTL overrides. 0 always asks
+DEFAULT_TTL = 7 * 24 * 3600
+# anything smaller is an error page or a cut off download
+MIN_SIZE = 1024
+FETCH_TIMEOUT = 60
+
+# published files are read by every user of the shared cache
+SHARED_FILE_MODE = 0o644
+
+class ArtifactError(Exception):
+    """Download failed and there is no usable cached copy"""
+    pass
+
+def get_cache_ttl():
+    try:
+        return max(0, int(os.environ.get('PSO_CACHE_TTL', DEFAULT_TTL)))
+    except ValueError:
+        return DEFAULT_TTL
+
+def get_shared_cache_dir():
+    return os.environ.get('PSO_SHARED_CACHE_DIR') or None
+
+class ArtifactCache:
+    def __init__(self, cache_dir, ttl=None, shared_dir=None):
+        self.cache_dir = cache_dir
+        self.ttl = get_cache_ttl() if ttl is None else ttl
+        self.shared_dir = shared_dir if shared_dir != cache_dir else None
+
+    def meta_path(self, path):
+        return f"{path}.meta.json"
+
+    def load_meta(self, path):
+        try:
+            with open(self.meta_path(path)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_meta(self, path, meta):
+        tmp_path = self._temp_file(path)
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self.meta_path(path))
+
+    def _temp_file(self, path):
+        """Unique temp file next to path, so concurrent writers never share one and rename stays atomic"""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+        # mkstemp makes it 0600, the shared cache needs it readable by everyone once published
+        os.fchmod(fd, SHARED_FILE_MODE)
+        os.close(fd)
+        return tmp_path
+
+    @contextmanager
+    def _locked(self, path):
+        """Exclusive flock per cache entry. Whoever gets it first downloads, the rest wait for them"""
+        # read only is enough for flock, and works on a lock file another user created
+        lock_fd = os.open(os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.lock"),
+                          os.O_RDONLY | os.O_CREAT, 0o644)
+        try:
+            try:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                print(f"Waiting for another download of {os.path.basename(path)}...")
+                fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(lock_fd)
+
+    def _is_fresh(self, path, url):
+        if not (os.path.isfile(path) and os.path.getsize(path) >= MIN_SIZE):
+            return False
+        meta = self.load_meta(path)
+        return bool(meta and meta.get("url") == url and time.time() - meta.get("checked", 0) < self.ttl)
+
+    def fetch(self, url, filename):
+        """Path of the cached file for url, plus how we got it: fresh, revalidated, downloaded, stale or shared"""
+        path, state = self._fetch(url, filename)
+        self.touch(path)
+        return path, state
+
+    def touch(self, path):
+        """Stamp the entry's last use for the cache gc's lru order"""
+        meta = self.load_meta(path)
+        if meta is None:
+            return
+        meta["last_used"] = time.time()
+        try:
+            self.save_meta(path, meta)
+        except OSError:
+            # a shared cache we can only read, its owner's gc goes by their own uses
+            pass
+
+    def _fetch(self, url, filename):
+        if self.shared_dir:
+            user_path = os.path.join(self.cache_dir, filename)
+            if self._is_fresh(user_path, url):
+                return user_path, "fresh"
+            os.makedirs(self.shared_dir, exist_ok=True)
+            if os.access(self.shared_dir, os.W_OK):
+                return self._fetch_into(self.shared_dir, url, filename)
+            # can't write to the shared cache, still read from it before downloading our own copy
+            shared_path = os.path.join(self.shared_dir, filename)
+            if os.path.isfile(shared_path) and os.path.getsize(shared_path) >= MIN_SIZE:
+                return shared_path, "shared"
+        return self._fetch_into(self.cache_dir, url, filename)
+
+    def _fetch_into(self, cache_dir, url, filename):
+        os.makedirs(cache_dir, exist_ok=True)
+        path = os.path.join(cache_dir, filename)
+        with self._locked(path):
+            return self._fetch_locked(path, url)
+
+    def _fetch_locked(self, path, url):
+        cached = os.path.isfile(path) and os.path.getsize(path) >= MIN_SIZE
+        meta = self.load_meta(path) if cached else None
+        if meta and meta.get("url") != url:
+            # same file name from somewhere else, the validators mean nothing
+            meta = None
+        # also true when someone else finished the download while we waited on the lock
+        if meta and time.time() - meta.get("checked", 0) < self.ttl:
+            return path, "fresh"
+
+        headers = {}
+        if cached:
+            if meta and meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            # files cached before we kept metadata still have an mtime to go by
+            from email.utils import formatdate
+            headers["If-Modified-Since"] = (meta or {}).get("last_modified") or formatdate(os.path.getmtime(path), usegmt=True)
+
+        try:
+            state = self._get(url, path, headers)
+        except ArtifactError:
+            if cached:
+                # offline or the server is down. an old archive beats no install
+                return path, "stale"
+            raise
+        return path, state
+
+    def _get(self, url, path, headers):
+        # urllib pulls in http/email/ssl. only pay for it when we actually talk to a server
+        import urllib.request
+        import urllib.error
+        request = urllib.request.Request(url, headers=headers)
+        tmp_path = self._temp_file(path)
+        try:
+            with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+                with open(tmp_path, "wb") as f:
+                    shutil.copyfileobj(response, f, 1 << 20)
+                response_headers = response.headers
+            if os.path.getsize(tmp_path) < MIN_SIZE:
+                raise ArtifactError(f"{url} returned only {os.path.getsize(tmp_path)} bytes")
+            os.replace(tmp_path, path)
+            state = "downloaded"
+        except urllib.error.HTTPError as e:
+            if e.code != 304:
+                raise ArtifactError(f"{url}: HTTP {e.code} {e.reason}")
+            # not modified, keep the file. servers may send fresh validators with the 304
+            response_headers = e.headers
+            state = "revalidated"
+        except (urllib.error.URLError, OSError) as e:
+            raise ArtifactError(f"{url}: {getattr(e, 'reason', e)}")
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        old = (self.load_meta(path) or {}) if state == "revalidated" else {}
+        self.save_meta(path, {
+            "url": url,
+            "etag": response_headers.get("ETag") or old.get("etag"),
+            "last_modified": response_headers.get("Last-Modified") or old.get("last_modified"),
+            "checked": time.time(),
+            "size": os.path.getsize(path),
+        })
+        return state
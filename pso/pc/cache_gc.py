@@ -0,0 +1,176 @@
+import os
+import json
+import time
+import fcntl
+import shutil
+from prefix_status import get_state_dir
+
+# size capped lru cleanup for the artifact cache. each prefix keeps a journal of the artifacts it
+# was installed from, and the cache keeps a list of prefixes that used it, so gc knows what a live
+# prefix might still need for a repair and only evicts the rest, oldest use first
+# zeroz/tj
+
+# PSO_CACHE_MAX_MB overrides
+DEFAULT_MAX_MB = 1024
+JOURNAL_NAME = "install_journal.json"
+# prefixes that fetched from this cache, with the artifacts each used as a fallback when
+# their journal can't be read (another user's prefix on a shared cache)
+REGISTRY_NAME = "prefixes.json"
+
+def get_cache_cap_bytes(max_mb=None):
+    if max_mb is None:
+        try:
+            max_mb = float(os.environ.get('PSO_CACHE_MAX_MB', DEFAULT_MAX_MB))
+        except ValueError:
+            max_mb = DEFAULT_MAX_MB
+    return int(max_mb * 1024 * 1024)
+
+def _load_json(path, default):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def _write_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+def record_use(prefix_path, cache_dir, filename, url):
+    """Note in the prefix's journal that it was installed from this artifact, and register the prefix with the cache"""
+    journal_path = os.path.join(get_state_dir(prefix_path), JOURNAL_NAME)
+    os.makedirs(os.path.dirname(journal_path), exist_ok=True)
+    journal = _load_json(journal_path, {"artifacts": {}})
+    journal["artifacts"][filename] = {"url": url, "cache_dir": cache_dir, "used": time.time()}
+    _write_json(journal_path, journal)
+
+    registry_path = os.path.join(cache_dir, REGISTRY_NAME)
+    # several installs can register at once on a shared cache
+    with open(f"{registry_path}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        registry = _load_json(registry_path, {})
+        registry[prefix_path] = sorted(name for name, entry in journal["artifacts"].items()
+                                       if entry.get("cache_dir") == cache_dir)
+        _write_json(registry_path, registry)
+
+def referenced_artifacts(cache_dir):
+    """{artifact: [prefixes]} for prefixes that still exist. Dead prefixes are dropped from the registry"""
+    registry_path = os.path.join(cache_dir, REGISTRY_NAME)
+    registry = _load_json(registry_path, {})
+    referenced = {}
+    live = {}
+    for prefix_path, fallback in registry.items():
+        try:
+            if not os.path.isdir(prefix_path):
+                continue
+            journal = _load_json(os.path.join(get_state_dir(prefix_path), JOURNAL_NAME), None)
+        except PermissionError:
+            journal = None
+        if journal is None:
+            names = fallback
+        else:
+            names = [name for name, entry in journal.get("artifacts", {}).items() if entry.get("cache_dir") == cache_dir]
+        live[prefix_path] = names
+        for name in names:
+            referenced.setdefault(name, []).append(prefix_path)
+    if live != registry and os.access(cache_dir, os.W_OK):
+        _write_json(registry_path, live)
+    return referenced
+
+def _size(path):
+    if not os.path.isdir(path) or os.path.islink(path):
+        return os.lstat(path).st_size
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+def scan_cache(cache_dir):
+    """One entry per artifact (file plus its metadata) or leftover folder, with size and last use"""
+    entries = []
+    if not cache_dir or not os.path.isdir(cache_dir):
+        return entries
+    for name in os.listdir(cache_dir):
+        # locks, temp files, metadata sidecars and our own bookkeeping belong to an entry or to nobody
+        if name.startswith(".") or name.endswith((".meta.json", ".tmp", ".lock")) or name == REGISTRY_NAME:
+            continue
+        path = os.path.join(cache_dir, name)
+        meta = _load_json(f"{path}.meta.json", {})
+        try:
+            size = _size(path)
+            last_used = meta.get("last_used") or os.stat(path).st_mtime
+        except OSError:
+            continue
+        entries.append({"name": name, "path": path, "bytes": size, "last_used": last_used,
+                        "dir": os.path.isdir(path)})
+    return sorted(entries, key=lambda e: e["last_used"])
+
+def cache_stats(cache_dir, max_bytes=None):
+    entries = scan_cache(cache_dir)
+    referenced = referenced_artifacts(cache_dir) if entries else {}
+    for entry in entries:
+        entry["prefixes"] = referenced.get(entry["name"], [])
+    return {
+        "dir": cache_dir,
+        "bytes": sum(e["bytes"] for e in entries),
+        "cap_bytes": max_bytes if max_bytes is not None else get_cache_cap_bytes(),
+        "entries": entries,
+    }
+
+def _remove_entry(entry):
+    """Delete an artifact under its download lock, so a fetch in progress isn't pulled out from under"""
+    path = entry["path"]
+    if entry["dir"]:
+        shutil.rmtree(path, ignore_errors=True)
+        return True
+    lock_path = os.path.join(os.path.dirname(path), f".{entry['name']}.lock")
+    lock_fd = os.open(lock_path, os.O_RDONLY | os.O_CREAT, 0o644)
+    try:
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        for victim in (path, f"{path}.meta.json"):
+            if os.path.exists(victim):
+                os.remove(victim)
+        # lock file goes too, holding an unlinked lock is harmless
+        os.remove(lock_path)
+        return True
+    finally:
+        os.close(lock_fd)
+
+def collect_garbage(cache_dir, max_bytes=None, dry_run=False):
+    """Evict least recently used, unreferenced entries until the cache fits under the cap"""
+    stats = cache_stats(cache_dir, max_bytes)
+    cap = stats["cap_bytes"]
+    total = stats["bytes"]
+    result = {"dir": cache_dir, "before": total, "cap_bytes": cap, "evicted": [], "kept_referenced": 0}
+    # entries are oldest use first
+    for entry in stats["entries"]:
+        if total <= cap:
+            break
+        if entry["prefixes"]:
+            result["kept_referenced"] += 1
+            continue
+        if dry_run or _remove_entry(entry):
+            total -= entry["bytes"]
+            result["evicted"].append({"name": entry["name"], "bytes": entry["bytes"]})
+    result["after"] = total
+    return result
+
+def format_stats(stats):
+    lines = [f"Cache: {stats['dir']}",
+             f"{stats['bytes'] / 1048576:.1f} MB of {stats['cap_bytes'] / 1048576:.0f} MB cap, "
+             f"{len(stats['entries'])} entries (least recently used first)"]
+    for entry in stats["entries"]:
+        used = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["last_used"]))
+        refs = f", used by {len(entry['prefixes'])} prefix{'es' if len(entry['prefixes']) != 1 else ''}" \
+            if entry["prefixes"] else ""
+        lines.append(f"  {entry['name']:<40} {entry['bytes'] / 1048576:8.1f} MB  last used {used}{refs}")
+    return "\n".join(lines)
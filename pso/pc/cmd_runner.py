@@ -1,4 +1,5 @@
 import os
+import sys
 import select
 import pty
 import errno
@@ -13,6 +14,96 @@ from contextlib import contextmanager
 class ProcessTimeoutError(Exception):
     pass
 
+class CommandResult(int):
+    """Exit code of a command plus what it cost. Still an int, so `if run_command(...) != 0` keeps working"""
+    def __new__(cls, returncode, command=None, wall_time=0.0, rusage=None, timed_out=False, killed=False, output=None):
+        result = super().__new__(cls, returncode)
+        result.returncode = returncode
+        result.command = list(command or [])
+        result.wall_time = wall_time
+        result.timed_out = timed_out
+        result.killed = killed
+        result.output = output
+        # rusage of the child and every descendant it waited for. wineserver forks off on its own, so it isn't in here
+        result.user_time = rusage.ru_utime if rusage else 0.0
+        result.system_time = rusage.ru_stime if rusage else 0.0
+        # linux reports kilobytes, macos bytes
+        result.max_rss_kb = (rusage.ru_maxrss // 1024 if sys.platform == "darwin" else rusage.ru_maxrss) if rusage else 0
+        result.voluntary_switches = rusage.ru_nvcsw if rusage else 0
+        result.involuntary_switches = rusage.ru_nivcsw if rusage else 0
+        return result
+
+    @property
+    def name(self):
+        if not self.command:
+            return "?"
+        name = os.path.basename(str(self.command[0]))
+        # "wine reg add ..." is more useful than just "wine"
+        if name == "wine" and len(self.command) > 1:
+            name = f"wine {os.path.basename(str(self.command[1]))}"
+        return name
+
+    def as_dict(self):
+        return {
+            "command": self.name,
+            "returncode": self.returncode,
+            "wall_time": round(self.wall_time, 3),
+            "user_time": round(self.user_time, 3),
+            "system_time": round(self.system_time, 3),
+            "max_rss_kb": self.max_rss_kb,
+            "voluntary_switches": self.voluntary_switches,
+            "involuntary_switches": self.involuntary_switches,
+            "timed_out": self.timed_out,
+            "killed": self.killed,
+        }
+
+    def summary(self):
+        state = " (timed out)" if self.timed_out else " (killed)" if self.killed else ""
+        return (f"{self.name}: exit {self.returncode}{state}, {self.wall_time:.2f}s wall, {self.user_time:.2f}s user, "
+                f"{self.system_time:.2f}s sys, {self.max_rss_kb / 1024:.0f} MB max RSS, "
+                f"{self.voluntary_switches}/{self.involuntary_switches} ctx switches")
+
+    def __str__(self):
+        # messages like "exit code {result}" should still read as a plain number
+        return str(self.returncode)
+
+    def __repr__(self):
+        return f"CommandResult({self.returncode}, {self.name!r}, wall_time={self.wall_time:.3f})"
+
+def _exit_code(status):
+    """Wait status to a Popen style returncode, negative for a signal. os.waitstatus_to_exitcode is 3.9+"""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+def wait_for_exit(pid, timeout):
+    """Block until pid exits or timeout passes, without reaping it so wait4 still gets the rusage"""
+    if timeout is None:
+        os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT)
+        return True
+    if hasattr(os, "pidfd_open"):
+        try:
+            pidfd = os.pidfd_open(pid)
+        except OSError:
+            # kernel older than 5.3, fall through to polling
+            pidfd = None
+        if pidfd is not None:
+            try:
+                return bool(select.select([pidfd], [], [], timeout)[0])
+            finally:
+                os.close(pidfd)
+    # macos and old kernels: back off like Popen.wait does
+    deadline = time.monotonic() + timeout
+    delay = 0.0005
+    while True:
+        if os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT | os.WNOHANG) is not None:
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        delay = min(delay * 2, remaining, 0.05)
+        time.sleep(delay)
+
 class CommandRunner:
     @contextmanager
     def process_timeout(self, seconds):
@@ -26,9 +117,77 @@ class CommandRunner:
         finally:
             signal.alarm(0)
             
+    def run_probe(self, command, timeout=10, env=None):
+        """Run a short non-interactive check on plain pipes. Returns a CommandResult with .output set"""
+        # no pty and no preexec_fn, so subprocess can take the vfork path instead of a full fork
+        started = time.monotonic()
+        try:
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                close_fds=True,
+                env=env,
+                start_new_session=True
+            )
+        except OSError as e:
+            # missing binary, same as a shell would report it
+            return CommandResult(127, command, time.monotonic() - started, output=str(e))
+
+        chunks = []
+        fd = process.stdout.fileno()
+        reaped = None
+        timed_out = False
+        eof = False
+        try:
+            while reaped is None:
+                remaining = None if timeout is None else timeout - (time.monotonic() - started)
+                if remaining is not None and remaining <= 0:
+                    timed_out = True
+                    # own session, so this takes anything it started along with it
+                    try:
+                        os.killpg(process.pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+                    _, status, rusage = os.wait4(process.pid, 0)
+                    reaped = (1, rusage)
+                    break
+                if not eof:
+                    ready, _, _ = select.select([fd], [], [], 0.05 if remaining is None else min(0.05, remaining))
+                    if ready:
+                        data = os.read(fd, 65536)
+                        if data:
+                            chunks.append(data)
+                            continue
+                        eof = True
+                elif not wait_for_exit(process.pid, remaining):
+                    # timed out, the top of the loop kills it
+                    continue
+                # don't wait for EOF. wine can leave wineserver holding the pipe long after the command is done
+                pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+                if pid:
+                    reaped = (_exit_code(status), rusage)
+            # whatever the child wrote right before exiting
+            while not eof and select.select([fd], [], [], 0)[0]:
+                data = os.read(fd, 65536)
+                if not data:
+                    break
+                chunks.append(data)
+        finally:
+            process.stdout.close()
+        process.returncode = reaped[0]
+        return CommandResult(reaped[0], command, time.monotonic() - started, reaped[1], timed_out=timed_out,
+                             killed=timed_out, output=b"".join(chunks).decode("utf-8", "ignore"))
+
     def run_command(self, command, timeout=60, env=None, capture_output=False):
+        """Run command on a pty. Returns a CommandResult, or (CommandResult, output) with capture_output"""
         print(f"Debug - Running command: {command}")
         output_buffer = []
+        started = time.monotonic()
+        reaped = None
+        timed_out = False
+        killed = False
 
         def kill_process_tree(pid):
             try:
@@ -48,6 +207,29 @@ class CommandRunner:
             except Exception as e:
                 print(f"Error killing process tree: {e}")
 
+        def reap(block=False):
+            # wait4 instead of Popen.poll so we get the child's rusage along with its status
+            nonlocal reaped
+            if reaped is None and process is not None:
+                try:
+                    pid, status, rusage = os.wait4(process.pid, 0 if block else os.WNOHANG)
+                except ChildProcessError:
+                    return reaped
+                if pid:
+                    reaped = (_exit_code(status), rusage)
+                    process.returncode = reaped[0]
+            return reaped
+
+        def finish(returncode=None):
+            if reaped is None and process is not None:
+                reap(block=True)
+            if returncode is None:
+                returncode = reaped[0] if reaped else 1
+            result = CommandResult(returncode, command, time.monotonic() - started, reaped[1] if reaped else None,
+                                   timed_out=timed_out, killed=killed,
+                                   output=''.join(output_buffer) if capture_output else None)
+            return (result, result.output) if capture_output else result
+
         master_fd, slave_fd = pty.openpty()
         process = None
         try:
@@ -61,13 +243,13 @@ class CommandRunner:
             )
             os.close(slave_fd)
             
-            start_time = time.time()
             while True:
-                if timeout is not None and time.time() - start_time > timeout:
+                if timeout is not None and time.monotonic() - started > timeout:
                     print(f"Command timed out after {timeout} seconds")
-                    if process:
-                        kill_process_tree(process.pid)
-                    return (1, '') if capture_output else 1
+                    timed_out = True
+                    killed = True
+                    kill_process_tree(process.pid)
+                    return finish(1)
                     
                 try:
                     ready, _, _ = select.select([master_fd], [], [], 1.0)
@@ -84,26 +266,51 @@ class CommandRunner:
                             if e.errno != errno.EIO:
                                 raise
                             break
-                    elif process.poll() is not None:
+                    elif reap() is not None:
                         break
                 except (select.error, OSError) as e:
-                    if process.poll() is not None:
+                    if reap() is not None:
                         break
                     print(f"Error during command execution: {e}")
                     break
 
-            if process.poll() is None:
+            # the pty reads EOF as the child closes it, which is usually a moment before it exits
+            grace_deadline = time.monotonic() + 2
+            while reap() is None and time.monotonic() < grace_deadline:
+                time.sleep(0.01)
+            if reaped is None:
+                killed = True
                 kill_process_tree(process.pid)
-                return (1, '') if capture_output else 1
+                return finish(1)
                 
-            if capture_output:
-                return process.returncode if process.returncode is not None else 1, ''.join(output_buffer)
-            return process.returncode if process.returncode is not None else 1
+            return finish()
             
         except Exception as e:
             print(f"Error during command execution: {e}")
             if process:
+                killed = True
                 kill_process_tree(process.pid)
-            return (1, '') if capture_output else 1
+            return finish(1)
         finally:
-            os.close(master_fd)
\ No newline at end of file
+            os.close(master_fd)
+
+def benchmark_spawn(command, count=50):
+    """Median and mean seconds per spawn of command through run_command's pty path and run_probe"""
+    import io
+    import statistics
+    from contextlib import redirect_stdout
+    runner = CommandRunner()
+    timings = {}
+    for mode in ("pty", "probe"):
+        samples = []
+        for _ in range(count):
+            started = time.perf_counter()
+            if mode == "pty":
+                # run_command announces and echoes every command, keep that out of the numbers
+                with redirect_stdout(io.StringIO()):
+                    runner.run_command(command, timeout=30, capture_output=True)
+            else:
+                runner.run_probe(command, timeout=30)
+            samples.append(time.perf_counter() - started)
+        timings[mode] = {"median": statistics.median(samples), "mean": statistics.mean(samples)}
+    return timings
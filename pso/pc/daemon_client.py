@@ -0,0 +1,98 @@
+import os
+import stat
+
+# client side of the pso_wine daemon (pso_daemon.py). launch.py imports this on every click,
+# so socket and json only get imported once there's actually a socket to talk to
+# zeroz/tj
+
+# the parts of the caller's environment the daemon needs to run installs and put the game on the
+# caller's display and audio session. everything else (tokens, agent sockets) stays in this process
+ENV_KEYS = ("HOME", "USER", "LOGNAME", "PATH", "LANG", "LANGUAGE", "TZ", "DISPLAY", "WAYLAND_DISPLAY",
+            "XAUTHORITY", "DBUS_SESSION_BUS_ADDRESS", "PULSE_SERVER", "PULSE_SINK", "LD_LIBRARY_PATH")
+ENV_PREFIXES = ("LC_", "XDG_", "WINE", "PSO_", "DXVK_", "VKD3D_", "VK_", "MESA_", "RADV_", "__GL_", "__NV_",
+                "SDL_", "PIPEWIRE_", "STAGING_")
+
+class DaemonError(Exception):
+    """Daemon not reachable or refused to start"""
+    pass
+
+def get_socket_path():
+    if 'PSO_DAEMON_SOCKET' in os.environ:
+        return os.environ['PSO_DAEMON_SOCKET']
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, "pso_wine.sock")
+    # no runtime dir: a 0700 directory of our own, never a bare socket in /tmp someone else could create first
+    return os.path.join("/tmp", f"pso_wine-{os.getuid()}", "pso_wine.sock")
+
+def _is_private(st):
+    return st.st_uid == os.getuid() and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+def socket_dir_trusted(socket_path):
+    """The directory holding the socket is ours and nobody else can put things in it"""
+    try:
+        st = os.stat(os.path.dirname(os.path.abspath(socket_path)))
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and _is_private(st)
+
+def socket_trusted(socket_path):
+    """Socket and directory belong to us, so nobody else can be listening on the other end"""
+    try:
+        st = os.lstat(socket_path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and _is_private(st) and socket_dir_trusted(socket_path)
+
+def client_env(environ=None):
+    """The environment keys a request actually sends"""
+    environ = os.environ if environ is None else environ
+    return {key: value for key, value in environ.items() if key in ENV_KEYS or key.startswith(ENV_PREFIXES)}
+
+def daemon_available():
+    """Cheap check, PSO_NO_DAEMON=1 forces everything to run locally"""
+    return not os.environ.get('PSO_NO_DAEMON') and socket_trusted(get_socket_path())
+
+def _peer_uid(sock):
+    """uid of the process on the other end, None where SO_PEERCRED doesn't exist"""
+    import socket
+    import struct
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)[1]
+
+def request(action, payload=None, on_output=None):
+    """Send one request and return the daemon's result dict, or None if nothing is listening"""
+    import json
+    import socket
+
+    socket_path = get_socket_path()
+    if not socket_trusted(socket_path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        peer_uid = _peer_uid(sock)
+    except OSError:
+        sock.close()
+        return None
+    if peer_uid is not None and peer_uid != os.getuid():
+        sock.close()
+        print(f"Warning: {socket_path} is served by uid {peer_uid}, not us. Running locally")
+        return None
+
+    with sock:
+        message = {"action": action}
+        message.update(payload or {})
+        sock.sendall((json.dumps(message) + "\n").encode())
+        # one json object per line. output lines stream until the final result
+        with sock.makefile("rb") as reader:
+            for line in reader:
+                reply = json.loads(line)
+                if "output" in reply:
+                    if on_output:
+                        on_output(reply["output"])
+                elif "result" in reply:
+                    return reply["result"]
+    raise DaemonError(f"Daemon closed the connection during '{action}'")
@@ -0,0 +1,140 @@
+import os
+
+# managed dxvk.conf next to PsoBB.exe. the preset picked with --dxvk-preset is remembered in the prefix,
+# the file carries the hash of what we wrote so regenerating is a no-op unless the preset changed.
+# only os at import time, launch.py reads the remembered config path on the fast path
+# zeroz/tj
+
+# PSOBB goes through d3d8to9, so only dxvk's d3d9 options matter
+DXVK_PRESETS = {
+    "default": {
+        "description": "DXVK's own defaults, the game's vsync setting decides",
+        "options": {},
+    },
+    "low-latency": {
+        "description": "One queued frame, vsync off, no cap",
+        "options": {
+            "d3d9.maxFrameLatency": 1,
+            "d3d9.presentInterval": 0,
+            "d3d9.maxFrameRate": 0,
+        },
+    },
+    "capped-60": {
+        "description": "Vsync off with a 60 FPS cap, steady frame pacing without vsync latency",
+        "options": {
+            "d3d9.maxFrameLatency": 1,
+            "d3d9.presentInterval": 0,
+            "d3d9.maxFrameRate": 60,
+        },
+    },
+    "vsync": {
+        "description": "Vsync forced on, two queued frames",
+        "options": {
+            "d3d9.maxFrameLatency": 2,
+            "d3d9.presentInterval": 1,
+        },
+    },
+    "low-memory": {
+        "description": "Report 1 GB of VRAM and evict managed textures, for iGPUs and old cards",
+        "options": {
+            "d3d9.maxAvailableMemory": 1024,
+            "d3d9.evictManagedOnUnlock": True,
+            "dxvk.maxChunkSize": 16,
+        },
+    },
+}
+
+DEFAULT_PRESET = "default"
+CONFIG_NAME = "dxvk.conf"
+# preset name, then the dxvk.conf path, in the prefix's .pso_wine folder
+PRESET_FILE = "dxvk_preset"
+HEADER = "# managed by pso_wine"
+
+class DxvkConfigError(Exception):
+    """Unknown preset or dxvk.conf can't be written"""
+    pass
+
+def _format_value(value):
+    if isinstance(value, bool):
+        return "True" if value else "False"
+    return str(value)
+
+def render_preset(name):
+    """dxvk.conf body for a preset, without the header"""
+    if name not in DXVK_PRESETS:
+        raise DxvkConfigError(f"Unknown DXVK preset '{name}'. Choose from: {', '.join(DXVK_PRESETS)}")
+    options = DXVK_PRESETS[name]["options"]
+    return "".join(f"{key} = {_format_value(value)}\n" for key, value in sorted(options.items()))
+
+def content_hash(body):
+    import hashlib
+    return hashlib.sha256(body.encode()).hexdigest()
+
+def read_preset(prefix_path):
+    """(preset name, dxvk.conf path) remembered for the prefix, (None, None) if never set"""
+    try:
+        with open(os.path.join(prefix_path, ".pso_wine", PRESET_FILE)) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None, None
+    return (lines[0] if lines else None), (lines[1] if len(lines) > 1 else None)
+
+def config_env(prefix_path):
+    """DXVK_CONFIG_FILE for a prefix with a managed dxvk.conf, else nothing"""
+    _, config_path = read_preset(prefix_path)
+    if config_path and os.path.isfile(config_path):
+        return {"DXVK_CONFIG_FILE": config_path}
+    return {}
+
+def write_config(prefix_path, install_dir, name=None):
+    """Write dxvk.conf for the preset (or the remembered one) and remember it. Returns (path, changed)"""
+    remembered, _ = read_preset(prefix_path)
+    name = name or remembered or DEFAULT_PRESET
+    body = render_preset(name)
+    digest = content_hash(body)
+    header = f"{HEADER}, preset {name}, sha256 {digest}\n"
+    config_path = os.path.join(install_dir, CONFIG_NAME)
+
+    try:
+        with open(config_path) as f:
+            current = f.read()
+    except FileNotFoundError:
+        current = None
+    except OSError as e:
+        raise DxvkConfigError(f"Could not read {config_path}: {e}")
+
+    changed = current != header + body
+    try:
+        if changed:
+            if current is not None and not _is_ours(current):
+                # a hand written or hand edited file, keep it around instead of silently replacing it
+                os.replace(config_path, f"{config_path}.bak")
+                print(f"Moved the existing {CONFIG_NAME} to {CONFIG_NAME}.bak")
+            tmp_path = f"{config_path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(header + body)
+            os.replace(tmp_path, config_path)
+        state_dir = os.path.join(prefix_path, ".pso_wine")
+        state = f"{name}\n{config_path}\n"
+        state_path = os.path.join(state_dir, PRESET_FILE)
+        if _read(state_path) != state:
+            os.makedirs(state_dir, exist_ok=True)
+            with open(state_path, "w") as f:
+                f.write(state)
+    except OSError as e:
+        raise DxvkConfigError(f"Could not write {config_path}: {e}")
+    return config_path, changed
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _is_ours(text):
+    """Our header, and a body that still hashes to what the header says"""
+    first, _, body = text.partition("\n")
+    if not first.startswith(HEADER) or " sha256 " not in first:
+        return False
+    return first.rsplit(" sha256 ", 1)[1].strip() == content_hash(body)
@@ -0,0 +1,41 @@
+import os
+import fcntl
+import shutil
+import hashlib
+
+# small file helpers shared by the bundle, snapshot, payload and verify code
+# zeroz/tj
+
+# linux FICLONE ioctl, shares extents on btrfs/xfs/bcachefs so the copy costs nothing until written
+FICLONE = 0x40049409
+
+def hash_file(path, algorithm="sha256", chunk_size=1 << 20):
+    """Hex digest of a file, read in chunks so big files never sit in memory"""
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def reflink_file(src, dst):
+    """Reflink src to dst. False (and no dst) when the filesystem can't"""
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        try:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+            return True
+        except OSError:
+            # different filesystems or no reflink support
+            pass
+    os.remove(dst)
+    return False
+
+def clone_file(src, dst):
+    """Copy src to dst as a reflink when the filesystem can, a normal copy otherwise. True if reflinked"""
+    if reflink_file(src, dst):
+        return True
+    # copyfile uses sendfile/copy_file_range on linux, still no trip through python
+    shutil.copyfile(src, dst)
+    return False
@@ -0,0 +1,123 @@
+import os
+
+# frame time log analysis. works offline on mangohud csv logs or plain one-value-per-line files
+# numpy is only needed here, so it's imported lazily
+# zeroz/tj
+
+class FrameLogError(Exception):
+    """Frame log missing, unreadable or empty"""
+    pass
+
+DEFAULT_STUTTER_MS = 50.0
+PERCENTILES = (50, 90, 95, 99, 99.9)
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise FrameLogError("numpy is required for frame analysis. Install it with: pip install numpy")
+    return numpy
+
+def find_latest_log(path):
+    """Accept a log file or a session folder. Folders resolve to their newest csv"""
+    if os.path.isfile(path):
+        return path
+    if not os.path.isdir(path):
+        raise FrameLogError(f"Frame log not found: {path}")
+    logs = []
+    for root, _, files in os.walk(path):
+        for name in files:
+            if name.endswith(".csv") and not name.endswith("_summary.csv"):
+                logs.append(os.path.join(root, name))
+    if not logs:
+        raise FrameLogError(f"No frame logs found in {path}")
+    return max(logs, key=os.path.getmtime)
+
+def load_frame_times(path):
+    """Return frame times in milliseconds as a numpy array"""
+    path = find_latest_log(path)
+    np = _numpy()
+
+    with open(path, errors="ignore") as f:
+        lines = f.read().splitlines()
+
+    # mangohud puts system info on top, then a header row with a frametime column
+    start = 0
+    column = 0
+    for index, line in enumerate(lines):
+        fields = [field.strip().lower() for field in line.split(",")]
+        if "frametime" in fields:
+            start = index + 1
+            column = fields.index("frametime")
+            break
+
+    try:
+        frame_times = np.loadtxt(lines[start:], delimiter=",", usecols=column, ndmin=1, comments="#")
+    except ValueError as e:
+        raise FrameLogError(f"Could not parse frame times in {path}: {e}")
+
+    frame_times = frame_times[np.isfinite(frame_times) & (frame_times > 0)]
+    if frame_times.size == 0:
+        raise FrameLogError(f"No frame times in {path}")
+    return frame_times
+
+def _low_fps(np, frame_times, fraction):
+    # average fps across the slowest fraction of frames
+    count = max(1, int(frame_times.size * fraction))
+    slowest = np.partition(frame_times, frame_times.size - count)[-count:]
+    return 1000.0 / slowest.mean()
+
+def analyze(frame_times, stutter_ms=DEFAULT_STUTTER_MS):
+    np = _numpy()
+    total_ms = frame_times.sum()
+    stats = {
+        "frames": int(frame_times.size),
+        "duration_s": total_ms / 1000.0,
+        "avg_fps": frame_times.size * 1000.0 / total_ms,
+        "low_1pct_fps": _low_fps(np, frame_times, 0.01),
+        "low_0.1pct_fps": _low_fps(np, frame_times, 0.001),
+    }
+    for percentile, value in zip(PERCENTILES, np.percentile(frame_times, PERCENTILES)):
+        stats[f"p{percentile:g}_ms"] = float(value)
+    stats["max_ms"] = float(frame_times.max())
+    stats["stutters"] = int(np.count_nonzero(frame_times > stutter_ms))
+    return stats
+
+def analyze_log(path, stutter_ms=DEFAULT_STUTTER_MS):
+    return analyze(load_frame_times(path), stutter_ms)
+
+# (key, label, higher is better)
+REPORT_ROWS = [
+    ("frames", "Frames", None),
+    ("duration_s", "Duration (s)", None),
+    ("avg_fps", "Average FPS", True),
+    ("low_1pct_fps", "1% low FPS", True),
+    ("low_0.1pct_fps", "0.1% low FPS", True),
+] + [(f"p{p:g}_ms", f"p{p:g} frame time (ms)", False) for p in PERCENTILES] + [
+    ("max_ms", "Max frame time (ms)", False),
+    ("stutters", "Stutters", False),
+]
+
+def _fmt(value):
+    return f"{value:,}" if isinstance(value, int) else f"{value:,.2f}"
+
+def format_report(stats, stutter_ms=DEFAULT_STUTTER_MS):
+    lines = []
+    for key, label, _ in REPORT_ROWS:
+        if key == "stutters":
+            label = f"Stutters (>{stutter_ms:g} ms)"
+        lines.append(f"  {label:<26}{_fmt(stats[key]):>12}")
+    return "\n".join(lines)
+
+def format_diff(stats_a, stats_b, stutter_ms=DEFAULT_STUTTER_MS):
+    lines = [f"  {'':<26}{'A':>12}{'B':>12}{'change':>10}"]
+    for key, label, higher_is_better in REPORT_ROWS:
+        if key == "stutters":
+            label = f"Stutters (>{stutter_ms:g} ms)"
+        a, b = stats_a[key], stats_b[key]
+        change = f"{(b - a) / a * 100:+.1f}%" if a else "-"
+        marker = ""
+        if higher_is_better is not None and a != b:
+            marker = " better" if (b > a) == higher_is_better else " worse"
+        lines.append(f"  {label:<26}{_fmt(a):>12}{_fmt(b):>12}{change:>10}{marker}")
+    return "\n".join(lines)
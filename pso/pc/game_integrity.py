@@ -0,0 +1,135 @@
+import os
+import json
+import mmap
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from file_utils import hash_file
+from prefix_status import get_state_dir
+
+# integrity scan of the install tree against a manifest taken right after install
+# hashing runs on a thread pool, hashlib drops the GIL on big buffers so it actually scales
+# zeroz/tj
+
+MANIFEST_NAME = "game_manifest.json"
+CACHE_NAME = "game_hash_cache.json"
+
+# files above this get mmap'd and hashed in one go instead of read in chunks
+MMAP_THRESHOLD = 4 * 1024 * 1024
+
+def hash_game_file(path, size):
+    if size < MMAP_THRESHOLD:
+        return hash_file(path)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        mapped.madvise(mmap.MADV_SEQUENTIAL)
+        return hashlib.sha256(mapped).hexdigest()
+
+def scan_tree(install_dir):
+    """{relative path: (size, mtime_ns)} for every regular file"""
+    files = {}
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        with os.scandir(os.path.join(install_dir, rel)) as it:
+            for entry in it:
+                relpath = os.path.join(rel, entry.name) if rel else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(relpath)
+                elif entry.is_file(follow_symlinks=False):
+                    st = entry.stat(follow_symlinks=False)
+                    files[relpath] = (st.st_size, st.st_mtime_ns)
+    return files
+
+def _load_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def hash_tree(prefix_path, install_dir, workers=None):
+    """Hash every file, reusing cached hashes for files whose size and mtime didn't change"""
+    cache_path = os.path.join(get_state_dir(prefix_path), CACHE_NAME)
+    cache = _load_json(cache_path) or {}
+    files = scan_tree(install_dir)
+
+    hashes = {}
+    todo = []
+    for rel, (size, mtime_ns) in files.items():
+        cached = cache.get(rel)
+        if cached and cached[0] == size and cached[1] == mtime_ns:
+            hashes[rel] = cached[2]
+        else:
+            todo.append(rel)
+
+    # biggest first so one huge file doesn't end up alone at the end
+    todo.sort(key=lambda rel: files[rel][0], reverse=True)
+    workers = workers or min(8, (os.cpu_count() or 2) * 2)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lambda rel: hash_game_file(os.path.join(install_dir, rel), files[rel][0]), todo)
+        for rel, digest in zip(todo, results):
+            hashes[rel] = digest
+
+    _write_json(cache_path, {rel: [files[rel][0], files[rel][1], hashes[rel]] for rel in files})
+    return files, hashes, len(todo)
+
+def seed_hash_cache(prefix_path, install_dir, hashes):
+    """Prime the cache with hashes we already know, e.g. for a tree just copied out of the payload store"""
+    files = scan_tree(install_dir)
+    _write_json(os.path.join(get_state_dir(prefix_path), CACHE_NAME),
+                {rel: [size, mtime_ns, hashes[rel]] for rel, (size, mtime_ns) in files.items() if rel in hashes})
+
+def record_manifest(prefix_path, install_dir):
+    """Take the current tree as the known good state"""
+    files, hashes, hashed = hash_tree(prefix_path, install_dir)
+    manifest = {
+        "created": time.time(),
+        "install_dir": install_dir,
+        "files": {rel: {"size": files[rel][0], "sha256": hashes[rel]} for rel in sorted(files)},
+    }
+    _write_json(os.path.join(get_state_dir(prefix_path), MANIFEST_NAME), manifest)
+    return {"files": len(files), "bytes": sum(size for size, _ in files.values()), "hashed": hashed}
+
+def load_manifest(prefix_path):
+    return _load_json(os.path.join(get_state_dir(prefix_path), MANIFEST_NAME))
+
+def verify_install(prefix_path, install_dir, manifest):
+    # game_payload imports this module, so not at the top
+    from game_payload import is_game_written
+    started = time.time()
+    files, hashes, hashed = hash_tree(prefix_path, install_dir)
+    # settings, logs and screenshots change with every session, that's not damage
+    expected = {rel: entry for rel, entry in manifest["files"].items() if not is_game_written(rel)}
+    missing = sorted(rel for rel in expected if rel not in files)
+    modified = sorted(rel for rel in expected if rel in files and hashes[rel] != expected[rel]["sha256"])
+    extra = sorted(rel for rel in files if rel not in manifest["files"] and not is_game_written(rel))
+    return {
+        "install_dir": install_dir,
+        "ok": not missing and not modified,
+        "checked": len(files),
+        "hashed": hashed,
+        "cached": len(files) - hashed,
+        "bytes": sum(size for size, _ in files.values()),
+        "missing": missing,
+        "modified": modified,
+        "extra": extra,
+        "seconds": round(time.time() - started, 3),
+    }
+
+def format_report(report):
+    lines = [f"Install: {report['install_dir']}",
+             f"Checked {report['checked']} files ({report['bytes'] / 1048576:.1f} MB) in {report['seconds']:.2f}s, "
+             f"{report['hashed']} hashed, {report['cached']} unchanged since the last scan"]
+    for label in ("missing", "modified", "extra"):
+        if report[label]:
+            lines.append(f"\n{label.capitalize()} ({len(report[label])}):")
+            lines.extend(f"  {rel}" for rel in report[label])
+    lines.append(f"\nGame files {'ok' if report['ok'] else 'damaged, reinstall or restore a snapshot'}")
+    return "\n".join(lines)
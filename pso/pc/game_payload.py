@@ -0,0 +1,157 @@
+import os
+import json
+import time
+import shutil
+import errno
+import fnmatch
+from file_utils import hash_file, clone_file, reflink_file
+from game_integrity import hash_tree, seed_hash_cache
+
+# shared store of the extracted game tree, one payload per installer build (keyed by its sha256)
+# the silent installer runs once per client version, every other prefix gets the tree copied out of here
+# zeroz/tj
+
+# files the game writes while it's played: settings, logs, screenshots, addons, our managed dxvk.conf.
+# --verify-game doesn't count changes to these as damage
+GAME_WRITTEN_PATTERNS = ("*.ini", "*.log", "*.txt", "*.cfg", "*.conf", "bmp/*", "log/*", "addons/*")
+# plus what the launcher patches on updates. these always get a private copy, everything else is
+# hardlinked to the read-only store copy when reflinks aren't available
+WRITABLE_PATTERNS = GAME_WRITTEN_PATTERNS + ("*.exe", "*.dll", "data/*")
+# our own per-prefix files. record runs after the dxvk preset is applied, they never go into the store
+PREFIX_ONLY_PATTERNS = ("dxvk.conf", "dxvk.conf.bak")
+
+DEFAULT_INSTALL_DIR = "C:\\EphineaPSO"
+
+class PayloadError(Exception):
+    """Payload store is damaged or the tree can't be materialized"""
+    pass
+
+def get_payload_dir():
+    if 'PSO_PAYLOAD_DIR' in os.environ:
+        return os.environ['PSO_PAYLOAD_DIR']
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.expanduser("~/.local/share")
+    return os.path.join(data_home, "pso_wine", "payloads")
+
+def _matches(rel, patterns):
+    rel = rel.replace(os.sep, "/").lower()
+    return any(fnmatch.fnmatchcase(rel, pattern) for pattern in patterns)
+
+def is_writable(rel):
+    return _matches(rel, WRITABLE_PATTERNS)
+
+def is_game_written(rel):
+    return _matches(rel, GAME_WRITTEN_PATTERNS)
+
+def can_link(rel):
+    """Safe to share the store's inode: nothing the game or launcher writes"""
+    return not is_writable(rel)
+
+class PayloadStore:
+    def __init__(self, root=None):
+        self.root = root or get_payload_dir()
+
+    def payload_dir(self, installer_hash):
+        return os.path.join(self.root, installer_hash)
+
+    def load(self, installer_hash):
+        """Payload info for an installer build, None if it was never recorded"""
+        try:
+            with open(os.path.join(self.payload_dir(installer_hash), "payload.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            raise PayloadError(f"Payload {installer_hash[:12]} is damaged: {e}")
+
+    def find(self, installer_path):
+        """(installer hash, payload) for the installer on disk, payload is None if not stored yet"""
+        if not installer_path or not os.path.isfile(installer_path):
+            return None, None
+        installer_hash = hash_file(installer_path)
+        return installer_hash, self.load(installer_hash)
+
+    def record(self, installer_hash, prefix_path, install_dir):
+        """Copy a freshly installed tree into the store. Returns the payload, or the existing one"""
+        existing = self.load(installer_hash)
+        if existing:
+            return existing
+        # hash_tree shares the prefix's hash cache with the game manifest, so this is usually free
+        files, hashes, _ = hash_tree(prefix_path, install_dir)
+        final_dir = self.payload_dir(installer_hash)
+        tmp_dir = f"{final_dir}.tmp"
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir)
+        tree_dir = os.path.join(tmp_dir, "tree")
+        entries = {}
+        for rel in sorted(files):
+            if _matches(rel, PREFIX_ONLY_PATTERNS):
+                continue
+            src = os.path.join(install_dir, rel)
+            dst = os.path.join(tree_dir, rel)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            # copy, never link the live install in. the game keeps writing to it
+            clone_file(src, dst)
+            mode = os.stat(src).st_mode & 0o777
+            os.chmod(dst, 0o444)
+            entries[rel] = {"size": files[rel][0], "sha256": hashes[rel], "mode": mode}
+        payload = {
+            "installer_sha256": installer_hash,
+            "created": time.time(),
+            "files": entries,
+            "bytes": sum(e["size"] for e in entries.values()),
+        }
+        with open(os.path.join(tmp_dir, "payload.json"), "w") as f:
+            json.dump(payload, f)
+        os.rename(tmp_dir, final_dir)
+        return payload
+
+    def materialize(self, installer_hash, install_dir, prefix_path=None):
+        """Lay the stored tree out at install_dir: reflinks, else hardlinks for files nothing writes, else copies"""
+        payload = self.load(installer_hash)
+        if payload is None:
+            raise PayloadError(f"No payload for installer {installer_hash[:12]}")
+        tree_dir = os.path.join(self.payload_dir(installer_hash), "tree")
+        stats = {"files": 0, "bytes": 0, "reflinked": 0, "linked": 0, "copied": 0}
+        use_reflink = True
+        use_links = True
+        for rel, entry in sorted(payload["files"].items()):
+            src = os.path.join(tree_dir, rel)
+            dst = os.path.join(install_dir, rel)
+            if not os.path.isfile(src):
+                raise PayloadError(f"Payload {installer_hash[:12]} is missing {rel}")
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            tmp_path = f"{dst}.pso_payload"
+            if os.path.lexists(tmp_path):
+                os.unlink(tmp_path)
+            # one failed reflink means the filesystem can't, stop trying for the rest of the tree
+            if use_reflink and reflink_file(src, tmp_path):
+                os.chmod(tmp_path, entry["mode"])
+                stats["reflinked"] += 1
+            else:
+                use_reflink = False
+                linked = False
+                if use_links and can_link(rel):
+                    try:
+                        # shows up read-only like the store copy. a stray write fails instead of
+                        # reaching every prefix that shares the inode
+                        os.link(src, tmp_path)
+                        linked = True
+                    except OSError as e:
+                        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                            raise
+                        use_links = False
+                if linked:
+                    stats["linked"] += 1
+                else:
+                    shutil.copyfile(src, tmp_path)
+                    os.chmod(tmp_path, entry["mode"])
+                    stats["copied"] += 1
+            os.replace(tmp_path, dst)
+            stats["files"] += 1
+            stats["bytes"] += entry["size"]
+
+        if prefix_path:
+            # the tree matches the payload hashes, no need for --verify-game to read it all back
+            seed_hash_cache(prefix_path, install_dir, {rel: e["sha256"] for rel, e in payload["files"].items()})
+        return stats
+
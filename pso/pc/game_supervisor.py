@@ -0,0 +1,241 @@
+import os
+import sys
+import json
+import time
+import shutil
+import threading
+import traceback
+import subprocess
+from cmd_runner import wait_for_exit
+
+# detached game sessions. python forks out of the way and the game writes its own logs
+# zeroz/tj
+
+class GameSupervisor:
+    def __init__(self, log_dir, max_log_bytes=5 * 1024 * 1024, log_backups=3, check_interval=15):
+        self.log_dir = log_dir
+        self.max_log_bytes = max_log_bytes
+        self.log_backups = log_backups
+        # how often the supervisor wakes up to check the log size. keep it lazy
+        self.check_interval = check_interval
+        self.state_path = os.path.join(log_dir, "session_state.json")
+
+    def rotate_log(self, log_path):
+        """Shift log -> log.1 -> log.2 ... dropping anything past log_backups"""
+        if not os.path.exists(log_path):
+            return
+        for index in range(self.log_backups - 1, 0, -1):
+            older = f"{log_path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{log_path}.{index + 1}")
+        if self.log_backups > 0:
+            os.replace(log_path, f"{log_path}.1")
+        else:
+            os.remove(log_path)
+
+    def _cap_log(self, log_path):
+        """Copy-truncate the live log once it passes the size cap"""
+        try:
+            if os.path.getsize(log_path) <= self.max_log_bytes:
+                return
+        except OSError:
+            return
+        # game keeps its O_APPEND fd, so we copy out and truncate in place instead of renaming
+        if self.log_backups > 0:
+            for index in range(self.log_backups - 1, 0, -1):
+                older = f"{log_path}.{index}"
+                if os.path.exists(older):
+                    os.replace(older, f"{log_path}.{index + 1}")
+            shutil.copyfile(log_path, f"{log_path}.1")
+        os.truncate(log_path, 0)
+
+    def _wait_capping_log(self, process, log_path):
+        """Sleep in the kernel until process exits, waking every check_interval to cap the log"""
+        while True:
+            try:
+                if wait_for_exit(process.pid, self.check_interval):
+                    break
+            except ChildProcessError:
+                break
+            self._cap_log(log_path)
+        return process.wait()
+
+    def write_state(self, state):
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def read_state(self):
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def launch(self, command, env, name="game", wait_wineserver=True, sampler=None):
+        """Double fork a supervisor for command and return the game pid right away"""
+        os.makedirs(self.log_dir, exist_ok=True)
+        log_path = os.path.join(self.log_dir, f"{name}.log")
+        self.rotate_log(log_path)
+
+        # flush before forking or buffered output shows up twice
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid:
+            # foreground cli. wait for the first child, then read the game pid back
+            os.close(write_fd)
+            os.waitpid(pid, 0)
+            with os.fdopen(read_fd) as pipe:
+                data = pipe.read().strip()
+            return int(data) if data.isdigit() else None
+
+        # first child: new session, then fork again so the supervisor is never a session leader
+        os.close(read_fd)
+        try:
+            os.setsid()
+            if os.fork():
+                os._exit(0)
+            self._supervise(command, env, name, log_path, write_fd, wait_wineserver, sampler)
+        except BaseException as e:
+            # no terminal left to print to. leave it where --detach users look
+            self._record_failure(name, command, log_path, e)
+        os._exit(0)
+
+    def start(self, command, env, name="game", wait_wineserver=False, sampler=None):
+        """Supervise command on a thread of this process and return the game pid once it's running"""
+        # for long lived threaded processes like the daemon, where forking isn't safe
+        os.makedirs(self.log_dir, exist_ok=True)
+        log_path = os.path.join(self.log_dir, f"{name}.log")
+        self.rotate_log(log_path)
+
+        started = threading.Event()
+        result = {}
+
+        def notify(pid):
+            result["pid"] = pid
+            started.set()
+
+        def run():
+            try:
+                self._run_session(command, env, name, log_path, notify, wait_wineserver, sampler)
+            except Exception as e:
+                self._record_failure(name, command, log_path, e)
+                # don't leave start() waiting on a game that never got going
+                if not started.is_set():
+                    notify(None)
+
+        thread = threading.Thread(target=run, name=f"supervisor-{name}", daemon=True)
+        thread.start()
+        started.wait()
+        return result.get("pid")
+
+    def _record_failure(self, name, command, log_path, error):
+        """Mark the session failed in the state file and put the traceback in the log"""
+        try:
+            with open(log_path, "a") as f:
+                f.write(f"Supervisor failed: {error!r}\n")
+                traceback.print_exception(type(error), error, error.__traceback__, file=f)
+            # keep the game pid if it got that far
+            state = self.read_state() or {}
+            if state.get("supervisor_pid") != os.getpid() or state.get("name") != name:
+                state = {"name": name, "command": command}
+            state.update({"status": "failed", "error": f"supervisor: {error!r}", "ended": time.time()})
+            self.write_state(state)
+        except Exception:
+            pass
+
+    def _supervise(self, command, env, name, log_path, notify_fd, wait_wineserver, sampler):
+        # detach from the terminal entirely
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        os.close(devnull)
+
+        def notify(pid):
+            os.write(notify_fd, f"{pid or ''}\n".encode())
+            os.close(notify_fd)
+
+        self._run_session(command, env, name, log_path, notify, wait_wineserver, sampler)
+
+    def _run_session(self, command, env, name, log_path, notify, wait_wineserver, sampler):
+        log_fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        # sampler thread has to start after the forks, threads don't survive them
+        if sampler:
+            sampler.start()
+        started = time.time()
+        try:
+            # game writes straight into the log fd, nothing gets copied through python
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=log_fd,
+                stderr=log_fd,
+                close_fds=True,
+                # own session, so a daemon restart or ctrl+c on whoever started us can't take the game down
+                start_new_session=True,
+                env=env
+            )
+        except OSError as e:
+            os.write(log_fd, f"Failed to start {command}: {e}\n".encode())
+            os.close(log_fd)
+            notify(None)
+            self.write_state({
+                "name": name,
+                "command": command,
+                "status": "failed",
+                "error": str(e),
+                "started": started,
+            })
+            return
+
+        notify(process.pid)
+
+        state = {
+            "name": name,
+            "command": command,
+            "status": "running",
+            "pid": process.pid,
+            "supervisor_pid": os.getpid(),
+            "log": log_path,
+            "started": started,
+        }
+        self.write_state(state)
+
+        exit_code = self._wait_capping_log(process, log_path)
+        command_ended = time.time()
+
+        # pso.bat uses start /b, so the real game usually outlives the wine cmd we launched.
+        # wineserver -w blocks until every wine process in the prefix is gone. that's the whole
+        # game session, so the log still gets capped while waiting on it
+        if wait_wineserver:
+            try:
+                waiter = subprocess.Popen(["wineserver", "-w"], stdin=subprocess.DEVNULL,
+                                          stdout=log_fd, stderr=log_fd, env=env)
+            except OSError:
+                waiter = None
+            if waiter is not None:
+                self._wait_capping_log(waiter, log_path)
+        os.close(log_fd)
+        self._cap_log(log_path)
+
+        if sampler:
+            sampler.finish()
+            summary_path = f"{sampler.output_path}.summary.txt"
+            with open(summary_path, "w") as f:
+                f.write(sampler.summary() + "\n")
+            state["resource_log"] = sampler.output_path
+            state["resource_summary"] = summary_path
+
+        ended = time.time()
+        state.update({
+            "status": "exited",
+            "exit_code": exit_code,
+            "command_duration": round(command_ended - started, 3),
+            "ended": ended,
+            "duration": round(ended - started, 3),
+        })
+        self.write_state(state)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+import os
+import sys
+
+# fast start entry for the desktop shortcuts. builds the env and execs straight into wine,
+# so python is gone before the game even starts. anything fancier is handed to pso.py
+# keep the imports here to os and sys. launch_profiles only loads when a profile is asked for, dxvk_config is os only,
+# daemon_client only pulls in socket and json when a daemon socket exists
+# zeroz/tj
+
+# import cost on top of a bare interpreter, checked with --import-budget
+IMPORT_BUDGET_MS = 10
+
+def fall_back(argv):
+    """Let pso.py handle anything the fast path doesn't know"""
+    pso_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pso.py")
+    os.execv(sys.executable, [sys.executable, pso_script] + argv)
+
+def parse_args(argv):
+    """Tiny hand rolled parser, argparse alone costs more than the rest of this file"""
+    options = {"launcher": False, "profile": None, "directx_runtime": False, "dry_run": False}
+    index = 0
+    while index < len(argv):
+        arg = argv[index]
+        if arg == "-e":
+            pass
+        elif arg == "-l":
+            options["launcher"] = True
+        elif arg == "--directx-runtime":
+            options["directx_runtime"] = True
+        elif arg == "--dry-run":
+            options["dry_run"] = True
+        elif arg == "--profile" and index + 1 < len(argv):
+            index += 1
+            options["profile"] = argv[index]
+        elif arg.startswith("--profile="):
+            options["profile"] = arg.split("=", 1)[1]
+        else:
+            return None
+        index += 1
+    return options
+
+def build_env(prefix_path, profile):
+    """Same env WineUtils.enable_gui builds"""
+    env = os.environ.copy()
+    env["WINEPREFIX"] = prefix_path
+    env["WINEDEBUG"] = "-all"
+    # os only, just reads the dxvk.conf path --dxvk-preset remembered
+    from dxvk_config import config_env
+    env.update(config_env(prefix_path))
+    if profile:
+        from launch_profiles import LaunchProfileError, TUNING_KEYS, resolve_profile, profile_env
+        try:
+            resolved = resolve_profile(profile)
+        except LaunchProfileError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        # tuning needs something watching the game after it starts, that's pso.py's job
+        if any(resolved.get(key) is not None for key in TUNING_KEYS):
+            return None
+        env.update(profile_env(resolved))
+    return env
+
+def check_import_budget(budget_ms=IMPORT_BUDGET_MS):
+    """Run the launch path under -X importtime and compare against a bare interpreter"""
+    import subprocess
+
+    def import_times(command):
+        result = subprocess.run([sys.executable, "-X", "importtime"] + command,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "imported package" in line:
+                continue
+            self_us, _, name = line[len("import time:"):].split("|")
+            times[name.strip()] = int(self_us)
+        return times
+
+    baseline = import_times(["-c", "pass"])
+    # --profile pulls in launch_profiles, the most the fast path ever imports
+    launch = import_times([os.path.abspath(__file__), "--dry-run", "-e", "--profile", "default"])
+    extra = {name: us for name, us in launch.items() if name not in baseline}
+    total_ms = sum(extra.values()) / 1000
+
+    for name, us in sorted(extra.items(), key=lambda item: item[1], reverse=True)[:10]:
+        print(f"  {us / 1000:6.2f} ms  {name}")
+    print(f"Launch imports: {total_ms:.2f} ms (budget {budget_ms} ms)")
+    return total_ms <= budget_ms
+
+def main(argv):
+    if argv and argv[0] == "--import-budget":
+        budget = float(argv[1]) if len(argv) > 1 else IMPORT_BUDGET_MS
+        sys.exit(0 if check_import_budget(budget) else 1)
+
+    options = parse_args(argv)
+    if options is None:
+        fall_back(argv)
+
+    profile = options["profile"]
+    if options["directx_runtime"]:
+        if profile and profile != "compat":
+            print("Error: --directx-runtime is the compat profile, it can't be combined with --profile")
+            sys.exit(1)
+        profile = "compat"
+
+    prefix_path = os.environ.get('WINEPREFIX') or os.path.expanduser("~/.local/share/ephinea-prefix")
+    env = build_env(prefix_path, profile)
+    if env is None:
+        fall_back(argv)
+
+    pso_bat_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "pso.bat")
+    command = ["wine", "cmd", "/c", pso_bat_path, "-e"]
+    if options["launcher"]:
+        command.append("-l")
+
+    # imported before --dry-run returns so --import-budget counts it
+    from daemon_client import DaemonError, client_env, daemon_available, request
+    if options["dry_run"]:
+        print(" ".join(command))
+        return
+
+    # --lazy-components left mono/gecko for later, pso.py installs them for -l and sets the overrides for -e
+    if os.path.exists(os.path.join(prefix_path, ".pso_wine", "pending_components")):
+        fall_back(argv)
+
+    if not os.path.exists(prefix_path):
+        print("Error: Ephinea is not installed. Please install it first with -i")
+        sys.exit(1)
+    if not os.path.exists(pso_bat_path):
+        print(f"Error: pso.bat script not found at {pso_bat_path}")
+        sys.exit(1)
+
+    # a running daemon already has a warm wineserver, let it start the game
+    if daemon_available():
+        try:
+            result = request("launch", {"prefix": prefix_path, "launcher": options["launcher"],
+                                        "profile": profile, "env": client_env()})
+        except (DaemonError, ValueError, OSError) as e:
+            # crashed or stale daemon, start the game here
+            print(f"Warning: {e}. Starting the game locally")
+            result = None
+        if result is not None and result["ok"]:
+            print(f"Game started by the daemon (pid {result['pid']})")
+            return
+        if result is not None and not result.get("fallback"):
+            print(f"Error: {result['error']}")
+            sys.exit(1)
+
+    # limits survive exec, and esync runs out of fds at the usual 1024 soft limit. preflight.py does the full check
+    import resource
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard != resource.RLIM_INFINITY and soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    sys.stdout.flush()
+    try:
+        os.execvpe(command[0], command, env)
+    except OSError as e:
+        print(f"Error: Could not start wine: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
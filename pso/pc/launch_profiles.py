@@ -0,0 +1,158 @@
+import os
+
+# named launch profiles. builtins live here, user ones come from profiles.json
+# zeroz/tj
+
+class LaunchProfileError(Exception):
+    """Bad profile name or broken profiles file"""
+    pass
+
+BUILTIN_PROFILES = {
+    "default": {
+        "description": "Plain launch, no extra tuning",
+    },
+    "low-latency": {
+        "description": "esync + fsync, one queued frame, async shader compiles",
+        "esync": True,
+        "fsync": True,
+        "frame_latency": 1,
+        "dxvk_async": True,
+    },
+    "battery": {
+        "description": "esync only, frame rate capped at 60 to keep clocks down",
+        "esync": True,
+        "fsync": False,
+        "frame_latency": 2,
+        "frame_rate": 60,
+    },
+    "compat": {
+        "description": "Wine's DirectX runtime instead of DXVK (same as --directx-runtime)",
+        "esync": True,
+        "dll_overrides": "dxvk_config=b;d3d9,d3d11,dxgi=b",
+    },
+}
+
+# process tuning keys, applied by process_tuning.py instead of through the env
+TUNING_KEYS = (
+    "game_affinity", "wineserver_affinity", "reserve_core0",
+    "game_nice", "wineserver_nice", "game_ionice", "wineserver_ionice",
+)
+
+# every key a profile is allowed to set. anything else is probably a typo
+PROFILE_KEYS = {
+    "description", "extends", "esync", "fsync", "frame_latency",
+    "frame_rate", "dxvk_async", "dll_overrides", "env",
+} | set(TUNING_KEYS)
+
+# what each key's value has to be. affinities also take a bare cpu number
+KEY_TYPES = {
+    "description": str, "extends": str, "esync": bool, "fsync": bool, "frame_latency": int,
+    "frame_rate": int, "dxvk_async": bool, "dll_overrides": str, "env": dict,
+    "game_affinity": (str, int), "wineserver_affinity": (str, int), "reserve_core0": bool,
+    "game_nice": int, "wineserver_nice": int, "game_ionice": str, "wineserver_ionice": str,
+}
+# keys where null means not set
+NULLABLE_KEYS = {"extends", "frame_latency", "frame_rate"} | set(TUNING_KEYS)
+
+# type names as they read in profiles.json
+JSON_TYPES = {bool: "boolean", int: "number", float: "number", str: "string", list: "array", dict: "object",
+              type(None): "null"}
+
+def _check_values(name, profile):
+    """Raise LaunchProfileError for a value of the wrong type instead of crashing in profile_env later"""
+    for key, value in profile.items():
+        if value is None and key in NULLABLE_KEYS:
+            continue
+        expected = KEY_TYPES[key]
+        # json true is an int to python, but not a frame latency
+        if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+            names = " or ".join(JSON_TYPES[t] for t in (expected if isinstance(expected, tuple) else (expected,)))
+            raise LaunchProfileError(f"Profile '{name}': {key} must be a JSON {names}, got {JSON_TYPES.get(type(value))}")
+    for key, value in (profile.get("env") or {}).items():
+        if not isinstance(value, (str, int, float)):
+            raise LaunchProfileError(f"Profile '{name}': env {key} must be a JSON string or number, "
+                                     f"got {JSON_TYPES.get(type(value))}")
+
+def get_profiles_path():
+    if 'PSO_PROFILES_FILE' in os.environ:
+        return os.environ['PSO_PROFILES_FILE']
+    config_home = os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser("~/.config")
+    return os.path.join(config_home, "pso_wine", "profiles.json")
+
+def load_profiles():
+    """Return {name: (profile, source)} with user profiles layered over the builtins"""
+    profiles = {name: (dict(profile), "builtin") for name, profile in BUILTIN_PROFILES.items()}
+
+    profiles_path = get_profiles_path()
+    if not os.path.exists(profiles_path):
+        return profiles
+
+    # json drags in re and friends, the fast launch path only pays for it when there's a file to read
+    import json
+    try:
+        with open(profiles_path) as f:
+            user_profiles = json.load(f)
+    except (OSError, ValueError) as e:
+        raise LaunchProfileError(f"Could not read {profiles_path}: {e}")
+
+    if not isinstance(user_profiles, dict):
+        raise LaunchProfileError(f"{profiles_path} must contain a JSON object of profiles")
+
+    for name, profile in user_profiles.items():
+        if not isinstance(profile, dict):
+            raise LaunchProfileError(f"Profile '{name}' in {profiles_path} must be an object")
+        unknown = set(profile) - PROFILE_KEYS
+        if unknown:
+            raise LaunchProfileError(f"Profile '{name}' has unknown keys: {', '.join(sorted(unknown))}")
+        _check_values(name, profile)
+        profiles[name] = (dict(profile), profiles_path)
+
+    return profiles
+
+def resolve_profile(name, profiles=None):
+    """Look up a profile and flatten its extends chain"""
+    if profiles is None:
+        profiles = load_profiles()
+
+    resolved = {}
+    seen = []
+    current = name
+    while current is not None:
+        if current in seen:
+            raise LaunchProfileError(f"Profile '{name}' has an extends loop: {' -> '.join(seen + [current])}")
+        if current not in profiles:
+            raise LaunchProfileError(f"Unknown launch profile '{current}'. Use --list-profiles to see what's available")
+        seen.append(current)
+        profile = profiles[current][0]
+        # child settings win over the parent's
+        for key, value in profile.items():
+            if key == "env":
+                merged = dict(value)
+                merged.update(resolved.get("env", {}))
+                resolved["env"] = merged
+            elif key not in resolved:
+                resolved[key] = value
+        current = profile.get("extends")
+
+    resolved.pop("extends", None)
+    return resolved
+
+def profile_env(profile):
+    """Turn a resolved profile into the env vars it sets"""
+    env = {}
+    if "esync" in profile:
+        env["WINEESYNC"] = "1" if profile["esync"] else "0"
+    if "fsync" in profile:
+        env["WINEFSYNC"] = "1" if profile["fsync"] else "0"
+    if profile.get("frame_latency") is not None:
+        env["DXVK_CONFIG"] = f"d3d9.maxFrameLatency = {int(profile['frame_latency'])}"
+    if profile.get("frame_rate") is not None:
+        env["DXVK_FRAME_RATE"] = str(int(profile["frame_rate"]))
+    if "dxvk_async" in profile:
+        env["DXVK_ASYNC"] = "1" if profile["dxvk_async"] else "0"
+    if profile.get("dll_overrides"):
+        env["WINEDLLOVERRIDES"] = profile["dll_overrides"]
+    # raw env goes last so it can override anything above
+    for key, value in profile.get("env", {}).items():
+        env[key] = str(value)
+    return env
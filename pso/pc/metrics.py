@@ -0,0 +1,105 @@
+import os
+import time
+import tempfile
+
+# prometheus textfile collector output. one file per operation (pso_wine_install.prom, ...)
+# so node_exporter always sees the last run of each, written to a temp file and renamed in
+# so a scrape never catches half a file
+# zeroz/tj
+
+HELP = {
+    "operation_duration_seconds": "Wall time of the last run of the operation",
+    "operation_success": "1 if the last run of the operation succeeded",
+    "operation_last_run_timestamp_seconds": "Unix time the last run of the operation finished",
+    "exit_code": "Exit code of the game or installer the operation ran",
+    "phase_duration_seconds": "Wall time of the subprocesses run in each phase",
+    "phase_cpu_seconds": "User and system CPU time of the subprocesses run in each phase",
+    "phase_max_rss_bytes": "Largest max RSS of any subprocess in the phase",
+    "phase_commands": "Subprocesses run in each phase",
+    "phase_failed_commands": "Subprocesses in each phase that exited non zero, timed out or were killed",
+    "download_bytes": "Bytes downloaded per artifact",
+    "artifact_cache_requests": "Artifact lookups by result: hit, revalidated, miss, stale, shared or failed",
+    "component_failures": "Components (mono, gecko, dxvk) that failed to install or verify",
+    "verification_failures": "Failed checks of the verification the operation ran",
+    "preflight_issues": "Performance problems found by the launch preflight",
+}
+
+# what the artifact cache's states mean for a hit/miss dashboard
+CACHE_RESULTS = {"fresh": "hit", "revalidated": "revalidated", "downloaded": "miss", "stale": "stale", "shared": "shared"}
+
+def get_metrics_dir():
+    return os.environ.get('PSO_METRICS_DIR') or None
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+class MetricsRecorder:
+    def __init__(self, operation):
+        self.operation = operation
+        self.started = time.time()
+        self.samples = []
+        self.tracked = []
+
+    def add(self, name, value, **labels):
+        self.samples.append((name, {"operation": self.operation, **labels}, value))
+
+    def track(self, wine):
+        """Pick up phase timings, downloads and component failures from this WineUtils when finishing"""
+        self.tracked.append(wine)
+
+    def finish(self, success):
+        for wine in self.tracked:
+            for total in wine.phase_totals():
+                phase = total["phase"]
+                self.add("phase_duration_seconds", total["wall_time"], phase=phase)
+                self.add("phase_cpu_seconds", total["user_time"], phase=phase, mode="user")
+                self.add("phase_cpu_seconds", total["system_time"], phase=phase, mode="system")
+                self.add("phase_max_rss_bytes", total["max_rss_kb"] * 1024, phase=phase)
+                self.add("phase_commands", total["commands"], phase=phase)
+                self.add("phase_failed_commands", total["failed"], phase=phase)
+            for fetch in wine.artifact_fetches:
+                self.add("download_bytes", fetch["bytes"], artifact=fetch["artifact"])
+                self.add("artifact_cache_requests", 1, artifact=fetch["artifact"],
+                         result=CACHE_RESULTS.get(fetch["state"], fetch["state"]))
+            for component in wine.failed_components:
+                self.add("component_failures", 1, component=component)
+        finished = time.time()
+        self.add("operation_duration_seconds", round(finished - self.started, 3))
+        self.add("operation_success", 1 if success else 0)
+        self.add("operation_last_run_timestamp_seconds", round(finished, 3))
+
+    def render(self):
+        # same label set can show up twice (one artifact fetched twice), prometheus wants it summed
+        merged = {}
+        for name, labels, value in self.samples:
+            key = (name, tuple(sorted(labels.items())))
+            merged[key] = merged.get(key, 0) + value if name in ("download_bytes", "artifact_cache_requests",
+                                                                   "component_failures") else value
+        lines = []
+        for family in dict.fromkeys(name for name, _ in merged):
+            lines.append(f"# HELP pso_wine_{family} {HELP[family]}")
+            lines.append(f"# TYPE pso_wine_{family} gauge")
+            for (name, labels), value in merged.items():
+                if name == family:
+                    label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+                    lines.append(f"pso_wine_{name}{{{label_text}}} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, metrics_dir):
+        """Atomically replace pso_wine_<operation>.prom in the collector folder"""
+        os.makedirs(metrics_dir, exist_ok=True)
+        path = os.path.join(metrics_dir, f"pso_wine_{self.operation}.prom")
+        # node_exporter only reads *.prom, so the temp file is invisible to it until the rename
+        fd, tmp_path = tempfile.mkstemp(dir=metrics_dir, prefix=".pso_wine_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.render())
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
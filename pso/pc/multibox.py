@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import subprocess
+from process_tuning import ProcessTuningError, format_cpus, parse_cpu_list
+from resource_sampler import find_prefix_processes
+
+# several PsoBB.exe clients in one prefix. one warm wineserver for all of them, each client pinned
+# to its own cores with its own log, started one after another so they don't all fight over the disk
+# pso.bat's start /b shares one log file and hides the pid, so clients are started straight through wine
+# zeroz/tj
+
+# seconds a persistent wineserver outlives its last client, enough to bridge warm up and the first start
+WARM_SECONDS = 30
+# most we wait for one client to finish loading before starting the next, --stagger overrides
+DEFAULT_STAGGER = 10.0
+# a client reading less than this from disk per second is done loading
+SETTLE_BYTES = 1024 * 1024
+# wine's own startup comes before the client opens its data files, don't call it settled before this
+MIN_STARTUP = 2.0
+POLL_INTERVAL = 0.25
+
+class MultiboxError(Exception):
+    """Bad instance count or core split"""
+    pass
+
+def cpu_groups(cpus):
+    """Split cpus into physical cores, so hyperthread siblings stay with the same client"""
+    groups = []
+    seen = set()
+    for cpu in sorted(cpus):
+        if cpu in seen:
+            continue
+        try:
+            with open(f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list") as f:
+                siblings = parse_cpu_list(f.read().strip()) & set(cpus)
+        except (OSError, ProcessTuningError):
+            siblings = {cpu}
+        siblings.add(cpu)
+        seen |= siblings
+        groups.append(sorted(siblings))
+    return groups
+
+def plan_core_sets(count, cpus):
+    """One cpu set per client: whole physical cores where there are enough, shared cpus when there aren't"""
+    if count < 1:
+        raise MultiboxError("--instances must be at least 1")
+    cpus = sorted(cpus)
+    if not cpus:
+        raise MultiboxError("No CPUs to split between instances")
+    groups = cpu_groups(cpus)
+    if len(groups) < count:
+        # fewer physical cores than clients, fall back to logical cpus
+        groups = [[cpu] for cpu in cpus]
+    if len(groups) < count:
+        # fewer cpus than clients, they have to share
+        return [{cpus[index % len(cpus)]} for index in range(count)]
+    # contiguous chunks, the first ones get the leftover cores
+    sets = []
+    per_set, extra = divmod(len(groups), count)
+    start = 0
+    for index in range(count):
+        size = per_set + (1 if index < extra else 0)
+        sets.append({cpu for group in groups[start:start + size] for cpu in group})
+        start += size
+    return sets
+
+def read_io_bytes(pid):
+    """Bytes pid has read from storage, None if /proc/<pid>/io is off limits or it's gone"""
+    try:
+        with open(f"/proc/{pid}/io") as f:
+            for line in f:
+                if line.startswith("read_bytes:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+class MultiboxLauncher:
+    def __init__(self, wine, install_dir, core_sets, stagger=DEFAULT_STAGGER, exe="PsoBB.exe"):
+        self.wine = wine
+        self.install_dir = install_dir
+        self.core_sets = core_sets
+        self.stagger = stagger
+        self.exe = exe
+        self.log_dir = os.path.join(wine.get_log_dir(), "instances")
+        self.state_path = os.path.join(self.log_dir, "instances.json")
+        self.instances = []
+        self.started = time.time()
+
+    def warm_up(self):
+        """Start a persistent wineserver and boot the prefix once, so no client pays for it"""
+        if "wineserver" in find_prefix_processes(self.wine.prefix_path).values():
+            return False
+        subprocess.run(["wineserver", f"-p{WARM_SECONDS}"], stdin=subprocess.DEVNULL,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=self.wine.env)
+        # services and explorer come up with the first wine process, let that be this one
+        self.wine.run_command(["wine", "cmd", "/c", "exit"], timeout=60)
+        return True
+
+    def _start(self, number, cpus):
+        os.makedirs(self.log_dir, exist_ok=True)
+        log_path = os.path.join(self.log_dir, f"psobb-{number}.log")
+        if os.path.exists(log_path):
+            os.replace(log_path, f"{log_path}.1")
+        instance = {"instance": number, "cpus": format_cpus(cpus), "log": log_path, "pid": None,
+                    "status": "starting", "exit_code": None, "started": time.time()}
+        self.instances.append(instance)
+
+        log_fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        # affinity is per thread and inherited at fork, so pin the thread that forks for just this call.
+        # every thread wine starts in the client inherits it from there
+        own_cpus = os.sched_getaffinity(0)
+        try:
+            os.sched_setaffinity(0, cpus)
+            process = subprocess.Popen(
+                ["wine", os.path.join(self.install_dir, self.exe)],
+                cwd=self.install_dir,
+                stdin=subprocess.DEVNULL,
+                stdout=log_fd,
+                stderr=log_fd,
+                close_fds=True,
+                # own session, ctrl+c here leaves the clients running
+                start_new_session=True,
+                env=self.wine.env,
+            )
+        except OSError as e:
+            instance.update({"status": "failed", "error": str(e)})
+            return None
+        finally:
+            os.sched_setaffinity(0, own_cpus)
+            os.close(log_fd)
+        instance.update({"pid": process.pid, "status": "running", "process": process})
+        return process
+
+    def _wait_for_startup(self, instance):
+        """Block until the client's disk reads die down, it exits, or the stagger runs out"""
+        process = instance["process"]
+        deadline = instance["started"] + self.stagger
+        last_bytes = read_io_bytes(process.pid)
+        last_time = time.time()
+        while time.time() < deadline:
+            time.sleep(POLL_INTERVAL)
+            if process.poll() is not None:
+                return "exited"
+            now = time.time()
+            if now - last_time < 1 or now - instance["started"] < MIN_STARTUP:
+                continue
+            read_bytes = read_io_bytes(process.pid)
+            # without io stats there's nothing to go on, wait the full stagger
+            if read_bytes is not None and last_bytes is not None and read_bytes - last_bytes < SETTLE_BYTES:
+                return "settled"
+            last_bytes, last_time = read_bytes, now
+        return "stagger"
+
+    def launch_all(self, output=print):
+        for index, cpus in enumerate(self.core_sets):
+            number = index + 1
+            process = self._start(number, cpus)
+            instance = self.instances[-1]
+            if process is None:
+                output(f"Instance {number}: failed to start: {instance['error']}")
+                continue
+            if number < len(self.core_sets):
+                instance["startup"] = self._wait_for_startup(instance)
+                instance["startup_seconds"] = round(time.time() - instance["started"], 2)
+                self.poll()
+            output(self.describe(instance))
+        self.write_state()
+
+    def poll(self):
+        """Pick up clients that exited. Returns how many are still running"""
+        running = 0
+        for instance in self.instances:
+            process = instance.get("process")
+            if process is None or instance["status"] != "running":
+                continue
+            exit_code = process.poll()
+            if exit_code is None:
+                running += 1
+            else:
+                instance.update({"status": "exited", "exit_code": exit_code, "ended": time.time()})
+        return running
+
+    def wait(self, on_exit=None, interval=1.0):
+        """Wait for every client to exit, calling on_exit(instance) as each one does"""
+        reported = set()
+        while True:
+            running = self.poll()
+            for instance in self.instances:
+                if instance["status"] != "running" and instance["instance"] not in reported:
+                    reported.add(instance["instance"])
+                    self.write_state()
+                    if on_exit:
+                        on_exit(instance)
+            if not running:
+                return
+            time.sleep(interval)
+
+    def describe(self, instance):
+        text = f"Instance {instance['instance']}: {instance['status']}"
+        if instance["pid"]:
+            text += f", pid {instance['pid']}"
+        text += f", cpus {instance['cpus']}"
+        if instance["exit_code"] is not None:
+            text += f", exit code {instance['exit_code']}"
+        if instance.get("startup"):
+            waited = {"settled": "disk reads settled", "stagger": "stagger limit", "exited": "exited while loading"}
+            text += f", next start after {instance['startup_seconds']}s ({waited[instance['startup']]})"
+        return text + f"\n  log: {instance['log']}"
+
+    def write_state(self):
+        os.makedirs(self.log_dir, exist_ok=True)
+        state = {
+            "started": self.started,
+            "prefix": self.wine.prefix_path,
+            "instances": [{key: value for key, value in instance.items() if key != "process"}
+                          for instance in self.instances],
+        }
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import threading
+from prefix_status import get_state_dir
+from process_tuning import GAME_PROCESSES
+from resource_sampler import find_prefix_processes
+from multibox import MIN_STARTUP, SETTLE_BYTES, read_io_bytes
+
+# warms the page cache with the game's data files while wine starts. files go in the order the game
+# opened them last time (recorded from /proc/<pid>/fd, fanotify would need root), the rest after.
+# posix_fadvise(WILLNEED) queues the reads in the kernel, nothing is copied through python.
+# stops at the memory budget, or as soon as the game's own disk reads settle
+# zeroz/tj
+
+# MB of data to hint, PSO_PREFETCH_MB or --prefetch-mb overrides. never more than half of MemAvailable
+DEFAULT_BUDGET_MB = 512
+# hint big files in pieces so a cancel doesn't wait on a whole archive
+CHUNK_BYTES = 8 * 1024 * 1024
+# give up watching for the game to finish loading after this long
+MAX_WATCH_SECONDS = 120
+# and sooner if the game never shows up at all
+START_TIMEOUT = 30
+RECORD_INTERVAL = 0.1
+PROFILE_NAME = "access_profile.json"
+# what the game reads at startup lives here, everything else goes after it
+DATA_DIRS = ("data",)
+
+def get_budget_bytes(budget_mb=None, env=None):
+    if budget_mb is None:
+        # the daemon passes its client's environment
+        env = os.environ if env is None else env
+        try:
+            budget_mb = float(env.get('PSO_PREFETCH_MB', DEFAULT_BUDGET_MB))
+        except ValueError:
+            budget_mb = DEFAULT_BUDGET_MB
+    budget = int(budget_mb * 1024 * 1024)
+    available = mem_available()
+    # prefetching into memory that isn't free just evicts something else the game needs
+    return min(budget, available // 2) if available else budget
+
+def mem_available():
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+def supported():
+    return hasattr(os, "posix_fadvise")
+
+def load_profile(prefix_path):
+    """Install relative paths in the order the game opened them last session"""
+    try:
+        with open(os.path.join(get_state_dir(prefix_path), PROFILE_NAME)) as f:
+            return json.load(f).get("files", [])
+    except (OSError, ValueError):
+        return []
+
+def save_profile(prefix_path, files):
+    state_dir = get_state_dir(prefix_path)
+    os.makedirs(state_dir, exist_ok=True)
+    path = os.path.join(state_dir, PROFILE_NAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"recorded": time.time(), "files": files}, f, indent=2)
+    os.replace(tmp_path, path)
+
+def plan_files(install_dir, profile):
+    """(path, size) to prefetch: the recorded order first, then data files, then the rest"""
+    sizes = {}
+    for root, _, files in os.walk(install_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                sizes[os.path.relpath(path, install_dir)] = os.path.getsize(path)
+            except OSError:
+                continue
+    ordered = [rel for rel in profile if rel in sizes]
+    seen = set(ordered)
+    rest = sorted(rel for rel in sizes if rel not in seen)
+    in_data = [rel for rel in rest if rel.split(os.sep, 1)[0].lower() in DATA_DIRS]
+    data_set = set(in_data)
+    ordered += in_data + [rel for rel in rest if rel not in data_set]
+    return [(rel, sizes[rel]) for rel in ordered]
+
+class Prefetcher:
+    def __init__(self, prefix_path, install_dir, budget_bytes=None):
+        self.prefix_path = prefix_path
+        self.install_dir = os.path.realpath(install_dir)
+        self.budget_bytes = get_budget_bytes() if budget_bytes is None else budget_bytes
+        self.profile = load_profile(prefix_path)
+        self.cancelled = threading.Event()
+        self.hinted_files = 0
+        self.hinted_bytes = 0
+        self.hint_seconds = 0.0
+        self.stop_reason = None
+        self.recorded = []
+        self.loaded_after = None
+        self._threads = []
+
+    def start(self):
+        """Start hinting and watching the game. Call right as wine starts"""
+        self.started = time.time()
+        for target, name in ((self._prefetch, "prefetch"), (self._watch, "prefetch-watch")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _prefetch(self):
+        started = time.time()
+        for rel, size in plan_files(self.install_dir, self.profile):
+            if self.cancelled.is_set():
+                self.stop_reason = self.stop_reason or "game loaded"
+                break
+            remaining = self.budget_bytes - self.hinted_bytes
+            if remaining <= 0:
+                self.stop_reason = "memory budget"
+                break
+            # the file that crosses the budget still gets its start hinted
+            size = min(size, remaining)
+            try:
+                fd = os.open(os.path.join(self.install_dir, rel), os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                offset = 0
+                while offset < size and not self.cancelled.is_set():
+                    os.posix_fadvise(fd, offset, min(CHUNK_BYTES, size - offset), os.POSIX_FADV_WILLNEED)
+                    offset += CHUNK_BYTES
+            except OSError:
+                continue
+            finally:
+                os.close(fd)
+            self.hinted_files += 1
+            self.hinted_bytes += min(offset, size)
+        else:
+            self.stop_reason = "done"
+        self.hint_seconds = time.time() - started
+
+    def _game_pids(self):
+        return [pid for pid, name in find_prefix_processes(self.prefix_path).items() if name.lower() in GAME_PROCESSES]
+
+    def _record_open_files(self, pids, seen):
+        prefix = self.install_dir + os.sep
+        for pid in pids:
+            try:
+                fds = os.listdir(f"/proc/{pid}/fd")
+            except OSError:
+                continue
+            for fd in fds:
+                try:
+                    target = os.readlink(f"/proc/{pid}/fd/{fd}")
+                except OSError:
+                    continue
+                if target.startswith(prefix) and target not in seen:
+                    seen.add(target)
+                    self.recorded.append(os.path.relpath(target, self.install_dir))
+
+    def _watch(self):
+        """Note the order the game opens its files in, cancel the prefetch once its disk reads settle"""
+        seen = set()
+        first_seen = None
+        last_bytes = None
+        last_check = time.time()
+        while not self.cancelled.is_set() and time.time() - self.started < MAX_WATCH_SECONDS:
+            time.sleep(RECORD_INTERVAL)
+            pids = self._game_pids()
+            if not pids:
+                if first_seen is not None:
+                    # the game came and went, nothing left to warm up for
+                    self.stop_reason = self.stop_reason or "game exited"
+                    break
+                if time.time() - self.started > START_TIMEOUT:
+                    break
+                continue
+            first_seen = first_seen or time.time()
+            self._record_open_files(pids, seen)
+
+            now = time.time()
+            if now - last_check < 1:
+                continue
+            reads = [read_io_bytes(pid) for pid in pids]
+            total = None if None in reads else sum(reads)
+            if total is not None and last_bytes is not None and now - first_seen >= MIN_STARTUP \
+                    and total - last_bytes < SETTLE_BYTES:
+                self.loaded_after = round(now - self.started, 1)
+                break
+            last_bytes, last_check = total, now
+        self.cancelled.set()
+
+    def wait_loaded(self, timeout=MAX_WATCH_SECONDS):
+        """Block until the game has loaded, exited, or the watch gives up"""
+        if len(self._threads) > 1:
+            self._threads[1].join(timeout)
+
+    def stop(self, timeout=2):
+        """Cancel whatever is left and keep the recorded order for next time"""
+        if not self.cancelled.is_set():
+            self.stop_reason = self.stop_reason or "stopped"
+        self.cancelled.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        if self.recorded:
+            # a short session that never got past the title screen still saw the startup files first
+            merged = self.recorded + [rel for rel in self.profile if rel not in set(self.recorded)]
+            try:
+                save_profile(self.prefix_path, merged)
+            except OSError:
+                pass
+
+    def summary(self):
+        text = (f"Prefetch: {self.hinted_files} files, {self.hinted_bytes / 1048576:.0f} MB of "
+                f"{self.budget_bytes / 1048576:.0f} MB budget hinted in {self.hint_seconds:.1f}s "
+                f"({self.stop_reason or 'cancelled'})")
+        if self.profile:
+            text += f", ordered by {len(self.profile)} recorded files"
+        if self.loaded_after is not None:
+            text += f", game loaded after {self.loaded_after}s"
+        return text
@@ -0,0 +1,368 @@
+import os
+import io
+import copy
+import json
+import time
+import shutil
+import tarfile
+import subprocess
+from file_utils import hash_file
+from prefix_status import RegistryHive, windows_to_prefix_path, unescape_value
+from resource_sampler import find_prefix_processes
+
+# portable bundles of a provisioned install for slow targets (winlator etc.)
+# export streams the install tree + registry keys through zstd, import unpacks it in one pass
+# zeroz/tj
+
+BUNDLE_VERSION = 1
+
+# user.reg keys that make up an installed game, relative to HKCU
+BUNDLE_KEYS = ("Software\\EphineaPSO", "Software\\SonicTeam\\PSOBB")
+
+# USER_PARAMS.txt name -> (key, value), same as set_registry_params in utils.bat
+USER_PARAMS = {
+    "WINDOWED": ("Software\\SonicTeam\\PSOBB", "WINDOW_MODE"),
+    "HOR_RES": ("Software\\SonicTeam\\PSOBB\\Ephinea", "NEW_RES_WIDTH"),
+    "VER_RES": ("Software\\SonicTeam\\PSOBB\\Ephinea", "NEW_RES_HEIGHT"),
+    "DIRECT3D": ("Software\\SonicTeam\\PSOBB\\Ephinea", "USE_D3D9"),
+}
+
+class BundleError(Exception):
+    """Bundle could not be written or read"""
+    pass
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+def _reg_string(value):
+    return f'"{_escape(value)}"'
+
+def read_user_params(path):
+    """USER_PARAMS.txt -> {key: {value name: raw dword}}"""
+    settings = {}
+    with open(path) as f:
+        for line in f:
+            name, sep, value = line.strip().partition("=")
+            if not sep or name.strip() not in USER_PARAMS:
+                continue
+            value = value.strip()
+            if not value.isdigit():
+                raise BundleError(f"{path}: {name} must be a number, got '{value}'")
+            key, value_name = USER_PARAMS[name.strip()]
+            settings.setdefault(key, {})[value_name] = f"dword:{int(value):08x}"
+    return settings
+
+def _open_output(output_path, level):
+    """Writable stream for the archive plus the compressor process, if any"""
+    if output_path.endswith((".zst", ".tzst")):
+        if not shutil.which("zstd"):
+            raise BundleError("zstd is needed for .zst bundles (or use .tar / .tar.gz)")
+        # zstd does the compressing on its own threads while we keep feeding it
+        process = subprocess.Popen(["zstd", "-q", "-f", "-T0", f"-{level}", "-o", output_path],
+                                   stdin=subprocess.PIPE)
+        return tarfile.open(fileobj=process.stdin, mode="w|"), process
+    if output_path.endswith((".gz", ".tgz")):
+        return tarfile.open(output_path, mode="w|gz"), None
+    return tarfile.open(output_path, mode="w|"), None
+
+def _close_output(tar, process):
+    """Finish the archive and wait for the compressor"""
+    try:
+        tar.close()
+        if process:
+            process.stdin.close()
+    except (OSError, tarfile.TarError) as e:
+        # zstd dying shows up here as a broken pipe, its exit code says more
+        if process:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+            if process.wait() != 0:
+                raise BundleError(f"zstd failed with exit code {process.returncode}") from e
+        raise BundleError(f"Could not finish the bundle: {e}") from e
+    if process and process.wait() != 0:
+        raise BundleError(f"zstd failed with exit code {process.returncode}")
+
+def _open_input(bundle_path):
+    if bundle_path.endswith((".zst", ".tzst")):
+        if not shutil.which("zstd"):
+            raise BundleError("zstd is needed to read .zst bundles")
+        process = subprocess.Popen(["zstd", "-q", "-dc", bundle_path], stdout=subprocess.PIPE)
+        return tarfile.open(fileobj=process.stdout, mode="r|"), process
+    return tarfile.open(bundle_path, mode="r|*"), None
+
+def _add_json(tar, name, data):
+    payload = json.dumps(data, indent=2).encode()
+    info = tarfile.TarInfo(name)
+    info.size = len(payload)
+    info.mtime = int(time.time())
+    tar.addfile(info, io.BytesIO(payload))
+
+def _scan_tree(root, base):
+    """Every entry under root as (path, arcname), plus the hash of files whose size isn't unique"""
+    entries = []
+    by_size = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        entries.append((dirpath, os.path.relpath(dirpath, base)))
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            entries.append((path, os.path.relpath(path, base)))
+            if os.path.isfile(path) and not os.path.islink(path):
+                by_size.setdefault(os.path.getsize(path), []).append(path)
+    # only files that share a size can be duplicates, everything else is never hashed
+    hashes = {}
+    for size, paths in by_size.items():
+        if size and len(paths) > 1:
+            for path in paths:
+                hashes[path] = hash_file(path)
+    return entries, hashes
+
+def export_bundle(prefix_path, output_path, user_params_path=None, level=10):
+    """Stream the install tree and its registry keys into output_path"""
+    if any(name != "wineserver" for name in find_prefix_processes(prefix_path, wine_only=True).values()):
+        raise BundleError("Wine is still running in the prefix, close the game first so the registry is on disk")
+
+    user_hive = RegistryHive(os.path.join(prefix_path, "user.reg"), wanted=BUNDLE_KEYS)
+    install_windows = user_hive.get_string("Software\\EphineaPSO", "Install_Dir") or "C:\\EphineaPSO"
+    install_dir = windows_to_prefix_path(prefix_path, install_windows)
+    if not install_dir or not os.path.isfile(os.path.join(install_dir, "PsoBB.exe")):
+        raise BundleError(f"No Ephinea install found at {install_windows}")
+
+    drive_root = windows_to_prefix_path(prefix_path, install_windows[:2] + "\\")
+    install_rel = os.path.relpath(install_dir, drive_root)
+
+    registry = {key: dict(values) for key, values in user_hive.keys.values()}
+    params = {}
+    if user_params_path:
+        params = read_user_params(user_params_path)
+        written = {key.lower(): key for key in registry}
+        for key, values in params.items():
+            registry.setdefault(written.get(key.lower(), key), {}).update(values)
+
+    entries, hashes = _scan_tree(install_dir, drive_root)
+    tar, process = _open_output(output_path, level)
+    first_copy = {}
+    stats = {"files": 0, "duplicates": 0, "bytes": 0, "deduped_bytes": 0}
+    try:
+        _add_json(tar, "bundle.json", {
+            "version": BUNDLE_VERSION,
+            "created": int(time.time()),
+            "install_dir": install_windows,
+            "install_path": install_rel.replace(os.sep, "/"),
+            "user_params": sorted(name for values in params.values() for name in values),
+        })
+        _add_json(tar, "registry.json", registry)
+
+        for path, arcname in entries:
+            info = tar.gettarinfo(path, arcname)
+            # ownership means nothing on the other end
+            info.uid = info.gid = 0
+            info.uname = info.gname = ""
+            digest = hashes.get(path)
+            if info.isreg() and digest in first_copy:
+                # same content already in the stream, store a hardlink to it instead
+                info.type = tarfile.LNKTYPE
+                info.linkname = first_copy[digest]
+                stats["duplicates"] += 1
+                stats["deduped_bytes"] += info.size
+                info.size = 0
+                tar.addfile(info)
+            elif info.isreg():
+                if digest:
+                    first_copy[digest] = arcname
+                stats["files"] += 1
+                stats["bytes"] += info.size
+                with open(path, "rb") as f:
+                    tar.addfile(info, f)
+            else:
+                tar.addfile(info)
+    except BaseException:
+        # the real cause is already on its way up, a cleanup error here would only hide it
+        try:
+            _close_output(tar, process)
+        except (BundleError, OSError, tarfile.TarError):
+            pass
+        raise
+    _close_output(tar, process)
+    stats["install_dir"] = install_windows
+    stats["output_bytes"] = os.path.getsize(output_path)
+    return stats
+
+def render_reg_file(registry):
+    """.reg text for regedit /S in the format regedit /E writes, save it as UTF-16 with a BOM"""
+    lines = ["Windows Registry Editor Version 5.00", ""]
+    for key, values in registry.items():
+        lines.append(f"[HKEY_CURRENT_USER\\{key}]")
+        for name, raw in values.items():
+            if raw.startswith('"'):
+                # hive strings escape non-ascii as \x, a .reg file holds the characters themselves
+                raw = _reg_string(unescape_value(raw[1:-1]))
+            lines.append(f"@={raw}" if name == "" else f'"{_escape(name)}"={raw}')
+        lines.append("")
+    return "\r\n".join(lines) + "\r\n"
+
+def merge_user_hive(hive_path, registry):
+    """Write keys straight into user.reg. Only safe while wineserver is down, it rewrites the file on exit"""
+    with open(hive_path, encoding="utf-8", errors="surrogateescape") as f:
+        text = f.read()
+
+    # split into the header and one block per key, blocks start at a line beginning with [
+    blocks = []
+    current = []
+    for line in text.splitlines():
+        if line.startswith("[") and current is not None:
+            blocks.append(current)
+            current = []
+        current.append(line)
+    blocks.append(current)
+
+    header, blocks = blocks[0], blocks[1:]
+    wanted = {key.lower(): (key, dict(values)) for key, values in registry.items()}
+    now = int(time.time())
+    merged = []
+    for block in blocks:
+        key = block[0][1:block[0].find("]")].replace("\\\\", "\\")
+        if key.lower() not in wanted:
+            merged.append(block)
+            continue
+        _, values = wanted.pop(key.lower())
+        # drop the values we're about to set, keep everything else in the key
+        kept = []
+        for line in block[1:]:
+            name = None
+            if line.startswith("@="):
+                name = ""
+            elif line.startswith('"'):
+                name = line[1:line.find('"=')].replace('\\"', '"').replace("\\\\", "\\")
+            if name is None or name not in values:
+                kept.append(line)
+        while kept and not kept[-1].strip():
+            kept.pop()
+        merged.append([block[0]] + kept + [_hive_value(name, raw) for name, raw in values.items()])
+
+    for key, values in wanted.values():
+        merged.append([f"[{_escape(key)}] {now}"] + [_hive_value(name, raw) for name, raw in values.items()])
+
+    lines = list(header)
+    for block in merged:
+        # exactly one blank line between keys, like wine writes it
+        while block and not block[-1].strip():
+            block.pop()
+        if lines and lines[-1].strip():
+            lines.append("")
+        lines.extend(block)
+    tmp_path = f"{hive_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", errors="surrogateescape") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, hive_path)
+
+def _inside(root, path):
+    path = os.path.realpath(path)
+    return path == root or path.startswith(root + os.sep)
+
+def _filter_member(member, root):
+    """tarfile's data filter where python has it (3.12, 3.8.17+ backports), the same checks by hand before that"""
+    if hasattr(tarfile, "data_filter"):
+        return tarfile.data_filter(member, root)
+    root = os.path.realpath(root)
+    name = member.name
+    if os.path.isabs(name) or ".." in name.split("/") or not _inside(root, os.path.join(root, name)):
+        raise BundleError(f"Bundle entry {name} points outside {root}")
+    if member.issym():
+        target = os.path.join(root, os.path.dirname(name), member.linkname)
+        if os.path.isabs(member.linkname) or not _inside(root, target):
+            raise BundleError(f"Bundle symlink {name} -> {member.linkname} points outside {root}")
+    elif member.islnk():
+        if os.path.isabs(member.linkname) or not _inside(root, os.path.join(root, member.linkname)):
+            raise BundleError(f"Bundle hardlink {name} -> {member.linkname} points outside {root}")
+    elif not (member.isreg() or member.isdir()):
+        raise BundleError(f"Bundle entry {name} is not a file, directory or link")
+    # no setuid or world writable files, and no chown to whoever made the bundle when importing as root
+    member = copy.copy(member)
+    member.mode &= 0o755
+    if member.isreg() or member.islnk():
+        member.mode |= 0o600
+    member.uid, member.gid, member.uname, member.gname = os.getuid(), os.getgid(), "", ""
+    return member
+
+def _hive_value(name, raw):
+    return f"@={raw}" if name == "" else f'"{_escape(name)}"={raw}'
+
+def import_bundle(bundle_path, target, drive_letter=None):
+    """Unpack a bundle into a prefix (has drive_c) or a bare drive folder in one sequential pass"""
+    is_prefix = os.path.isdir(os.path.join(target, "drive_c"))
+    tar, process = _open_input(bundle_path)
+    manifest = None
+    registry = None
+    drive_root = None
+    install_prefix = None
+    files = 0
+    try:
+        for member in tar:
+            if manifest is None:
+                if member.name != "bundle.json":
+                    raise BundleError(f"{bundle_path} is not a pso_wine bundle")
+                manifest = json.load(tar.extractfile(member))
+                if manifest.get("version") != BUNDLE_VERSION:
+                    raise BundleError(f"Unsupported bundle version {manifest.get('version')}")
+                install_windows = manifest["install_dir"]
+                drive_letter = (drive_letter or (install_windows[0] if is_prefix else "D")).upper()
+                if is_prefix:
+                    drive_root = windows_to_prefix_path(target, f"{drive_letter}:\\")
+                else:
+                    drive_root = target
+                install_prefix = manifest["install_path"].rstrip("/") + "/"
+                if os.path.exists(os.path.join(drive_root, manifest["install_path"])):
+                    raise BundleError(f"{os.path.join(drive_root, manifest['install_path'])} already exists, "
+                                      "import into a fresh prefix or remove it first")
+                os.makedirs(drive_root, exist_ok=True)
+                continue
+            if member.name == "registry.json":
+                registry = json.load(tar.extractfile(member))
+                continue
+            if member.name != manifest["install_path"] and not member.name.startswith(install_prefix):
+                raise BundleError(f"Unexpected entry {member.name} in bundle")
+            # refuses absolute paths, .. and links pointing out of the drive
+            member = _filter_member(member, drive_root)
+            if member.islnk():
+                # duplicates come back as real copies. the patcher may rewrite one of them in place,
+                # and a hardlink would change the other too
+                shutil.copy2(os.path.join(drive_root, member.linkname), os.path.join(drive_root, member.name))
+            elif hasattr(tarfile, "data_filter"):
+                tar.extract(member, drive_root, filter="data")
+            else:
+                tar.extract(member, drive_root)
+            if member.isreg() or member.islnk():
+                files += 1
+    except tarfile.TarError as e:
+        raise BundleError(f"{bundle_path}: {e}")
+    finally:
+        tar.close()
+        if process:
+            process.stdout.close()
+            process.wait()
+
+    if manifest is None:
+        raise BundleError(f"{bundle_path} is empty")
+
+    install_windows = f"{drive_letter}:\\" + manifest["install_path"].replace("/", "\\")
+    registry = registry or {}
+    registry.setdefault("Software\\EphineaPSO", {})["Install_Dir"] = _reg_string(install_windows)
+
+    result = {"install_dir": install_windows, "path": os.path.join(drive_root, manifest["install_path"]),
+              "files": files, "registry": None, "reg_file": None}
+    user_reg = os.path.join(target, "user.reg")
+    if is_prefix and os.path.isfile(user_reg) and "wineserver" not in find_prefix_processes(target).values():
+        merge_user_hive(user_reg, registry)
+        result["registry"] = user_reg
+    else:
+        # no hive we can safely touch, leave a .reg for regedit /S inside the container
+        reg_path = os.path.join(drive_root, "pso_bundle.reg")
+        # utf-16 keeps a non-ascii Install_Dir intact, RegistryHive reads this format back too
+        with open(reg_path, "w", encoding="utf-16", newline="") as f:
+            f.write(render_reg_file(registry))
+        result["reg_file"] = reg_path
+        result["reg_file_windows"] = f"{drive_letter}:\\pso_bundle.reg"
+    return result
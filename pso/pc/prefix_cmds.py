@@ -1,7 +1,6 @@
 import os
 import subprocess
 import pathlib
-import urllib.request
 import select
 import pty
 import errno
@@ -10,8 +9,10 @@ import shutil
 import time
 import signal
 from contextlib import contextmanager
-import tarfile
 from cmd_runner import CommandRunner
+from game_supervisor import GameSupervisor
+from launch_profiles import resolve_profile, profile_env
+from dxvk_config import DxvkConfigError, CONFIG_NAME, config_env, read_preset, write_config
 import platform
 import re
 
@@ -21,6 +22,273 @@ class WineSetupError(Exception):
     """Custom exception for Wine setup errors"""
     pass
 
+# tiny .NET console exe that prints "Hello from .NET!". used to prove mono actually runs
+MONO_TEST_EXE = bytes([
+    0x4D, 0x5A, 0x90, 0x00, 0x03, 0x00, 0x00, 0x00, 0x04, 0x00, 0x00, 0x00,
+    0xFF, 0xFF, 0x00, 0x00, 0xB8, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x40, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x80, 0x00, 0x00, 0x00, 0x0E, 0x1F, 0xBA, 0x0E, 0x00, 0xB4, 0x09, 0xCD,
+    0x21, 0xB8, 0x01, 0x4C, 0xCD, 0x21, 0x54, 0x68, 0x69, 0x73, 0x20, 0x70,
+    0x72, 0x6F, 0x67, 0x72, 0x61, 0x6D, 0x20, 0x63, 0x61, 0x6E, 0x6E, 0x6F,
+    0x74, 0x20, 0x62, 0x65, 0x20, 0x72, 0x75, 0x6E, 0x20, 0x69, 0x6E, 0x20,
+    0x44, 0x4F, 0x53, 0x20, 0x6D, 0x6F, 0x64, 0x65, 0x2E, 0x0D, 0x0D, 0x0A,
+    0x24, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x50, 0x45, 0x00, 0x00,
+    0x4C, 0x01, 0x03, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0xE0, 0x00, 0x02, 0x01, 0x0B, 0x01, 0x08, 0x00,
+    0x00, 0x04, 0x00, 0x00, 0x00, 0x06, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0xEE, 0x22, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x00, 0x40, 0x00, 0x00,
+    0x00, 0x00, 0x40, 0x00, 0x00, 0x20, 0x00, 0x00, 0x00, 0x02, 0x00, 0x00,
+    0x04, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x04, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x80, 0x00, 0x00, 0x00, 0x02, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x03, 0x00, 0x40, 0x85, 0x00, 0x00, 0x10, 0x00,
+    0x00, 0x10, 0x00, 0x00, 0x00, 0x00, 0x10, 0x00, 0x00, 0x10, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x10, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0xA0, 0x22, 0x00, 0x00, 0x4B, 0x00, 0x00, 0x00,
+    0x00, 0x40, 0x00, 0x00, 0xD8, 0x02, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x60, 0x00, 0x00, 0x0C, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00,
+    0x08, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x08, 0x20, 0x00, 0x00, 0x48, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x2E, 0x74, 0x65, 0x78, 0x74, 0x00, 0x00, 0x00,
+    0xF4, 0x02, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x00, 0x04, 0x00, 0x00,
+    0x00, 0x02, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x60, 0x2E, 0x72, 0x73, 0x72,
+    0x63, 0x00, 0x00, 0x00, 0xD8, 0x02, 0x00, 0x00, 0x00, 0x40, 0x00, 0x00,
+    0x00, 0x04, 0x00, 0x00, 0x00, 0x06, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x40, 0x00, 0x00, 0x40,
+    0x2E, 0x72, 0x65, 0x6C, 0x6F, 0x63, 0x00, 0x00, 0x0C, 0x00, 0x00, 0x00,
+    0x00, 0x60, 0x00, 0x00, 0x00, 0x02, 0x00, 0x00, 0x00, 0x0A, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x40, 0x00, 0x00, 0x42, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0xD0, 0x22, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x48, 0x00, 0x00, 0x00, 0x02, 0x00, 0x05, 0x00,
+    0x64, 0x20, 0x00, 0x00, 0x38, 0x02, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00,
+    0x02, 0x00, 0x00, 0x06, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x1E, 0x02, 0x28, 0x02, 0x00, 0x00, 0x0A, 0x2A,
+    0x2E, 0x72, 0x01, 0x00, 0x00, 0x70, 0x28, 0x01, 0x00, 0x00, 0x0A, 0x2A,
+    0x42, 0x53, 0x4A, 0x42, 0x01, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x0C, 0x00, 0x00, 0x00, 0x76, 0x34, 0x2E, 0x30, 0x2E, 0x33, 0x30, 0x33,
+    0x31, 0x39, 0x00, 0x00, 0x00, 0x00, 0x05, 0x00, 0x6C, 0x00, 0x00, 0x00,
+    0xD0, 0x00, 0x00, 0x00, 0x23, 0x7E, 0x00, 0x00, 0x3C, 0x01, 0x00, 0x00,
+    0x90, 0x00, 0x00, 0x00, 0x23, 0x53, 0x74, 0x72, 0x69, 0x6E, 0x67, 0x73,
+    0x00, 0x00, 0x00, 0x00, 0xCC, 0x01, 0x00, 0x00, 0x24, 0x00, 0x00, 0x00,
+    0x23, 0x55, 0x53, 0x00, 0xF0, 0x01, 0x00, 0x00, 0x10, 0x00, 0x00, 0x00,
+    0x23, 0x47, 0x55, 0x49, 0x44, 0x00, 0x00, 0x00, 0x00, 0x02, 0x00, 0x00,
+    0x38, 0x00, 0x00, 0x00, 0x23, 0x42, 0x6C, 0x6F, 0x62, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x02, 0x00, 0x00, 0x10, 0x47, 0x14, 0x00, 0x00,
+    0x09, 0x00, 0x00, 0x00, 0x00, 0xFA, 0x01, 0x33, 0x00, 0x16, 0x00, 0x00,
+    0x01, 0x00, 0x00, 0x00, 0x03, 0x00, 0x00, 0x00, 0x02, 0x00, 0x00, 0x00,
+    0x02, 0x00, 0x00, 0x00, 0x03, 0x00, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00,
+    0x01, 0x00, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x86, 0x00,
+    0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x06, 0x00, 0x0F, 0x00, 0x17, 0x00,
+    0x06, 0x00, 0x28, 0x00, 0x17, 0x00, 0x06, 0x00, 0x3F, 0x00, 0x5D, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x01, 0x00,
+    0x01, 0x00, 0x00, 0x00, 0x10, 0x00, 0x0A, 0x00, 0x00, 0x00, 0x09, 0x00,
+    0x01, 0x00, 0x01, 0x00, 0x50, 0x20, 0x00, 0x00, 0x00, 0x00, 0x86, 0x18,
+    0x2F, 0x00, 0x06, 0x00, 0x01, 0x00, 0x58, 0x20, 0x00, 0x00, 0x00, 0x00,
+    0x91, 0x00, 0x35, 0x00, 0x0A, 0x00, 0x01, 0x00, 0x09, 0x00, 0x1E, 0x00,
+    0x01, 0x00, 0x11, 0x00, 0x2F, 0x00, 0x06, 0x00, 0x19, 0x00, 0x2F, 0x00,
+    0x06, 0x00, 0x2E, 0x00, 0x1B, 0x00, 0x0E, 0x00, 0x04, 0x80, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x3A, 0x00, 0x00, 0x00, 0x04, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x2D, 0x00, 0x7D, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x3C, 0x4D, 0x6F, 0x64, 0x75, 0x6C, 0x65,
+    0x3E, 0x00, 0x54, 0x65, 0x73, 0x74, 0x00, 0x43, 0x6F, 0x6E, 0x73, 0x6F,
+    0x6C, 0x65, 0x00, 0x53, 0x79, 0x73, 0x74, 0x65, 0x6D, 0x00, 0x57, 0x72,
+    0x69, 0x74, 0x65, 0x4C, 0x69, 0x6E, 0x65, 0x00, 0x4F, 0x62, 0x6A, 0x65,
+    0x63, 0x74, 0x00, 0x2E, 0x63, 0x74, 0x6F, 0x72, 0x00, 0x4D, 0x61, 0x69,
+    0x6E, 0x00, 0x74, 0x65, 0x73, 0x74, 0x00, 0x52, 0x75, 0x6E, 0x74, 0x69,
+    0x6D, 0x65, 0x43, 0x6F, 0x6D, 0x70, 0x61, 0x74, 0x69, 0x62, 0x69, 0x6C,
+    0x69, 0x74, 0x79, 0x41, 0x74, 0x74, 0x72, 0x69, 0x62, 0x75, 0x74, 0x65,
+    0x00, 0x53, 0x79, 0x73, 0x74, 0x65, 0x6D, 0x2E, 0x52, 0x75, 0x6E, 0x74,
+    0x69, 0x6D, 0x65, 0x2E, 0x43, 0x6F, 0x6D, 0x70, 0x69, 0x6C, 0x65, 0x72,
+    0x53, 0x65, 0x72, 0x76, 0x69, 0x63, 0x65, 0x73, 0x00, 0x6D, 0x73, 0x63,
+    0x6F, 0x72, 0x6C, 0x69, 0x62, 0x00, 0x74, 0x65, 0x73, 0x74, 0x2E, 0x65,
+    0x78, 0x65, 0x00, 0x00, 0x00, 0x21, 0x48, 0x00, 0x65, 0x00, 0x6C, 0x00,
+    0x6C, 0x00, 0x6F, 0x00, 0x20, 0x00, 0x66, 0x00, 0x72, 0x00, 0x6F, 0x00,
+    0x6D, 0x00, 0x20, 0x00, 0x2E, 0x00, 0x4E, 0x00, 0x45, 0x00, 0x54, 0x00,
+    0x21, 0x00, 0x00, 0x00, 0xFD, 0xD8, 0x4D, 0xE6, 0xC9, 0x27, 0xC8, 0x49,
+    0x87, 0xAB, 0x26, 0xB7, 0xFB, 0xF0, 0xC4, 0xD7, 0x00, 0x04, 0x00, 0x01,
+    0x01, 0x0E, 0x03, 0x20, 0x00, 0x01, 0x03, 0x00, 0x00, 0x01, 0x1E, 0x01,
+    0x00, 0x01, 0x00, 0x54, 0x02, 0x16, 0x57, 0x72, 0x61, 0x70, 0x4E, 0x6F,
+    0x6E, 0x45, 0x78, 0x63, 0x65, 0x70, 0x74, 0x69, 0x6F, 0x6E, 0x54, 0x68,
+    0x72, 0x6F, 0x77, 0x73, 0x01, 0x08, 0xB7, 0x7A, 0x5C, 0x56, 0x19, 0x34,
+    0xE0, 0x89, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0xC8, 0x22, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0xDE, 0x22, 0x00, 0x00,
+    0x00, 0x20, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0xD0, 0x22, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x5F, 0x43,
+    0x6F, 0x72, 0x45, 0x78, 0x65, 0x4D, 0x61, 0x69, 0x6E, 0x00, 0x6D, 0x73,
+    0x63, 0x6F, 0x72, 0x65, 0x65, 0x2E, 0x64, 0x6C, 0x6C, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0xFF, 0x25, 0x00, 0x20, 0x40, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x01, 0x00, 0x10, 0x00, 0x00, 0x00, 0x18, 0x00, 0x00, 0x80,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x01, 0x00, 0x01, 0x00, 0x00, 0x00, 0x30, 0x00, 0x00, 0x80,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x48, 0x00, 0x00, 0x00,
+    0x58, 0x40, 0x00, 0x00, 0x80, 0x02, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x80, 0x02, 0x34, 0x00, 0x00, 0x00, 0x56, 0x00,
+    0x53, 0x00, 0x5F, 0x00, 0x56, 0x00, 0x45, 0x00, 0x52, 0x00, 0x53, 0x00,
+    0x49, 0x00, 0x4F, 0x00, 0x4E, 0x00, 0x5F, 0x00, 0x49, 0x00, 0x4E, 0x00,
+    0x46, 0x00, 0x4F, 0x00, 0x00, 0x00, 0x00, 0x00, 0xBD, 0x04, 0xEF, 0xFE,
+    0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x3F, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x04, 0x00, 0x00, 0x00, 0x02, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x44, 0x00, 0x00, 0x00, 0x01, 0x00, 0x56, 0x00, 0x61, 0x00, 0x72, 0x00,
+    0x46, 0x00, 0x69, 0x00, 0x6C, 0x00, 0x65, 0x00, 0x49, 0x00, 0x6E, 0x00,
+    0x66, 0x00, 0x6F, 0x00, 0x00, 0x00, 0x00, 0x00, 0x24, 0x00, 0x04, 0x00,
+    0x00, 0x00, 0x54, 0x00, 0x72, 0x00, 0x61, 0x00, 0x6E, 0x00, 0x73, 0x00,
+    0x6C, 0x00, 0x61, 0x00, 0x74, 0x00, 0x69, 0x00, 0x6F, 0x00, 0x6E, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x7F, 0x00, 0xB0, 0x04, 0xE0, 0x01, 0x00, 0x00,
+    0x01, 0x00, 0x53, 0x00, 0x74, 0x00, 0x72, 0x00, 0x69, 0x00, 0x6E, 0x00,
+    0x67, 0x00, 0x46, 0x00, 0x69, 0x00, 0x6C, 0x00, 0x65, 0x00, 0x49, 0x00,
+    0x6E, 0x00, 0x66, 0x00, 0x6F, 0x00, 0x00, 0x00, 0xBC, 0x01, 0x00, 0x00,
+    0x01, 0x00, 0x30, 0x00, 0x30, 0x00, 0x37, 0x00, 0x66, 0x00, 0x30, 0x00,
+    0x34, 0x00, 0x62, 0x00, 0x30, 0x00, 0x00, 0x00, 0x1C, 0x00, 0x02, 0x00,
+    0x01, 0x00, 0x43, 0x00, 0x6F, 0x00, 0x6D, 0x00, 0x6D, 0x00, 0x65, 0x00,
+    0x6E, 0x00, 0x74, 0x00, 0x73, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x00,
+    0x24, 0x00, 0x02, 0x00, 0x01, 0x00, 0x43, 0x00, 0x6F, 0x00, 0x6D, 0x00,
+    0x70, 0x00, 0x61, 0x00, 0x6E, 0x00, 0x79, 0x00, 0x4E, 0x00, 0x61, 0x00,
+    0x6D, 0x00, 0x65, 0x00, 0x00, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x00,
+    0x2C, 0x00, 0x02, 0x00, 0x01, 0x00, 0x46, 0x00, 0x69, 0x00, 0x6C, 0x00,
+    0x65, 0x00, 0x44, 0x00, 0x65, 0x00, 0x73, 0x00, 0x63, 0x00, 0x72, 0x00,
+    0x69, 0x00, 0x70, 0x00, 0x74, 0x00, 0x69, 0x00, 0x6F, 0x00, 0x6E, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x00, 0x30, 0x00, 0x08, 0x00,
+    0x01, 0x00, 0x46, 0x00, 0x69, 0x00, 0x6C, 0x00, 0x65, 0x00, 0x56, 0x00,
+    0x65, 0x00, 0x72, 0x00, 0x73, 0x00, 0x69, 0x00, 0x6F, 0x00, 0x6E, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x30, 0x00, 0x2E, 0x00, 0x30, 0x00, 0x2E, 0x00,
+    0x30, 0x00, 0x2E, 0x00, 0x30, 0x00, 0x00, 0x00, 0x2C, 0x00, 0x05, 0x00,
+    0x01, 0x00, 0x49, 0x00, 0x6E, 0x00, 0x74, 0x00, 0x65, 0x00, 0x72, 0x00,
+    0x6E, 0x00, 0x61, 0x00, 0x6C, 0x00, 0x4E, 0x00, 0x61, 0x00, 0x6D, 0x00,
+    0x65, 0x00, 0x00, 0x00, 0x74, 0x00, 0x65, 0x00, 0x73, 0x00, 0x74, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x28, 0x00, 0x02, 0x00, 0x01, 0x00, 0x4C, 0x00,
+    0x65, 0x00, 0x67, 0x00, 0x61, 0x00, 0x6C, 0x00, 0x43, 0x00, 0x6F, 0x00,
+    0x70, 0x00, 0x79, 0x00, 0x72, 0x00, 0x69, 0x00, 0x67, 0x00, 0x68, 0x00,
+    0x74, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x00, 0x2C, 0x00, 0x02, 0x00,
+    0x01, 0x00, 0x4C, 0x00, 0x65, 0x00, 0x67, 0x00, 0x61, 0x00, 0x6C, 0x00,
+    0x54, 0x00, 0x72, 0x00, 0x61, 0x00, 0x64, 0x00, 0x65, 0x00, 0x6D, 0x00,
+    0x61, 0x00, 0x72, 0x00, 0x6B, 0x00, 0x73, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x20, 0x00, 0x00, 0x00, 0x3C, 0x00, 0x09, 0x00, 0x01, 0x00, 0x4F, 0x00,
+    0x72, 0x00, 0x69, 0x00, 0x67, 0x00, 0x69, 0x00, 0x6E, 0x00, 0x61, 0x00,
+    0x6C, 0x00, 0x46, 0x00, 0x69, 0x00, 0x6C, 0x00, 0x65, 0x00, 0x6E, 0x00,
+    0x61, 0x00, 0x6D, 0x00, 0x65, 0x00, 0x00, 0x00, 0x74, 0x00, 0x65, 0x00,
+    0x73, 0x00, 0x74, 0x00, 0x2E, 0x00, 0x65, 0x00, 0x78, 0x00, 0x65, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x24, 0x00, 0x02, 0x00, 0x01, 0x00, 0x50, 0x00,
+    0x72, 0x00, 0x6F, 0x00, 0x64, 0x00, 0x75, 0x00, 0x63, 0x00, 0x74, 0x00,
+    0x4E, 0x00, 0x61, 0x00, 0x6D, 0x00, 0x65, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x20, 0x00, 0x00, 0x00, 0x28, 0x00, 0x02, 0x00, 0x01, 0x00, 0x50, 0x00,
+    0x72, 0x00, 0x6F, 0x00, 0x64, 0x00, 0x75, 0x00, 0x63, 0x00, 0x74, 0x00,
+    0x56, 0x00, 0x65, 0x00, 0x72, 0x00, 0x73, 0x00, 0x69, 0x00, 0x6F, 0x00,
+    0x6E, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x0C, 0x00, 0x00, 0x00,
+    0xF0, 0x32, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00
+])
+
+# what --lazy-components defers. PsoBB.exe runs without them, only online.exe needs .NET and MSHTML
+LAZY_COMPONENTS = ("mono", "gecko")
+# keeps wine from offering its own mono/gecko download while ours are still deferred
+LAZY_DLL_OVERRIDES = "mscoree,mshtml=d"
+# what verify_components checks unless told otherwise
+VERIFY_COMPONENTS = ("mono", "gecko", "dxvk")
+
 class WineUtils(CommandRunner):
     def __init__(self):
         self.prefix_path = os.environ.get('WINEPREFIX') or os.path.expanduser("~/.local/share/ephinea-prefix")
@@ -28,51 +296,167 @@ class WineUtils(CommandRunner):
         self.env = os.environ.copy()
         self.env["WINEPREFIX"] = self.prefix_path
         self.env["WINEDEBUG"] = "-all"
+        # CommandResults grouped by phase, so a slow install can be pinned on one step
+        self.phase = None
+        self.phase_results = {}
+        # step_history.InstallProgress while installing, adapts timeouts and prints the ETA
+        self.progress = None
+        # for the metrics export: what each artifact lookup did, and components that didn't make it
+        self.artifact_fetches = []
+        self.failed_components = []
     
-    def run_command(self, command, timeout=60, env=None, capture_output=False):
+    def run_command(self, command, timeout=60, env=None, capture_output=False, step=None):
         if env is None:
             env = self.env
-        return super().run_command(command, timeout=timeout, env=env, capture_output=capture_output)
+        step_key = None
+        if self.progress:
+            from step_history import step_name
+            step_key = step_name(self.phase, command, step)
+            timeout = self.progress.start_step(step_key, timeout)
+        result = super().run_command(command, timeout=timeout, env=env, capture_output=capture_output)
+        command_result = result[0] if capture_output else result
+        if step_key:
+            self.progress.finish_step(step_key, command_result)
+        self.phase_results.setdefault(self.phase or "other", []).append(command_result)
+        if os.environ.get('PSO_DEBUG'):
+            print(f"Debug - {command_result.summary()}")
+        return result
+
+    def run_probe(self, command, timeout=10, env=None):
+        result = super().run_probe(command, timeout=timeout, env=self.env if env is None else env)
+        self.phase_results.setdefault(self.phase or "other", []).append(result)
+        if os.environ.get('PSO_DEBUG'):
+            print(f"Debug - probe {result.summary()}")
+        return result
+
+    @contextmanager
+    def run_phase(self, name):
+        """Attribute every command run inside the block to this phase"""
+        previous = self.phase
+        self.phase = name
+        try:
+            yield
+        finally:
+            self.phase = previous
+
+    def phase_totals(self):
+        """Per phase sums in the order the phases first ran"""
+        totals = []
+        for name, results in self.phase_results.items():
+            slowest = max(results, key=lambda r: r.wall_time)
+            totals.append({
+                "phase": name,
+                "commands": len(results),
+                "wall_time": round(sum(r.wall_time for r in results), 3),
+                "user_time": round(sum(r.user_time for r in results), 3),
+                "system_time": round(sum(r.system_time for r in results), 3),
+                "max_rss_kb": max(r.max_rss_kb for r in results),
+                "voluntary_switches": sum(r.voluntary_switches for r in results),
+                "involuntary_switches": sum(r.involuntary_switches for r in results),
+                "failed": sum(1 for r in results if r != 0),
+                "timed_out": sum(1 for r in results if r.timed_out),
+                "slowest": slowest.as_dict(),
+            })
+        return totals
+
+    def format_phase_report(self):
+        lines = [f"{'Phase':<12} {'Cmds':>4} {'Wall':>8} {'User':>8} {'Sys':>8} {'MaxRSS':>8}  Slowest"]
+        for total in self.phase_totals():
+            slowest = total["slowest"]
+            flags = "".join([f", {total['failed']} failed" if total["failed"] else "",
+                             f", {total['timed_out']} timed out" if total["timed_out"] else ""])
+            lines.append(f"{total['phase']:<12} {total['commands']:>4} {total['wall_time']:>7.1f}s "
+                         f"{total['user_time']:>7.1f}s {total['system_time']:>7.1f}s "
+                         f"{total['max_rss_kb'] / 1024:>6.0f}MB  {slowest['command']} ({slowest['wall_time']:.1f}s){flags}")
+        return "\n".join(lines)
 
         
+    def _debug_env(self, title):
+        # full WINE* dump is noise on every launch, PSO_DEBUG=1 brings it back
+        if not os.environ.get('PSO_DEBUG'):
+            return
+        print(title)
+        for key in sorted(self.env.keys()):
+            if key.startswith('WINE'):
+                print(f"{key}={self.env[key]}")
+
     # hacky gui suppression methods. Allow us to not show windows when we want, like wine updating or install. WINE GUIS   
     # but its fun at least 
     def suppress_gui(self):
         """Enable GUI suppression for installation/setup"""
-        print("Current environment before suppression:")
-        for key in sorted(self.env.keys()):
-            if key.startswith('WINE'):
-                print(f"{key}={self.env[key]}")
-        
+        self._debug_env("Current environment before suppression:")
+
         self.env["WINEDLLOVERRIDES"] = "mscoree=d;winemenubuilder.exe=d"
         self.env["DISPLAY"] = ""
         
-    def enable_gui(self):
-        """Enable GUI for game execution"""
-        print("Current environment before GUI enable:")
-        for key in sorted(self.env.keys()):
-            if key.startswith('WINE'):
-                print(f"{key}={self.env[key]}")
-                
+    def enable_gui(self, profile=None):
+        """Enable GUI for game execution, optionally applying a named launch profile"""
+        self._debug_env("Current environment before GUI enable:")
+
         # Restore original environment except WINEPREFIX and WINEDEBUG
         self.env = self.original_env.copy()
         self.env["WINEPREFIX"] = self.prefix_path
         self.env["WINEDEBUG"] = "-all"
+        # a profile's DXVK_CONFIG still applies on top of the managed dxvk.conf
+        self.env.update(config_env(self.prefix_path))
+
+        if profile:
+            print(f"Applying launch profile: {profile}")
+            self.env.update(profile_env(resolve_profile(profile)))
         
-        print("Environment after restore:")
-        for key in sorted(self.env.keys()):
-            if key.startswith('WINE'):
-                print(f"{key}={self.env[key]}")
-        
-    def execute_game(self, command):
+        self._debug_env("Environment after restore:")
+
+    def apply_dxvk_preset(self, name=None):
+        """(Re)write the managed dxvk.conf next to PsoBB.exe, for name or the preset the prefix remembers"""
+        from prefix_status import get_install_dir
+        install_dir = get_install_dir(self.prefix_path)
+        if not os.path.isdir(install_dir):
+            raise WineSetupError(f"Ephinea is not installed at {install_dir}, can't write {CONFIG_NAME}")
+        try:
+            config_path, changed = write_config(self.prefix_path, install_dir, name)
+        except DxvkConfigError as e:
+            raise WineSetupError(str(e))
+        preset, _ = read_preset(self.prefix_path)
+        if changed:
+            print(f"Wrote {config_path} (DXVK preset {preset})")
+        return preset
+
+    def execute_game(self, command, detach=False, profile=None, extra_env=None, sampler=None, tuner=None):
         """Execute the game with GUI enabled"""
-        self.enable_gui()
-        return self.run_command(command, timeout=None)
+        self.enable_gui(profile)
+        if extra_env:
+            self.env.update(extra_env)
+        if detach:
+            # hand off to a supervisor, returns the game pid instead of an exit code
+            supervisor = GameSupervisor(self.get_log_dir())
+            game_pid = supervisor.launch(command, self.env, sampler=sampler)
+            if tuner and game_pid is not None:
+                # stick around just long enough to pin the game and wineserver
+                tuner.start()
+                tuner.join()
+                print(tuner.report())
+            return game_pid
+
+        if tuner:
+            tuner.start(on_done=lambda: print(tuner.report()))
+        if sampler:
+            sampler.start()
+        try:
+            return self.run_command(command, timeout=None)
+        finally:
+            if sampler:
+                # pso.bat starts the game with start /b, so keep sampling until the prefix goes quiet
+                print("Sampling wine processes until the session ends...")
+                try:
+                    sampler.finish()
+                except KeyboardInterrupt:
+                    sampler.stop()
+                print(sampler.summary())
 
     def check_wine_installed(self):
         """Check if Wine is installed on the system"""
         try:
-            result = self.run_command(["wine", "--version"], timeout=10)
+            result = self.run_probe(["wine", "--version"], timeout=10)
             return result == 0
         except Exception:
             return False
@@ -94,20 +478,32 @@ class WineUtils(CommandRunner):
         # Check system paths as fallback
         return any(pathlib.Path(path).exists() for path in possible_paths)
 
-    def download_file(self, url, destination):
-        """Download a file from URL to destination"""
-        print(f"Downloading {url}...")
-        temp_file = f"{destination}.tmp"
+    def fetch_artifact(self, url, filename):
+        """Cached download of url (shared cache first if set), revalidated with the server once PSO_CACHE_TTL runs out"""
+        from artifact_cache import ArtifactCache, ArtifactError, get_shared_cache_dir
         try:
-            urllib.request.urlretrieve(url, temp_file)
-            shutil.move(temp_file, destination)
-            print("Download completed!")
-            return True
-        except Exception as e:
+            path, state = ArtifactCache(self.get_cache_dir(), shared_dir=get_shared_cache_dir()).fetch(url, filename)
+        except ArtifactError as e:
             print(f"Download failed: {e}")
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-            return False
+            self.artifact_fetches.append({"artifact": filename, "state": "failed", "bytes": 0})
+            return None
+        self.artifact_fetches.append({"artifact": filename, "state": state,
+                                      "bytes": os.path.getsize(path) if state == "downloaded" else 0})
+        messages = {
+            "fresh": f"Using cached {filename}",
+            "revalidated": f"Cached {filename} is up to date (304 Not Modified)",
+            "downloaded": f"Downloaded {filename}",
+            "stale": f"Could not reach the server, using cached {filename}",
+            "shared": f"Using {filename} from the shared cache",
+        }
+        print(messages[state])
+        try:
+            from cache_gc import record_use
+            record_use(self.prefix_path, os.path.dirname(path), filename, url)
+        except OSError as e:
+            # only costs gc its knowledge that this prefix needs the file
+            print(f"Warning: could not record {filename} in the install journal: {e}")
+        return path
         
     def get_cache_dir(self):
         # Is packaged install?
@@ -120,6 +516,12 @@ class WineUtils(CommandRunner):
         elif platform.system() == "Darwin":
             return os.path.expanduser("~/Library/Caches/pso_wine")
         return None
+
+    def get_log_dir(self):
+        # same logs folder pso.bat writes to, unless packaged install moves it
+        if 'PSO_LOG_DIR' in os.environ:
+            return os.environ['PSO_LOG_DIR']
+        return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
     
     def cleanup_cache(self):
         #remove any installed cached files if they exist
@@ -144,7 +546,7 @@ class WineUtils(CommandRunner):
         # Try system Mono first if available
         if has_system_mono:
             print("\nAttempting to configure system Mono...")
-            if self._verify_mono_installation(has_system_mono):
+            if self._verify_component("mono", has_system_mono=True):
                 print("System Mono configured successfully!")
                 return True
             print("System Mono verification failed, falling back to MSI installation...")
@@ -154,14 +556,12 @@ class WineUtils(CommandRunner):
         mono_version = "9.3.0"
         mono_filename = f"wine-mono-{mono_version}-x86.msi"
         mono_url = f"https://dl.winehq.org/wine/wine-mono/{mono_version}/{mono_filename}"
-        mono_path = os.path.join(cache_dir, mono_filename)
 
         try:
-            # Download if needed
-            have_valid_installer = os.path.exists(mono_path) and os.path.getsize(mono_path) >= 1024
-            if not have_valid_installer:
-                if not self.download_file(mono_url, mono_path):
-                    return False
+            # Download, or revalidate the cached copy. may live in the shared cache
+            mono_path = self.fetch_artifact(mono_url, mono_filename)
+            if not mono_path:
+                return False
 
             print("Installing Wine Mono via MSI...")
             
@@ -183,7 +583,7 @@ class WineUtils(CommandRunner):
                 return False
                 
             # Final verification
-            if self._verify_mono_installation(False):  # Pass False to force MSI verification path
+            if self._verify_component("mono", has_system_mono=False):
                 print("Wine Mono MSI installation completed successfully!")
                 return True
             else:
@@ -194,417 +594,11 @@ class WineUtils(CommandRunner):
             print(f"Error during Mono installation: {e}")
             return False
         
-    #Temporary resetting of env vars back to default. Useful since we disabled mono popups on install too.    
-    @contextmanager
-    def temporary_gui_enable(self):
-        """Temporarily restore GUI settings for tests/verification"""
-        old_overrides = self.env.get("WINEDLLOVERRIDES")
-        old_display = self.env.get("DISPLAY")
-        
-        # Clear the suppressions
-        if "WINEDLLOVERRIDES" in self.env:
-            del self.env["WINEDLLOVERRIDES"]
-        if "DISPLAY" in self.env:
-            del self.env["DISPLAY"]
-            
-        try:
-            yield
-        finally:
-            # Restore previous state
-            if old_overrides:
-                self.env["WINEDLLOVERRIDES"] = old_overrides
-            if old_display is not None:
-                self.env["DISPLAY"] = old_display
-
-    def _verify_mono_installation(self, has_system_mono=None):
-        
-        exe_bytes = bytes([
-            0x4D, 0x5A, 0x90, 0x00, 0x03, 0x00, 0x00, 0x00, 0x04, 0x00, 0x00, 0x00,
-            0xFF, 0xFF, 0x00, 0x00, 0xB8, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x40, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x80, 0x00, 0x00, 0x00, 0x0E, 0x1F, 0xBA, 0x0E, 0x00, 0xB4, 0x09, 0xCD,
-            0x21, 0xB8, 0x01, 0x4C, 0xCD, 0x21, 0x54, 0x68, 0x69, 0x73, 0x20, 0x70,
-            0x72, 0x6F, 0x67, 0x72, 0x61, 0x6D, 0x20, 0x63, 0x61, 0x6E, 0x6E, 0x6F,
-            0x74, 0x20, 0x62, 0x65, 0x20, 0x72, 0x75, 0x6E, 0x20, 0x69, 0x6E, 0x20,
-            0x44, 0x4F, 0x53, 0x20, 0x6D, 0x6F, 0x64, 0x65, 0x2E, 0x0D, 0x0D, 0x0A,
-            0x24, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x50, 0x45, 0x00, 0x00,
-            0x4C, 0x01, 0x03, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0xE0, 0x00, 0x02, 0x01, 0x0B, 0x01, 0x08, 0x00,
-            0x00, 0x04, 0x00, 0x00, 0x00, 0x06, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0xEE, 0x22, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x00, 0x40, 0x00, 0x00,
-            0x00, 0x00, 0x40, 0x00, 0x00, 0x20, 0x00, 0x00, 0x00, 0x02, 0x00, 0x00,
-            0x04, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x04, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x80, 0x00, 0x00, 0x00, 0x02, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x03, 0x00, 0x40, 0x85, 0x00, 0x00, 0x10, 0x00,
-            0x00, 0x10, 0x00, 0x00, 0x00, 0x00, 0x10, 0x00, 0x00, 0x10, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x10, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0xA0, 0x22, 0x00, 0x00, 0x4B, 0x00, 0x00, 0x00,
-            0x00, 0x40, 0x00, 0x00, 0xD8, 0x02, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x60, 0x00, 0x00, 0x0C, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00,
-            0x08, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x08, 0x20, 0x00, 0x00, 0x48, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x2E, 0x74, 0x65, 0x78, 0x74, 0x00, 0x00, 0x00,
-            0xF4, 0x02, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x00, 0x04, 0x00, 0x00,
-            0x00, 0x02, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x60, 0x2E, 0x72, 0x73, 0x72,
-            0x63, 0x00, 0x00, 0x00, 0xD8, 0x02, 0x00, 0x00, 0x00, 0x40, 0x00, 0x00,
-            0x00, 0x04, 0x00, 0x00, 0x00, 0x06, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x40, 0x00, 0x00, 0x40,
-            0x2E, 0x72, 0x65, 0x6C, 0x6F, 0x63, 0x00, 0x00, 0x0C, 0x00, 0x00, 0x00,
-            0x00, 0x60, 0x00, 0x00, 0x00, 0x02, 0x00, 0x00, 0x00, 0x0A, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x40, 0x00, 0x00, 0x42, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0xD0, 0x22, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x48, 0x00, 0x00, 0x00, 0x02, 0x00, 0x05, 0x00,
-            0x64, 0x20, 0x00, 0x00, 0x38, 0x02, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00,
-            0x02, 0x00, 0x00, 0x06, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x1E, 0x02, 0x28, 0x02, 0x00, 0x00, 0x0A, 0x2A,
-            0x2E, 0x72, 0x01, 0x00, 0x00, 0x70, 0x28, 0x01, 0x00, 0x00, 0x0A, 0x2A,
-            0x42, 0x53, 0x4A, 0x42, 0x01, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x0C, 0x00, 0x00, 0x00, 0x76, 0x34, 0x2E, 0x30, 0x2E, 0x33, 0x30, 0x33,
-            0x31, 0x39, 0x00, 0x00, 0x00, 0x00, 0x05, 0x00, 0x6C, 0x00, 0x00, 0x00,
-            0xD0, 0x00, 0x00, 0x00, 0x23, 0x7E, 0x00, 0x00, 0x3C, 0x01, 0x00, 0x00,
-            0x90, 0x00, 0x00, 0x00, 0x23, 0x53, 0x74, 0x72, 0x69, 0x6E, 0x67, 0x73,
-            0x00, 0x00, 0x00, 0x00, 0xCC, 0x01, 0x00, 0x00, 0x24, 0x00, 0x00, 0x00,
-            0x23, 0x55, 0x53, 0x00, 0xF0, 0x01, 0x00, 0x00, 0x10, 0x00, 0x00, 0x00,
-            0x23, 0x47, 0x55, 0x49, 0x44, 0x00, 0x00, 0x00, 0x00, 0x02, 0x00, 0x00,
-            0x38, 0x00, 0x00, 0x00, 0x23, 0x42, 0x6C, 0x6F, 0x62, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x02, 0x00, 0x00, 0x10, 0x47, 0x14, 0x00, 0x00,
-            0x09, 0x00, 0x00, 0x00, 0x00, 0xFA, 0x01, 0x33, 0x00, 0x16, 0x00, 0x00,
-            0x01, 0x00, 0x00, 0x00, 0x03, 0x00, 0x00, 0x00, 0x02, 0x00, 0x00, 0x00,
-            0x02, 0x00, 0x00, 0x00, 0x03, 0x00, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00,
-            0x01, 0x00, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x86, 0x00,
-            0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x06, 0x00, 0x0F, 0x00, 0x17, 0x00,
-            0x06, 0x00, 0x28, 0x00, 0x17, 0x00, 0x06, 0x00, 0x3F, 0x00, 0x5D, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x01, 0x00,
-            0x01, 0x00, 0x00, 0x00, 0x10, 0x00, 0x0A, 0x00, 0x00, 0x00, 0x09, 0x00,
-            0x01, 0x00, 0x01, 0x00, 0x50, 0x20, 0x00, 0x00, 0x00, 0x00, 0x86, 0x18,
-            0x2F, 0x00, 0x06, 0x00, 0x01, 0x00, 0x58, 0x20, 0x00, 0x00, 0x00, 0x00,
-            0x91, 0x00, 0x35, 0x00, 0x0A, 0x00, 0x01, 0x00, 0x09, 0x00, 0x1E, 0x00,
-            0x01, 0x00, 0x11, 0x00, 0x2F, 0x00, 0x06, 0x00, 0x19, 0x00, 0x2F, 0x00,
-            0x06, 0x00, 0x2E, 0x00, 0x1B, 0x00, 0x0E, 0x00, 0x04, 0x80, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x3A, 0x00, 0x00, 0x00, 0x04, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x2D, 0x00, 0x7D, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x3C, 0x4D, 0x6F, 0x64, 0x75, 0x6C, 0x65,
-            0x3E, 0x00, 0x54, 0x65, 0x73, 0x74, 0x00, 0x43, 0x6F, 0x6E, 0x73, 0x6F,
-            0x6C, 0x65, 0x00, 0x53, 0x79, 0x73, 0x74, 0x65, 0x6D, 0x00, 0x57, 0x72,
-            0x69, 0x74, 0x65, 0x4C, 0x69, 0x6E, 0x65, 0x00, 0x4F, 0x62, 0x6A, 0x65,
-            0x63, 0x74, 0x00, 0x2E, 0x63, 0x74, 0x6F, 0x72, 0x00, 0x4D, 0x61, 0x69,
-            0x6E, 0x00, 0x74, 0x65, 0x73, 0x74, 0x00, 0x52, 0x75, 0x6E, 0x74, 0x69,
-            0x6D, 0x65, 0x43, 0x6F, 0x6D, 0x70, 0x61, 0x74, 0x69, 0x62, 0x69, 0x6C,
-            0x69, 0x74, 0x79, 0x41, 0x74, 0x74, 0x72, 0x69, 0x62, 0x75, 0x74, 0x65,
-            0x00, 0x53, 0x79, 0x73, 0x74, 0x65, 0x6D, 0x2E, 0x52, 0x75, 0x6E, 0x74,
-            0x69, 0x6D, 0x65, 0x2E, 0x43, 0x6F, 0x6D, 0x70, 0x69, 0x6C, 0x65, 0x72,
-            0x53, 0x65, 0x72, 0x76, 0x69, 0x63, 0x65, 0x73, 0x00, 0x6D, 0x73, 0x63,
-            0x6F, 0x72, 0x6C, 0x69, 0x62, 0x00, 0x74, 0x65, 0x73, 0x74, 0x2E, 0x65,
-            0x78, 0x65, 0x00, 0x00, 0x00, 0x21, 0x48, 0x00, 0x65, 0x00, 0x6C, 0x00,
-            0x6C, 0x00, 0x6F, 0x00, 0x20, 0x00, 0x66, 0x00, 0x72, 0x00, 0x6F, 0x00,
-            0x6D, 0x00, 0x20, 0x00, 0x2E, 0x00, 0x4E, 0x00, 0x45, 0x00, 0x54, 0x00,
-            0x21, 0x00, 0x00, 0x00, 0xFD, 0xD8, 0x4D, 0xE6, 0xC9, 0x27, 0xC8, 0x49,
-            0x87, 0xAB, 0x26, 0xB7, 0xFB, 0xF0, 0xC4, 0xD7, 0x00, 0x04, 0x00, 0x01,
-            0x01, 0x0E, 0x03, 0x20, 0x00, 0x01, 0x03, 0x00, 0x00, 0x01, 0x1E, 0x01,
-            0x00, 0x01, 0x00, 0x54, 0x02, 0x16, 0x57, 0x72, 0x61, 0x70, 0x4E, 0x6F,
-            0x6E, 0x45, 0x78, 0x63, 0x65, 0x70, 0x74, 0x69, 0x6F, 0x6E, 0x54, 0x68,
-            0x72, 0x6F, 0x77, 0x73, 0x01, 0x08, 0xB7, 0x7A, 0x5C, 0x56, 0x19, 0x34,
-            0xE0, 0x89, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0xC8, 0x22, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0xDE, 0x22, 0x00, 0x00,
-            0x00, 0x20, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0xD0, 0x22, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x5F, 0x43,
-            0x6F, 0x72, 0x45, 0x78, 0x65, 0x4D, 0x61, 0x69, 0x6E, 0x00, 0x6D, 0x73,
-            0x63, 0x6F, 0x72, 0x65, 0x65, 0x2E, 0x64, 0x6C, 0x6C, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0xFF, 0x25, 0x00, 0x20, 0x40, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x01, 0x00, 0x10, 0x00, 0x00, 0x00, 0x18, 0x00, 0x00, 0x80,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x01, 0x00, 0x01, 0x00, 0x00, 0x00, 0x30, 0x00, 0x00, 0x80,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x48, 0x00, 0x00, 0x00,
-            0x58, 0x40, 0x00, 0x00, 0x80, 0x02, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x80, 0x02, 0x34, 0x00, 0x00, 0x00, 0x56, 0x00,
-            0x53, 0x00, 0x5F, 0x00, 0x56, 0x00, 0x45, 0x00, 0x52, 0x00, 0x53, 0x00,
-            0x49, 0x00, 0x4F, 0x00, 0x4E, 0x00, 0x5F, 0x00, 0x49, 0x00, 0x4E, 0x00,
-            0x46, 0x00, 0x4F, 0x00, 0x00, 0x00, 0x00, 0x00, 0xBD, 0x04, 0xEF, 0xFE,
-            0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x3F, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x04, 0x00, 0x00, 0x00, 0x02, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x44, 0x00, 0x00, 0x00, 0x01, 0x00, 0x56, 0x00, 0x61, 0x00, 0x72, 0x00,
-            0x46, 0x00, 0x69, 0x00, 0x6C, 0x00, 0x65, 0x00, 0x49, 0x00, 0x6E, 0x00,
-            0x66, 0x00, 0x6F, 0x00, 0x00, 0x00, 0x00, 0x00, 0x24, 0x00, 0x04, 0x00,
-            0x00, 0x00, 0x54, 0x00, 0x72, 0x00, 0x61, 0x00, 0x6E, 0x00, 0x73, 0x00,
-            0x6C, 0x00, 0x61, 0x00, 0x74, 0x00, 0x69, 0x00, 0x6F, 0x00, 0x6E, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x7F, 0x00, 0xB0, 0x04, 0xE0, 0x01, 0x00, 0x00,
-            0x01, 0x00, 0x53, 0x00, 0x74, 0x00, 0x72, 0x00, 0x69, 0x00, 0x6E, 0x00,
-            0x67, 0x00, 0x46, 0x00, 0x69, 0x00, 0x6C, 0x00, 0x65, 0x00, 0x49, 0x00,
-            0x6E, 0x00, 0x66, 0x00, 0x6F, 0x00, 0x00, 0x00, 0xBC, 0x01, 0x00, 0x00,
-            0x01, 0x00, 0x30, 0x00, 0x30, 0x00, 0x37, 0x00, 0x66, 0x00, 0x30, 0x00,
-            0x34, 0x00, 0x62, 0x00, 0x30, 0x00, 0x00, 0x00, 0x1C, 0x00, 0x02, 0x00,
-            0x01, 0x00, 0x43, 0x00, 0x6F, 0x00, 0x6D, 0x00, 0x6D, 0x00, 0x65, 0x00,
-            0x6E, 0x00, 0x74, 0x00, 0x73, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x00,
-            0x24, 0x00, 0x02, 0x00, 0x01, 0x00, 0x43, 0x00, 0x6F, 0x00, 0x6D, 0x00,
-            0x70, 0x00, 0x61, 0x00, 0x6E, 0x00, 0x79, 0x00, 0x4E, 0x00, 0x61, 0x00,
-            0x6D, 0x00, 0x65, 0x00, 0x00, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x00,
-            0x2C, 0x00, 0x02, 0x00, 0x01, 0x00, 0x46, 0x00, 0x69, 0x00, 0x6C, 0x00,
-            0x65, 0x00, 0x44, 0x00, 0x65, 0x00, 0x73, 0x00, 0x63, 0x00, 0x72, 0x00,
-            0x69, 0x00, 0x70, 0x00, 0x74, 0x00, 0x69, 0x00, 0x6F, 0x00, 0x6E, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x00, 0x30, 0x00, 0x08, 0x00,
-            0x01, 0x00, 0x46, 0x00, 0x69, 0x00, 0x6C, 0x00, 0x65, 0x00, 0x56, 0x00,
-            0x65, 0x00, 0x72, 0x00, 0x73, 0x00, 0x69, 0x00, 0x6F, 0x00, 0x6E, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x30, 0x00, 0x2E, 0x00, 0x30, 0x00, 0x2E, 0x00,
-            0x30, 0x00, 0x2E, 0x00, 0x30, 0x00, 0x00, 0x00, 0x2C, 0x00, 0x05, 0x00,
-            0x01, 0x00, 0x49, 0x00, 0x6E, 0x00, 0x74, 0x00, 0x65, 0x00, 0x72, 0x00,
-            0x6E, 0x00, 0x61, 0x00, 0x6C, 0x00, 0x4E, 0x00, 0x61, 0x00, 0x6D, 0x00,
-            0x65, 0x00, 0x00, 0x00, 0x74, 0x00, 0x65, 0x00, 0x73, 0x00, 0x74, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x28, 0x00, 0x02, 0x00, 0x01, 0x00, 0x4C, 0x00,
-            0x65, 0x00, 0x67, 0x00, 0x61, 0x00, 0x6C, 0x00, 0x43, 0x00, 0x6F, 0x00,
-            0x70, 0x00, 0x79, 0x00, 0x72, 0x00, 0x69, 0x00, 0x67, 0x00, 0x68, 0x00,
-            0x74, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x00, 0x2C, 0x00, 0x02, 0x00,
-            0x01, 0x00, 0x4C, 0x00, 0x65, 0x00, 0x67, 0x00, 0x61, 0x00, 0x6C, 0x00,
-            0x54, 0x00, 0x72, 0x00, 0x61, 0x00, 0x64, 0x00, 0x65, 0x00, 0x6D, 0x00,
-            0x61, 0x00, 0x72, 0x00, 0x6B, 0x00, 0x73, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x20, 0x00, 0x00, 0x00, 0x3C, 0x00, 0x09, 0x00, 0x01, 0x00, 0x4F, 0x00,
-            0x72, 0x00, 0x69, 0x00, 0x67, 0x00, 0x69, 0x00, 0x6E, 0x00, 0x61, 0x00,
-            0x6C, 0x00, 0x46, 0x00, 0x69, 0x00, 0x6C, 0x00, 0x65, 0x00, 0x6E, 0x00,
-            0x61, 0x00, 0x6D, 0x00, 0x65, 0x00, 0x00, 0x00, 0x74, 0x00, 0x65, 0x00,
-            0x73, 0x00, 0x74, 0x00, 0x2E, 0x00, 0x65, 0x00, 0x78, 0x00, 0x65, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x24, 0x00, 0x02, 0x00, 0x01, 0x00, 0x50, 0x00,
-            0x72, 0x00, 0x6F, 0x00, 0x64, 0x00, 0x75, 0x00, 0x63, 0x00, 0x74, 0x00,
-            0x4E, 0x00, 0x61, 0x00, 0x6D, 0x00, 0x65, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x20, 0x00, 0x00, 0x00, 0x28, 0x00, 0x02, 0x00, 0x01, 0x00, 0x50, 0x00,
-            0x72, 0x00, 0x6F, 0x00, 0x64, 0x00, 0x75, 0x00, 0x63, 0x00, 0x74, 0x00,
-            0x56, 0x00, 0x65, 0x00, 0x72, 0x00, 0x73, 0x00, 0x69, 0x00, 0x6F, 0x00,
-            0x6E, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x20, 0x00, 0x00, 0x0C, 0x00, 0x00, 0x00,
-            0xF0, 0x32, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00
-        ])
-
-        if has_system_mono is None:
-            has_system_mono = self.check_system_mono()
-        
-        # Create test directory
-        test_dir = os.path.join(self.prefix_path, "drive_c/temp")
-        os.makedirs(test_dir, exist_ok=True)
-        test_exe_path = os.path.join(test_dir, "monotest.exe")
-
-        # Temporarily enable GUI for the test
-        with self.temporary_gui_enable():
-            self.run_command(["wineboot", "-i"], timeout=30)
-            
-            try:
-                print(f"Creating test file at {test_exe_path}")
-                with open(test_exe_path, "wb") as f:
-                    f.write(exe_bytes)
-                
-                os.chmod(test_exe_path, 0o755)
-                
-                if not os.path.exists(test_exe_path):
-                    print(f"  ✗ Failed to create test file")
-                    return False
-                    
-                file_size = os.path.getsize(test_exe_path)
-                print(f"  ✓ Test file created (size: {file_size} bytes)")
-                    
-                run_result, output = self.run_command(
-                    ["wine", test_exe_path],
-                    timeout=30,
-                    capture_output=True,
-                    env=self.env
-                )
-                
-                print(f"  Program output: {output}")
-                print("  Program execution details:")
-                print(f"    Return code: {run_result}")
-                print("    Output:")
-                for line in output.splitlines():
-                    print(f"      {line}")
-                
-                if "Hello from .NET!" in output:
-                    print("  ✓ Runtime test successful - .NET program executed correctly")
-                    if has_system_mono:
-                        print("\nSystem Mono verification completed successfully!")
-                        return True
-                else:
-                    print("  ✗ Runtime test failed - program did not produce expected output")
-                    if has_system_mono:
-                        return False  # Let install_mono() try MSI instead
-                        
-            except Exception as e:
-                print(f"  ✗ Runtime test failed: {e}")
-                if has_system_mono:
-                    return False  # Let install_mono() try MSI instead
-            finally:
-                # Cleanup
-                try:
-                    if os.path.exists(test_exe_path):
-                        os.remove(test_exe_path)
-                        print("  ✓ Test file cleaned up")
-                except Exception as e:
-                    print(f"  ✗ Failed to cleanup test file: {e}")
-
-        # For MSI installations, do additional verification outside the GUI context
-        if not has_system_mono:
-            verification_passed = True
-            
-            # Check registry keys for MSI installation
-            print("\nChecking .NET Framework registry keys:")
-            REQUIRED_REGISTRY_KEYS = [
-                "HKLM\\Software\\Microsoft\\NET Framework Setup\\NDP\\v4\\Full",
-                "HKLM\\Software\\Microsoft\\NET Framework Setup\\NDP\\v4\\Client",
-            ]
-            
-            registry_found = False
-            for key in REQUIRED_REGISTRY_KEYS:
-                try:
-                    result = self.run_command(
-                        ["wine", "reg", "query", key],
-                        timeout=10
-                    )
-                    print(f"  {'✓' if result == 0 else '✗'} {key}")
-                    if result == 0:
-                        registry_found = True
-                except Exception as e:
-                    print(f"  ✗ Error checking registry key {key}: {e}")
-                    
-            if not registry_found:
-                print("  ✗ Required .NET Framework registry entries not found")
-                verification_passed = False
-                    
-            # Verify core DLL presence and size
-            print("\nChecking critical Mono files:")
-            framework_path = os.path.join(self.prefix_path, "drive_c/windows/Microsoft.NET/Framework")
-            found_valid_dll = False
-            min_dll_size = 100000  # Minimum size in bytes for a valid mscorlib.dll
-            
-            if os.path.exists(framework_path):
-                for folder in os.listdir(framework_path):
-                    if folder.startswith('v4.'):
-                        dll_path = os.path.join(framework_path, folder, "mscorlib.dll")
-                        if os.path.exists(dll_path):
-                            dll_size = os.path.getsize(dll_path)
-                            exists = dll_size >= min_dll_size
-                            print(f"  {'✓' if exists else '✗'} {folder}/mscorlib.dll (size: {dll_size:,} bytes)")
-                            if exists:
-                                found_valid_dll = True
-                        else:
-                            print(f"  ✗ {folder}/mscorlib.dll (not found)")
-            
-            if not found_valid_dll:
-                print("  ✗ No valid mscorlib.dll found")
-                verification_passed = False
-                    
-            print(f"\nMono verification {'passed' if verification_passed else 'failed'} all checks")
-            return verification_passed
-        
-        return False
-    
     def _get_gecko_version(self):
         """Determine appropriate Gecko version based on Wine version"""
         try:
-            # Get Wine version using our new command runner with capture_output
-            returncode, output = self.run_command(
-                ["wine", "--version"], 
-                timeout=10, 
-                capture_output=True
-            )
+            result = self.run_probe(["wine", "--version"], timeout=10)
+            returncode, output = result, result.output
             
             if returncode != 0:
                 print("Could not determine Wine version, defaulting to Gecko 2.47.4")
@@ -643,7 +637,7 @@ class WineUtils(CommandRunner):
     def check_prefix_gecko(self):
         """Check if Wine Gecko is installed in the prefix"""
         try:
-            result = self.run_command(
+            result = self.run_probe(
                 ["wine", "reg", "query", "HKLM\\Software\\Wine\\MSHTML"],
                 timeout=10
             )
@@ -697,15 +691,11 @@ class WineUtils(CommandRunner):
             
             for gecko_filename in gecko_files:
                 gecko_url = f"https://dl.winehq.org/wine/wine-gecko/{gecko_version}/{gecko_filename}"
-                gecko_path = os.path.join(cache_dir, gecko_filename)
                 
-                # Use existing installer if valid
-                have_valid_installer = os.path.exists(gecko_path) and os.path.getsize(gecko_path) >= 1024
-                if have_valid_installer:
-                    print(f"Using existing installer at {gecko_path}")
-                else:
-                    if not self.download_file(gecko_url, gecko_path):
-                        return False
+                # Download, or revalidate the cached copy. may live in the shared cache
+                gecko_path = self.fetch_artifact(gecko_url, gecko_filename)
+                if not gecko_path:
+                    return False
 
                 print(f"Installing Wine Gecko ({gecko_filename})...")
                 result = self.run_command(
@@ -721,7 +711,7 @@ class WineUtils(CommandRunner):
                 self.run_command(["wineserver", "-k"], timeout=10)
 
             # Final verification
-            if self._verify_gecko_installation(has_system_gecko):
+            if self._verify_component("gecko", has_system_gecko):
                 print("Wine Gecko installation completed successfully!")
                 return True
 
@@ -732,49 +722,7 @@ class WineUtils(CommandRunner):
             print(f"Error during Gecko installation: {e}")
             return False
         
-    def _verify_gecko_installation(self, has_system_gecko=None):
-        """Verify Gecko installation is properly configured"""
-        # Cache system check result if not provided
-        if has_system_gecko is None:
-            has_system_gecko = self.check_system_gecko()
-                
-        print("\nPerforming Gecko verification...")
-        verification_passed = True
-
-        # Only check registry if not using system Gecko
-        print("\nChecking MSHTML registry:")
-        try:
-            result = self.run_command(
-                ["wine", "reg", "query", "HKLM\\Software\\Wine\\MSHTML"],
-                timeout=10
-            )
-            print(f"  {'✓' if result == 0 else '✗'} MSHTML registry key {'found' if result == 0 else 'not found'}")
-            if result != 0 and not has_system_gecko:
-                verification_passed = False
-        except Exception as e:
-            print(f"  ✗ Error checking registry: {e}")
-            if not has_system_gecko:
-                verification_passed = False
-
-        # Always check critical paths
-        print("\nChecking critical Gecko paths:")
-        critical_paths = [
-            os.path.join(self.prefix_path, "drive_c/windows/system32/gecko"),
-            os.path.join(self.prefix_path, "drive_c/windows/syswow64/gecko"),
-            os.path.join(self.prefix_path, "drive_c/windows/system32/mshtml.dll"),
-            os.path.join(self.prefix_path, "drive_c/windows/syswow64/mshtml.dll")
-        ]
-            
-        for path in critical_paths:
-            exists = os.path.exists(path)
-            print(f"  {'✓' if exists else '✗'} {path}")
-            if not exists:
-                verification_passed = False
-
-        print(f"\nGecko verification {'passed' if verification_passed else 'failed'} all checks")
-        return verification_passed
-
-    def setup_prefix(self, install_dxvk=True):
+    def setup_prefix(self, install_dxvk=True, lazy_components=False):
         """Set up and configure the Wine prefix with all requirements"""
         self.suppress_gui()
         if not self.check_wine_installed():
@@ -782,25 +730,110 @@ class WineUtils(CommandRunner):
 
         os.makedirs(self.prefix_path, exist_ok=True)
 
-        #add windowing associate
-        self.run_command([
-        "wine", "reg", "add", "HKCU\\Software\\Wine\\X11 Driver",
-        "/v", "Managed", "/t", "REG_SZ", "/d", "Y", "/f"
-        ])
-
-        # Initialize new prefix if needed
-        if not os.path.exists(os.path.join(self.prefix_path, "system.reg")):
-            print("Initializing new Wine prefix...")
-            print("Running wineboot initialization...")
-            if self.run_command(["wineboot", "-u", "-i"], timeout=60) != 0:
-                print("Warning: wineboot initialization may have failed")
-                        
-            self.run_command(["wineserver", "-k"], timeout=10)
-            print("SKIPPING WINDOWS 7 CONFIG STEPS, let pso.bat do it")
+        with self.run_phase("prefix"):
+            #add windowing associate
+            self.run_command([
+            "wine", "reg", "add", "HKCU\\Software\\Wine\\X11 Driver",
+            "/v", "Managed", "/t", "REG_SZ", "/d", "Y", "/f"
+            ])
+
+            # Initialize new prefix if needed
+            if not os.path.exists(os.path.join(self.prefix_path, "system.reg")):
+                print("Initializing new Wine prefix...")
+                print("Running wineboot initialization...")
+                if self.run_command(["wineboot", "-u", "-i"], timeout=60) != 0:
+                    print("Warning: wineboot initialization may have failed")
+                            
+                self.run_command(["wineserver", "-k"], timeout=10)
+                print("SKIPPING WINDOWS 7 CONFIG STEPS, let pso.bat do it")
+
+        if lazy_components:
+            print("Deferring Mono and Gecko until the launcher first runs (--lazy-components)")
+            self.set_pending_components(LAZY_COMPONENTS)
+        else:
+            with self.run_phase("mono"):
+                if not self._setup_mono():
+                    self.failed_components.append("mono")
+                    return False
+            with self.run_phase("gecko"):
+                if not self._setup_gecko():
+                    self.failed_components.append("gecko")
+                    return False
+            self.set_pending_components([])
+        if install_dxvk:
+            with self.run_phase("dxvk"):
+                if not self._setup_dxvk():
+                    self.failed_components.append("dxvk")
+                    return False
+        else:
+            print("Skipping DXVK install as requested")
+            # a prefix that had dxvk before keeps its record, --status still checks it
+            from prefix_status import get_dxvk_mode
+            if get_dxvk_mode(self.prefix_path) is None:
+                self.set_dxvk_mode("skipped")
+
+        print("All components installed successfully!")
+        return True
+
+    def set_pending_components(self, components):
+        from prefix_status import get_state_dir, PENDING_COMPONENTS_FILE
+        path = os.path.join(get_state_dir(self.prefix_path), PENDING_COMPONENTS_FILE)
+        if not components:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.tmp", "w") as f:
+            f.write("".join(f"{component}\n" for component in components))
+        os.replace(f"{path}.tmp", path)
+
+    def set_dxvk_mode(self, mode):
+        from prefix_status import get_state_dir, DXVK_MODE_FILE
+        path = os.path.join(get_state_dir(self.prefix_path), DXVK_MODE_FILE)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.tmp", "w") as f:
+            f.write(f"{mode}\n")
+        os.replace(f"{path}.tmp", path)
+
+    @contextmanager
+    def component_lock(self):
+        """Held while deferred components install. mono and gecko installs restart wineserver,
+        which would take down a game started in the meantime"""
+        import fcntl
+        from prefix_status import get_state_dir
+        state_dir = get_state_dir(self.prefix_path)
+        os.makedirs(state_dir, exist_ok=True)
+        with open(os.path.join(state_dir, "components.lock"), "w") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                print("Waiting for the Mono/Gecko install running in the prefix to finish...")
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def install_pending_components(self):
+        """Install whatever --lazy-components deferred. True once nothing is pending"""
+        from prefix_status import get_pending_components
+        if not get_pending_components(self.prefix_path):
+            return True
+        with self.component_lock():
+            # someone else may have finished them while we waited for the lock
+            pending = get_pending_components(self.prefix_path)
+            setup = {"mono": self._setup_mono, "gecko": self._setup_gecko}
+            self.suppress_gui()
+            for component in list(pending):
+                with self.run_phase(component):
+                    if not setup[component]():
+                        self.failed_components.append(component)
+                        return False
+                pending.remove(component)
+                self.set_pending_components(pending)
+        return True
 
+    def _setup_mono(self):
         # Handle Mono installation
         has_system_mono = self.check_system_mono()
-        if self._verify_mono_installation(has_system_mono):
+        if self._verify_component("mono", has_system_mono=has_system_mono):
             print("Mono is already configured in the prefix.")
         elif has_system_mono:
             print("System-wide Mono detected, configuring prefix...")
@@ -815,19 +848,21 @@ class WineUtils(CommandRunner):
                 print("  Arch Linux: sudo pacman -S wine-mono")
                 print("  Fedora: sudo dnf install wine-mono")
                 return False
+        return True
 
+    def _setup_gecko(self):
         # Check Gecko - streamlined like DXVK
         has_system_gecko = self.check_system_gecko()
         if has_system_gecko:
             print("System-wide Wine Gecko detected.")
-            if not self._verify_gecko_installation(has_system_gecko):
+            if not self._verify_component("gecko", has_system_gecko):
                 print("Configuring system Gecko in prefix...")
                 if not self.install_gecko(has_system_gecko):
                     print("Warning: Failed to configure system Gecko.")
                     return False
         else:
             print("No system Wine Gecko detected, checking prefix installation...")
-            if not self._verify_gecko_installation(has_system_gecko):
+            if not self._verify_component("gecko", has_system_gecko):
                 print("Installing Gecko in prefix...")
                 if not self.install_gecko(has_system_gecko):
                     print("Warning: Failed to install Wine Gecko. You may need to install using your package manager:")
@@ -835,30 +870,33 @@ class WineUtils(CommandRunner):
                     print("  Arch Linux: sudo pacman -S wine-gecko")
                     print("  Fedora: sudo dnf install wine-gecko")
                     return False
+        return True
 
-        if install_dxvk:
-            # Check DXVK status once and store the result
-            has_system_dxvk = self.check_system_dxvk()
-            
-            if self._verify_dxvk_installation(has_system_dxvk):
-                print("DXVK is already installed in the prefix.")
-            elif has_system_dxvk:
-                print("System-wide DXVK installation detected, configuring prefix...")
-                if not self.install_dxvk(has_system_dxvk):
-                    print("Warning: Failed to configure system DXVK.")
-                    return False
-            else:
-                print("No DXVK installation found. Installing in prefix...")
-                if not self.install_dxvk(has_system_dxvk):
-                    print("Warning: Failed to install DXVK. You may need to install using your package manager:")
-                    print("  Debian/Ubuntu: sudo apt install dxvk")
-                    print("  Arch Linux: yay -S dxvk-bin")
-                    print("  Fedora: sudo dnf install dxvk")
-                    return False
+    def _setup_dxvk(self):
+        # Check DXVK status once and store the result
+        has_system_dxvk = self.check_system_dxvk()
+        
+        if self._verify_component("dxvk", has_system_dxvk=has_system_dxvk):
+            print("DXVK is already installed in the prefix.")
+        elif has_system_dxvk:
+            print("System-wide DXVK installation detected, configuring prefix...")
+            if not self.install_dxvk(has_system_dxvk):
+                print("Warning: Failed to configure system DXVK.")
+                return False
         else:
-            print("Skipping DXVK install as requested")
-
-        print("All components installed successfully!")
+            print("No DXVK installation found. Installing in prefix...")
+            if not self.install_dxvk(has_system_dxvk):
+                print("Warning: Failed to install DXVK. You may need to install using your package manager:")
+                print("  Debian/Ubuntu: sudo apt install dxvk")
+                print("  Arch Linux: yay -S dxvk-bin")
+                print("  Fedora: sudo dnf install dxvk")
+                return False
+        # setup scripts from some distro packages leave the dlls outside the prefix
+        from prefix_status import DXVK_DLLS
+        windows_dir = os.path.join(self.prefix_path, "drive_c/windows")
+        in_prefix = all(os.path.isfile(os.path.join(windows_dir, folder, f"{dll}.dll"))
+                        for dll in DXVK_DLLS for folder in ("system32", "syswow64"))
+        self.set_dxvk_mode("prefix" if in_prefix else "system")
         return True
 
     
@@ -877,7 +915,7 @@ class WineUtils(CommandRunner):
         
         for cmd, pm_type in package_managers.items():
             try:
-                if self.run_command(["which", cmd], timeout=10) == 0:
+                if self.run_probe(["which", cmd], timeout=10) == 0:
                     return pm_type
             except Exception:
                 continue
@@ -892,11 +930,11 @@ class WineUtils(CommandRunner):
             
         try:
             if pm == "pacman":
-                result = self.run_command(["pacman", "-Qi", package_name], timeout=10)
+                result = self.run_probe(["pacman", "-Qi", package_name], timeout=10)
             elif pm == "dpkg":
-                result = self.run_command(["dpkg", "-s", package_name], timeout=10)
+                result = self.run_probe(["dpkg", "-s", package_name], timeout=10)
             elif pm == "rpm":
-                result = self.run_command(["rpm", "-q", package_name], timeout=10)
+                result = self.run_probe(["rpm", "-q", package_name], timeout=10)
             return result == 0
         except Exception:
             return False
@@ -920,7 +958,6 @@ class WineUtils(CommandRunner):
 
     def install_dxvk(self, has_system_dxvk=None):
         """Install DXVK in the prefix. Use system DXVK if available, otherwise download."""
-        DEV_MODE = True
         cache_dir = self.get_cache_dir()
         os.makedirs(cache_dir, exist_ok=True)
 
@@ -941,7 +978,7 @@ class WineUtils(CommandRunner):
                 print(f"Found DXVK setup script at {setup_script}")
                 try:
                     result = self.run_command([setup_script, "install"], timeout=30)
-                    if result == 0 and self._verify_dxvk_installation(has_system_dxvk):
+                    if result == 0 and self._verify_component("dxvk", has_system_dxvk=has_system_dxvk):
                         print("System DXVK setup completed successfully!")
                         return True
                     print(f"DXVK setup script failed or verification failed")
@@ -957,19 +994,13 @@ class WineUtils(CommandRunner):
             dxvk_version = "2.3"
             dxvk_filename = f"dxvk-{dxvk_version}.tar.gz"
             dxvk_url = f"https://github.com/doitsujin/dxvk/releases/download/v{dxvk_version}/{dxvk_filename}"
-            dxvk_path = os.path.join(cache_dir, dxvk_filename)
 
             print(f"Installing DXVK {dxvk_version} from GitHub...")
             
-            # Download and verify archive
-            have_valid_archive = os.path.exists(dxvk_path) and os.path.getsize(dxvk_path) >= 1024
-            if DEV_MODE and have_valid_archive:
-                print(f"Using existing DXVK archive at {dxvk_path}")
-            else:
-                if have_valid_archive:
-                    os.remove(dxvk_path)
-                if not self.download_file(dxvk_url, dxvk_path):
-                    raise Exception("Failed to download DXVK archive")
+            # Download, or revalidate the cached archive. may live in the shared cache
+            dxvk_path = self.fetch_artifact(dxvk_url, dxvk_filename)
+            if not dxvk_path:
+                raise Exception("Failed to download DXVK archive")
 
             # Extract and install DXVK
             print("Extracting DXVK...")
@@ -977,6 +1008,7 @@ class WineUtils(CommandRunner):
             if os.path.exists(extract_dir):
                 shutil.rmtree(extract_dir)
                 
+            import tarfile
             with tarfile.open(dxvk_path, "r:gz") as tar:
                 tar.extractall(cache_dir)
 
@@ -997,6 +1029,9 @@ class WineUtils(CommandRunner):
                             shutil.copy2(dll_path, target_dir)
                             print(f"Installed {dll} to {target_dir}")
 
+            # gets extracted fresh every install, no point keeping the tree in the cache
+            shutil.rmtree(extract_dir, ignore_errors=True)
+
             # Set DLL overrides once with correct override_setting
             override_dlls = ["d3d9", "d3d10core", "d3d11", "dxgi", "d3d8"]
             for dll in override_dlls:
@@ -1005,7 +1040,7 @@ class WineUtils(CommandRunner):
                     "/v", dll, "/d", override_setting, "/f"
                 ], timeout=10)
 
-            if self._verify_dxvk_installation(has_system_dxvk):
+            if self._verify_component("dxvk", has_system_dxvk=has_system_dxvk):
                 print("DXVK installation completed and verified successfully!")
                 return True
                 
@@ -1015,78 +1050,147 @@ class WineUtils(CommandRunner):
             print(f"Manual DXVK installation failed: {e}")
             return False
         
-    def check_prefix_dxvk(self):
-        """Check if DXVK is installed in the prefix"""
-        #useless function. remove later
-        return self._verify_dxvk_installation()
-
-    def _verify_dxvk_installation(self, has_system_dxvk):
-        """Verify DXVK installation actually installed"""
-        # Use the system DXVK check result to determine expected override setting
-        
-        #convoluted but eh
-        if has_system_dxvk is None:
-            has_system_dxvk = self.check_system_dxvk()
-            
-        expected_override = "native" if has_system_dxvk else "native,builtin"
-        print(f"Checking {'system' if has_system_dxvk else 'local'} DXVK installation (expecting '{expected_override}' overrides)...")
-    
-        # Check DXVK DLLs in both 32-bit and 64-bit system directories
-        dll_list = ["d3d9.dll", "d3d10core.dll", "d3d11.dll", "dxgi.dll"]
-        dll_paths = {
-            "system32": os.path.join(self.prefix_path, "drive_c/windows/system32"),
-            "syswow64": os.path.join(self.prefix_path, "drive_c/windows/syswow64")
-        }
-        
-        print("Checking DXVK DLLs:")
-        all_dlls_present = True
-        for dir_name, dir_path in dll_paths.items():
-            for dll in dll_list:
-                dll_path = os.path.join(dir_path, dll)
-                exists = os.path.exists(dll_path)
-                print(f"  {'✓' if exists else '✗'} {dir_name}/{dll}")
-                if not exists:
-                    all_dlls_present = False
-                    
-        if not all_dlls_present and not has_system_dxvk:
-            print("Missing required DXVK DLLs")
-            return False
-                    
-        # Check DLL overrides in registry
+    def _check_mono_runtime(self):
+        """Run the .NET test exe once. Thread safe, the gui enabled env is a copy"""
+        test_dir = os.path.join(self.prefix_path, "drive_c/temp")
+        os.makedirs(test_dir, exist_ok=True)
+        test_exe_path = os.path.join(test_dir, "monotest-verify.exe")
+        # gui enabled env without touching self.env, other tasks share it
+        env = self.env.copy()
+        env.pop("WINEDLLOVERRIDES", None)
+        env.pop("DISPLAY", None)
         try:
-            result = self.run_command(
-                ["wine", "reg", "query", "HKEY_CURRENT_USER\\Software\\Wine\\DllOverrides"],
-                timeout=10
-            )
-            
-            if result == 0:
-                required_dlls = {"d3d9", "d3d10core", "d3d11", "dxgi"}
-                found_dlls = set()
-                
-                for dll in required_dlls:
-                    dll_result = self.run_command([
-                        "wine", "reg", "query", 
-                        "HKEY_CURRENT_USER\\Software\\Wine\\DllOverrides",
-                        "/v", dll
-                    ], timeout=10)
-                    
-                    if dll_result == 0:
-                        found_dlls.add(dll)
-                
-                missing_dlls = required_dlls - found_dlls
-                if missing_dlls:
-                    print(f"Missing DLL overrides for: {', '.join(missing_dlls)}")
-                    print(f"Note: Looking for '{expected_override}' override setting")
-                    return False
-            else:
-                print("Failed to query DLL overrides")
-                return False
-        except Exception as e:
-            print(f"Error checking DLL overrides: {e}")
-            return False
+            with open(test_exe_path, "wb") as f:
+                f.write(MONO_TEST_EXE)
+            result = self.run_probe(["wine", test_exe_path], timeout=30, env=env)
+            returncode, output = result, result.output
+            if "Hello from .NET!" in output:
+                return True, ".NET program ran"
+            return False, f"exit code {returncode}, no output from the test program"
+        finally:
+            if os.path.exists(test_exe_path):
+                os.remove(test_exe_path)
 
-        print("DXVK verification successful - all files and registry entries present")
-        return True
+    def _read_registry(self, live):
+        """(HKLM hive, its key root, HKCU hive, its key root) with the keys verification needs.
+        The hive files are only current once wineserver has exited, with one running go through a regedit export"""
+        from prefix_status import RegistryHive
+        lm_keys = ["Software\\Microsoft\\NET Framework Setup\\NDP\\v4", "Software\\Wine\\MSHTML"]
+        cu_keys = ["Software\\Wine\\DllOverrides"]
+        if not live:
+            return (RegistryHive(os.path.join(self.prefix_path, "system.reg"), wanted=lm_keys), "",
+                    RegistryHive(os.path.join(self.prefix_path, "user.reg"), wanted=cu_keys), "")
+
+        export_dir = os.path.join(self.prefix_path, "drive_c/temp")
+        os.makedirs(export_dir, exist_ok=True)
+        export_path = os.path.join(export_dir, "pso_verify.reg")
+        try:
+            returncode = self.run_probe(["wine", "regedit", "/E", "C:\\temp\\pso_verify.reg"], timeout=60)
+            if returncode != 0 or not os.path.exists(export_path):
+                raise WineSetupError(f"regedit export failed with exit code {returncode}")
+            hive = RegistryHive(export_path, wanted=[f"HKEY_LOCAL_MACHINE\\{key}" for key in lm_keys]
+                                + [f"HKEY_CURRENT_USER\\{key}" for key in cu_keys])
+        finally:
+            if os.path.exists(export_path):
+                os.remove(export_path)
+        return hive, "HKEY_LOCAL_MACHINE\\", hive, "HKEY_CURRENT_USER\\"
+
+    def _check_registry_batch(self, has_system_gecko, live):
+        """Every registry check from one read of the registry instead of a wine process per key"""
+        from prefix_status import DXVK_DLLS, NDP_KEYS
+        machine, machine_root, user, user_root = self._read_registry(live)
+        checks = []
+        ndp_found = [key.rsplit("\\", 1)[1] for key in NDP_KEYS if machine.has_key(f"{machine_root}{key}")]
+        checks.append(("mono", ".NET v4 registry", bool(ndp_found), ", ".join(ndp_found) or "not found"))
+        has_mshtml = machine.has_key(f"{machine_root}Software\\Wine\\MSHTML")
+        # system gecko can work without the prefix key
+        checks.append(("gecko", "MSHTML registry", has_mshtml or has_system_gecko,
+                       "found" if has_mshtml else "not found"))
+        for dll in DXVK_DLLS:
+            value = user.get_string(f"{user_root}Software\\Wine\\DllOverrides", dll)
+            checks.append(("dxvk", f"{dll} override", bool(value), value or "not set"))
+        return checks
+
+    def verify_components(self, components=VERIFY_COMPONENTS, has_system_gecko=None, has_system_mono=None,
+                          has_system_dxvk=None, system_probes=True):
+        """Verify components concurrently and return a VerificationReport. --verify and the install use this"""
+        from verification import VerificationEngine
+        from prefix_status import find_mscorlib, DXVK_DLLS, GECKO_PATHS
+        from resource_sampler import find_prefix_processes
+        if not self.check_wine_installed():
+            raise WineSetupError("Wine is not installed or not accessible from the command line.")
+
+        # a running wineserver hasn't written its changes to the hives yet, _read_registry exports them instead
+        live = "wineserver" in find_prefix_processes(self.prefix_path).values()
+        if live or "mono" in components:
+            # one warm wineserver for every wine-bound task, kept alive 30s after the last client
+            self.run_command(["wineserver", "-p30"], timeout=10)
+
+        # system package probes are informational and run in parallel with everything else
+        def probe(func):
+            def task():
+                installed = func()
+                return installed, "installed" if installed else "not installed"
+            return task
+
+        def mscorlib():
+            found = find_mscorlib(prefix)
+            return found is not None, found or "not found"
+
+        prefix = self.prefix_path
+        windows_dir = os.path.join(prefix, "drive_c/windows")
+        engine = VerificationEngine()
+        if system_probes:
+            engine.add("prefix", "system.reg", lambda: (os.path.isfile(os.path.join(prefix, "system.reg")), prefix))
+        if "mono" in components:
+            engine.add("mono", "runtime test", self._check_mono_runtime)
+            engine.add("mono", "mscorlib.dll", mscorlib)
+        if "gecko" in components:
+            engine.add("gecko", "files", lambda: [("gecko", path, os.path.exists(os.path.join(windows_dir, path)), "")
+                                                  for path in GECKO_PATHS])
+        if "dxvk" in components:
+            engine.add("dxvk", "dlls", lambda: [("dxvk", f"{folder}/{dll}.dll",
+                                                 os.path.isfile(os.path.join(windows_dir, folder, f"{dll}.dll")), "")
+                                                for dll in DXVK_DLLS for folder in ("system32", "syswow64")])
+        # gecko's registry rule depends on the system package, so only that probe runs inside the batch
+        if has_system_gecko is None and "gecko" not in components:
+            has_system_gecko = False
+        engine.add("registry", "registry", lambda: self._check_registry_batch(
+            self.check_system_gecko() if has_system_gecko is None else has_system_gecko, live))
+        if system_probes:
+            engine.add("system", "wine-mono package", probe(self.check_system_mono), required=False)
+            engine.add("system", "dxvk package", probe(self.check_system_dxvk), required=False)
+
+        report = engine.run()
+        # the registry batch covers every component, keep what was asked for
+        report.results = [r for r in report.results if r.component in components or r.component not in VERIFY_COMPONENTS]
+
+        probed = {r.name: r.ok for r in report.results if r.component == "system"}
+        if has_system_mono is None and "mono" in components:
+            has_system_mono = probed.get("wine-mono package")
+            if has_system_mono is None:
+                has_system_mono = self.check_system_mono()
+        if has_system_dxvk is None and "dxvk" in components:
+            has_system_dxvk = probed.get("dxvk package")
+            if has_system_dxvk is None:
+                has_system_dxvk = self.check_system_dxvk()
+        # system mono only has to run the test program, an MSI install needs its registry keys and mscorlib.
+        # system dxvk can get by without its dlls copied into the prefix, the overrides still have to be set
+        for result in report.results:
+            if result.component == "mono":
+                result.required = (result.name == "runtime test") == bool(has_system_mono)
+            elif result.component == "dxvk" and result.name.endswith(".dll") and has_system_dxvk:
+                result.required = False
+        return report
+
+    def _verify_component(self, component, has_system_gecko=None, has_system_mono=None, has_system_dxvk=None):
+        """Install time check of one component, the same checks --verify runs"""
+        print(f"\nVerifying {component}...")
+        report = self.verify_components([component], has_system_gecko=has_system_gecko,
+                                        has_system_mono=has_system_mono, has_system_dxvk=has_system_dxvk,
+                                        system_probes=False)
+        print(report.format())
+        return report.ok
 
     def cleanup_prefix(self):
         """Remove the Wine prefix directory"""
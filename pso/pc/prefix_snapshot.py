@@ -0,0 +1,248 @@
+import os
+import json
+import stat
+import time
+from file_utils import hash_file, clone_file
+from resource_sampler import find_prefix_processes
+
+# incremental prefix snapshots. file contents live once in a hashed object store,
+# a snapshot is just a manifest of paths -> hashes, so a new one only stores what changed
+# zeroz/tj
+
+class SnapshotError(Exception):
+    """Bad snapshot name, missing snapshot, or the prefix is busy"""
+    pass
+
+def get_snapshot_dir():
+    if 'PSO_SNAPSHOT_DIR' in os.environ:
+        return os.environ['PSO_SNAPSHOT_DIR']
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.expanduser("~/.local/share")
+    return os.path.join(data_home, "pso_wine", "snapshots")
+
+def _kind(st):
+    if stat.S_ISLNK(st.st_mode):
+        return "symlink"
+    if stat.S_ISDIR(st.st_mode):
+        return "dir"
+    if stat.S_ISREG(st.st_mode):
+        return "file"
+    return None
+
+def _check_idle(prefix_path):
+    # wine rewrites the registry on exit and the game writes files while running
+    if find_prefix_processes(prefix_path, wine_only=True):
+        raise SnapshotError("Wine is running in the prefix, close the game (or wineserver -k) first")
+
+def scan_prefix(prefix_path):
+    """{relative path: lstat} for everything under the prefix, symlinks not followed"""
+    entries = {}
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        with os.scandir(os.path.join(prefix_path, rel)) as it:
+            for entry in it:
+                relpath = os.path.join(rel, entry.name) if rel else entry.name
+                st = entry.stat(follow_symlinks=False)
+                entries[relpath] = st
+                if stat.S_ISDIR(st.st_mode):
+                    stack.append(relpath)
+    return entries
+
+class SnapshotStore:
+    def __init__(self, root=None):
+        self.root = root or get_snapshot_dir()
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.manifests_dir = os.path.join(self.root, "manifests")
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def manifest_path(self, name):
+        if not name or name.startswith(".") or not all(c.isalnum() or c in "-_." for c in name):
+            raise SnapshotError(f"Invalid snapshot name '{name}'. Use letters, numbers, - _ and .")
+        return os.path.join(self.manifests_dir, f"{name}.json")
+
+    def load(self, name):
+        path = self.manifest_path(name)
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise SnapshotError(f"No snapshot named '{name}'. Use --list-snapshots to see what's there")
+        except ValueError as e:
+            raise SnapshotError(f"Snapshot '{name}' is damaged: {e}")
+
+    def list(self):
+        snapshots = []
+        if not os.path.isdir(self.manifests_dir):
+            return snapshots
+        for filename in os.listdir(self.manifests_dir):
+            if filename.endswith(".json"):
+                manifest = self.load(filename[:-5])
+                files = [e for e in manifest["entries"].values() if e["type"] == "file"]
+                snapshots.append({
+                    "name": manifest["name"],
+                    "created": manifest["created"],
+                    "prefix": manifest["prefix"],
+                    "files": len(files),
+                    "bytes": sum(e["size"] for e in files),
+                })
+        return sorted(snapshots, key=lambda s: s["created"])
+
+    def _previous_entries(self, prefix_path):
+        """Entries of the newest snapshot of this prefix, to skip hashing files that didn't change"""
+        same_prefix = [s for s in self.list() if s["prefix"] == prefix_path]
+        return self.load(same_prefix[-1]["name"])["entries"] if same_prefix else {}
+
+    def snapshot(self, prefix_path, name):
+        manifest_path = self.manifest_path(name)
+        if os.path.exists(manifest_path):
+            raise SnapshotError(f"Snapshot '{name}' already exists. Delete it first or pick another name")
+        if not os.path.isdir(prefix_path):
+            raise SnapshotError(f"Prefix {prefix_path} doesn't exist")
+        _check_idle(prefix_path)
+
+        previous = self._previous_entries(prefix_path)
+        entries = {}
+        stats = {"files": 0, "bytes": 0, "hashed": 0, "stored": 0, "stored_bytes": 0, "reflinked": 0}
+        for rel, st in sorted(scan_prefix(prefix_path).items()):
+            path = os.path.join(prefix_path, rel)
+            kind = _kind(st)
+            if kind == "symlink":
+                entries[rel] = {"type": "symlink", "target": os.readlink(path)}
+            elif kind == "dir":
+                entries[rel] = {"type": "dir", "mode": stat.S_IMODE(st.st_mode)}
+            elif kind == "file":
+                old = previous.get(rel)
+                if (old and old["type"] == "file" and old["size"] == st.st_size
+                        and old["mtime_ns"] == st.st_mtime_ns and os.path.exists(self.object_path(old["hash"]))):
+                    digest = old["hash"]
+                else:
+                    digest = hash_file(path)
+                    stats["hashed"] += 1
+                object_path = self.object_path(digest)
+                if not os.path.exists(object_path):
+                    # never hardlink the live file in, wine writes files in place and would change the store too
+                    os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                    tmp_path = f"{object_path}.tmp"
+                    if clone_file(path, tmp_path):
+                        stats["reflinked"] += 1
+                    os.chmod(tmp_path, 0o444)
+                    os.replace(tmp_path, object_path)
+                    stats["stored"] += 1
+                    stats["stored_bytes"] += st.st_size
+                entries[rel] = {"type": "file", "hash": digest, "size": st.st_size,
+                                "mtime_ns": st.st_mtime_ns, "mode": stat.S_IMODE(st.st_mode)}
+                stats["files"] += 1
+                stats["bytes"] += st.st_size
+            # sockets and fifos don't belong in a prefix, skip them
+
+        os.makedirs(self.manifests_dir, exist_ok=True)
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"name": name, "created": time.time(), "prefix": prefix_path, "entries": entries}, f)
+        os.replace(tmp_path, manifest_path)
+        return stats
+
+    def restore(self, prefix_path, name):
+        """Make the prefix match the snapshot, only touching what differs"""
+        manifest = self.load(name)
+        wanted = manifest["entries"]
+        if os.path.isdir(prefix_path):
+            _check_idle(prefix_path)
+            current = scan_prefix(prefix_path)
+        else:
+            os.makedirs(prefix_path)
+            current = {}
+
+        stats = {"written": 0, "written_bytes": 0, "removed": 0, "unchanged": 0}
+
+        # remove what the snapshot doesn't have (or has as another type). reverse order puts children first
+        for rel in sorted(current, reverse=True):
+            want = wanted.get(rel)
+            kind = _kind(current[rel])
+            if want is not None and want["type"] == kind:
+                continue
+            path = os.path.join(prefix_path, rel)
+            parent = current.get(os.path.dirname(rel))
+            if parent is not None and parent.st_mode & 0o300 != 0o300:
+                # the write pass below puts the parent's mode back
+                os.chmod(os.path.dirname(path), stat.S_IMODE(parent.st_mode) | 0o700)
+            if kind == "dir":
+                os.rmdir(path)
+            else:
+                os.unlink(path)
+            del current[rel]
+            stats["removed"] += 1
+
+        # sorted order creates parents before their contents. directory modes go on last,
+        # a recorded 0o555 applied now would stop its own children from being written
+        dir_modes = []
+        for rel in sorted(wanted):
+            want = wanted[rel]
+            path = os.path.join(prefix_path, rel)
+            st = current.get(rel)
+            if want["type"] == "dir":
+                if st is None:
+                    os.mkdir(path, 0o700)
+                    dir_modes.append((path, want["mode"]))
+                elif stat.S_IMODE(st.st_mode) != want["mode"] or st.st_mode & 0o300 != 0o300:
+                    # an existing read-only dir needs to be writable while its contents are restored
+                    os.chmod(path, stat.S_IMODE(st.st_mode) | 0o700)
+                    dir_modes.append((path, want["mode"]))
+            elif want["type"] == "symlink":
+                if st is not None and os.readlink(path) == want["target"]:
+                    continue
+                if st is not None:
+                    os.unlink(path)
+                os.symlink(want["target"], path)
+                stats["written"] += 1
+            else:
+                # restore puts the recorded mtime back, so size + mtime says the file is untouched
+                if st is not None and st.st_size == want["size"] and st.st_mtime_ns == want["mtime_ns"]:
+                    if stat.S_IMODE(st.st_mode) != want["mode"]:
+                        os.chmod(path, want["mode"])
+                    stats["unchanged"] += 1
+                    continue
+                object_path = self.object_path(want["hash"])
+                if not os.path.exists(object_path):
+                    raise SnapshotError(f"Snapshot '{name}' is missing the object for {rel}")
+                tmp_path = f"{path}.pso_restore"
+                clone_file(object_path, tmp_path)
+                os.chmod(tmp_path, want["mode"])
+                os.utime(tmp_path, ns=(want["mtime_ns"], want["mtime_ns"]))
+                os.replace(tmp_path, path)
+                stats["written"] += 1
+                stats["written_bytes"] += want["size"]
+        # children before parents, so a read-only dir doesn't lock out the ones inside it
+        for path, mode in reversed(dir_modes):
+            os.chmod(path, mode)
+        return stats
+
+    def delete(self, name):
+        manifest_path = self.manifest_path(name)
+        if not os.path.exists(manifest_path):
+            raise SnapshotError(f"No snapshot named '{name}'")
+        os.remove(manifest_path)
+        return self.gc()
+
+    def gc(self):
+        """Drop objects no snapshot refers to. Returns (objects, bytes) freed"""
+        referenced = set()
+        for snapshot in self.list():
+            for entry in self.load(snapshot["name"])["entries"].values():
+                if entry["type"] == "file":
+                    referenced.add(entry["hash"])
+        freed = 0
+        freed_bytes = 0
+        if not os.path.isdir(self.objects_dir):
+            return freed, freed_bytes
+        for bucket in os.listdir(self.objects_dir):
+            bucket_dir = os.path.join(self.objects_dir, bucket)
+            for filename in os.listdir(bucket_dir):
+                if bucket + filename not in referenced:
+                    path = os.path.join(bucket_dir, filename)
+                    freed_bytes += os.path.getsize(path)
+                    os.remove(path)
+                    freed += 1
+        return freed, freed_bytes
@@ -0,0 +1,308 @@
+import os
+from dxvk_config import read_preset
+
+# host side health check for the prefix. reads the registry hive files directly and never starts wine
+# zeroz/tj
+
+# C escapes wine writes into hive files for control characters
+_C_ESCAPES = {"a": "\a", "b": "\b", "t": "\t", "n": "\n", "v": "\v", "f": "\f", "r": "\r", "e": "\x1b"}
+
+def _unescape_key(key):
+    # hive files double the backslashes in key names, regedit exports don't, so only \\ and \" are escapes here
+    return key.replace('\\"', '"').replace("\\\\", "\\")
+
+def unescape_value(value):
+    """Undo wine's hive escaping: backslash, quote and C escapes, hex for anything past ascii, octal"""
+    if "\\" not in value:
+        return value
+    out = []
+    i = 0
+    while i < len(value):
+        char = value[i]
+        if char != "\\" or i + 1 == len(value):
+            out.append(char)
+            i += 1
+            continue
+        nxt = value[i + 1]
+        if nxt == "x":
+            end = i + 2
+            while end < len(value) and end < i + 6 and value[end] in "0123456789abcdefABCDEF":
+                end += 1
+            out.append(chr(int(value[i + 2:end], 16)) if end > i + 2 else "x")
+            i = end
+        elif nxt in "01234567":
+            end = i + 1
+            while end < len(value) and end < i + 4 and value[end] in "01234567":
+                end += 1
+            out.append(chr(int(value[i + 1:end], 8)))
+            i = end
+        else:
+            out.append(_C_ESCAPES.get(nxt, nxt))
+            i += 2
+    return "".join(out)
+
+class RegistryHive:
+    """Read-only view of a wine .reg hive file (system.reg / user.reg)"""
+
+    def __init__(self, path, wanted=None):
+        self.path = path
+        self.arch = None
+        # lowercased key -> (key as written, {value name: raw value text})
+        self.keys = {}
+        self._load(wanted)
+
+    def _load(self, wanted):
+        # only keep keys under the wanted prefixes, system.reg is big and we need a handful
+        wanted = tuple(w.lower() for w in wanted) if wanted else None
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return
+        # hive files are utf-8, regedit /E exports are utf-16 with a BOM
+        if data.startswith(b"\xff\xfe"):
+            lines = data.decode("utf-16", errors="ignore").splitlines()
+        else:
+            lines = data.decode("utf-8", errors="ignore").splitlines()
+
+        current = None
+        pending = None
+        for line in lines:
+            if pending is not None:
+                # hex values wrap with a trailing backslash
+                name, raw = pending
+                raw += line.strip()
+                if raw.endswith("\\"):
+                    pending = (name, raw[:-1])
+                else:
+                    current[name] = raw
+                    pending = None
+                continue
+
+            if line.startswith("["):
+                end = line.find("]")
+                key = _unescape_key(line[1:end])
+                lowered = key.lower()
+                if wanted is None or lowered.startswith(wanted):
+                    current = self.keys.setdefault(lowered, (key, {}))[1]
+                else:
+                    current = None
+            elif line.startswith("#arch="):
+                self.arch = line[6:].strip()
+            elif current is not None and (line.startswith('"') or line.startswith("@=")):
+                if line.startswith("@="):
+                    name, raw = "", line[2:]
+                else:
+                    split = line.find('"=', 1)
+                    while split != -1 and line[split - 1] == "\\" and line[split - 2] != "\\":
+                        split = line.find('"=', split + 1)
+                    if split == -1:
+                        continue
+                    name, raw = unescape_value(line[1:split]), line[split + 2:]
+                if raw.endswith("\\"):
+                    pending = (name, raw[:-1])
+                else:
+                    current[name] = raw
+
+    def has_key(self, key):
+        return key.lower() in self.keys
+
+    def values(self, key):
+        return self.keys.get(key.lower(), (key, {}))[1]
+
+    def get_string(self, key, name):
+        raw = self.values(key).get(name)
+        if raw is None or not raw.startswith('"'):
+            return None
+        return unescape_value(raw[1:-1])
+
+def get_state_dir(prefix_path):
+    """Where we keep our own bookkeeping inside the prefix"""
+    return os.path.join(prefix_path, ".pso_wine")
+
+# components a --lazy-components install left for the first -l launch, one per line
+PENDING_COMPONENTS_FILE = "pending_components"
+
+def get_pending_components(prefix_path):
+    try:
+        with open(os.path.join(get_state_dir(prefix_path), PENDING_COMPONENTS_FILE)) as f:
+            return [line.strip() for line in f if line.strip()]
+    except OSError:
+        return []
+
+# how -i left dxvk: prefix (dlls copied into the prefix), system (the distro package provides them)
+# or skipped (--skip-dxvk-install). no file means a prefix from before this was recorded
+DXVK_MODE_FILE = "dxvk_mode"
+
+def get_dxvk_mode(prefix_path):
+    try:
+        with open(os.path.join(get_state_dir(prefix_path), DXVK_MODE_FILE)) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+def windows_to_prefix_path(prefix_path, windows_path):
+    """C:\\EphineaPSO -> <prefix>/drive_c/EphineaPSO"""
+    if not windows_path or len(windows_path) < 2 or windows_path[1] != ":":
+        return None
+    drive = os.path.join(prefix_path, "dosdevices", windows_path[0].lower() + ":")
+    if not os.path.exists(drive):
+        drive = os.path.join(prefix_path, f"drive_{windows_path[0].lower()}")
+    else:
+        drive = os.path.realpath(drive)
+    rest = windows_path[2:].replace("\\", "/").lstrip("/")
+    return os.path.join(drive, rest)
+
+def get_install_dir(prefix_path, user_hive=None):
+    """Where Ephinea lives, from HKCU\\Software\\EphineaPSO\\Install_Dir or the default"""
+    if user_hive is None:
+        user_hive = RegistryHive(os.path.join(prefix_path, "user.reg"), wanted=["Software\\EphineaPSO"])
+    install_dir = windows_to_prefix_path(prefix_path, user_hive.get_string("Software\\EphineaPSO", "Install_Dir"))
+    return install_dir or os.path.join(prefix_path, "drive_c/EphineaPSO")
+
+def _dir_size(path):
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return total
+
+DXVK_DLLS = ("d3d9", "d3d10core", "d3d11", "dxgi")
+GECKO_PATHS = ("system32/gecko", "syswow64/gecko", "system32/mshtml.dll", "syswow64/mshtml.dll")
+NDP_KEYS = (
+    "Software\\Microsoft\\NET Framework Setup\\NDP\\v4\\Full",
+    "Software\\Microsoft\\NET Framework Setup\\NDP\\v4\\Client",
+)
+
+def find_mscorlib(prefix_path, min_size=100000):
+    """First v4 mscorlib.dll big enough to be real, as 'v4.x/mscorlib.dll', or None"""
+    framework_path = os.path.join(prefix_path, "drive_c/windows/Microsoft.NET/Framework")
+    try:
+        folders = sorted(os.listdir(framework_path))
+    except OSError:
+        return None
+    for folder in folders:
+        dll_path = os.path.join(framework_path, folder, "mscorlib.dll")
+        if folder.startswith("v4.") and os.path.isfile(dll_path) and os.path.getsize(dll_path) >= min_size:
+            return f"{folder}/mscorlib.dll"
+    return None
+
+def collect_status(prefix_path, cache_dir=None, check_shortcuts=True):
+    """Gather prefix health as a dict of sections, each with a list of (check, ok, detail)"""
+    status = {"prefix": prefix_path, "sections": {}}
+    sections = status["sections"]
+
+    def add(section, check, ok, detail="", required=True):
+        sections.setdefault(section, []).append({"check": check, "ok": bool(ok), "detail": detail,
+                                                 "required": required})
+
+    # prefix basics
+    system_reg = os.path.join(prefix_path, "system.reg")
+    user_reg = os.path.join(prefix_path, "user.reg")
+    add("prefix", "prefix directory", os.path.isdir(prefix_path), prefix_path)
+    add("prefix", "system.reg", os.path.isfile(system_reg))
+    add("prefix", "user.reg", os.path.isfile(user_reg))
+    add("prefix", "drive_c", os.path.isdir(os.path.join(prefix_path, "drive_c")))
+
+    system_hive = RegistryHive(system_reg, wanted=[
+        "Software\\Microsoft\\NET Framework Setup\\NDP\\v4",
+        "Software\\Wine\\MSHTML",
+    ])
+    user_hive = RegistryHive(user_reg, wanted=[
+        "Software\\Wine\\DllOverrides",
+        "Software\\EphineaPSO",
+    ])
+    status["arch"] = system_hive.arch
+    pending = get_pending_components(prefix_path)
+    status["pending_components"] = pending
+
+    # mono
+    if "mono" in pending:
+        add("mono", "deferred", True, "installs on the first -l launch or with --install-components")
+    else:
+        mscorlib = find_mscorlib(prefix_path)
+        add("mono", "mscorlib.dll", mscorlib, mscorlib or "no valid v4 mscorlib.dll")
+        ndp_keys = [key for key in NDP_KEYS if system_hive.has_key(key)]
+        add("mono", ".NET v4 registry", ndp_keys, ", ".join(k.rsplit("\\", 1)[1] for k in ndp_keys))
+
+    # gecko
+    if "gecko" in pending:
+        add("gecko", "deferred", True, "installs on the first -l launch or with --install-components")
+    else:
+        add("gecko", "MSHTML registry", system_hive.has_key("Software\\Wine\\MSHTML"))
+        for path in GECKO_PATHS:
+            add("gecko", path, os.path.exists(os.path.join(prefix_path, "drive_c/windows", path)))
+
+    # dxvk. a --skip-dxvk-install prefix runs on wined3d, there the checks are only informational
+    dxvk_mode = get_dxvk_mode(prefix_path)
+    status["dxvk_mode"] = dxvk_mode
+    if dxvk_mode == "skipped":
+        add("dxvk", "install", True, "skipped with --skip-dxvk-install")
+    for dll in DXVK_DLLS:
+        for folder in ("system32", "syswow64"):
+            add("dxvk", f"{folder}/{dll}.dll", os.path.isfile(os.path.join(prefix_path, "drive_c/windows", folder, f"{dll}.dll")),
+                required=dxvk_mode not in ("system", "skipped"))
+    for dll in DXVK_DLLS:
+        value = user_hive.get_string("Software\\Wine\\DllOverrides", dll)
+        add("dxvk", f"{dll} override", value and value.startswith("native"), value or "not set",
+            required=dxvk_mode != "skipped")
+
+    # ephinea
+    registry_dir = user_hive.get_string("Software\\EphineaPSO", "Install_Dir")
+    install_dir = get_install_dir(prefix_path, user_hive)
+    add("ephinea", "Install_Dir registry", registry_dir, registry_dir or "not set")
+    add("ephinea", "install directory", os.path.isdir(install_dir), install_dir)
+    for exe in ("PsoBB.exe", "online.exe"):
+        add("ephinea", exe, os.path.isfile(os.path.join(install_dir, exe)))
+    status["install_dir"] = install_dir
+    # prefixes that never picked a --dxvk-preset have no managed dxvk.conf to check
+    preset, config_path = read_preset(prefix_path)
+    if preset:
+        add("ephinea", "dxvk.conf", config_path and os.path.isfile(config_path), f"preset {preset}")
+    status["dxvk_preset"] = preset
+
+    # desktop entries
+    if check_shortcuts:
+        applications_dir = os.path.expanduser("~/.local/share/applications")
+        for name in ("ephinea-launcher", "ephinea-psobb"):
+            add("shortcuts", f"{name}.desktop", os.path.isfile(os.path.join(applications_dir, f"{name}.desktop")))
+
+    # cache. informational only, an empty cache is perfectly healthy
+    cache = []
+    if cache_dir and os.path.isdir(cache_dir):
+        with os.scandir(cache_dir) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                # ETag/Last-Modified sidecars, download locks and the gc's prefix list, not artifacts
+                if entry.name.startswith(".") or entry.name.endswith((".meta.json", ".lock", ".tmp")) \
+                        or entry.name == "prefixes.json":
+                    continue
+                size = _dir_size(entry.path) if entry.is_dir(follow_symlinks=False) else entry.stat().st_size
+                cache.append({"name": entry.name, "bytes": size})
+    status["cache"] = {"dir": cache_dir, "entries": cache, "bytes": sum(e["bytes"] for e in cache)}
+
+    status["healthy"] = all(item["ok"] or not item["required"] for items in sections.values() for item in items)
+    return status
+
+def format_status(status):
+    lines = [f"Prefix: {status['prefix']}" + (f" ({status['arch']})" if status.get("arch") else "")]
+    for section, items in status["sections"].items():
+        ok = all(item["ok"] or not item.get("required", True) for item in items)
+        lines.append(f"\n{section}: {'ok' if ok else 'problems'}")
+        for item in items:
+            detail = f" ({item['detail']})" if item["detail"] else ""
+            mark = "✓" if item["ok"] else ("✗" if item.get("required", True) else "-")
+            lines.append(f"  {mark} {item['check']}{detail}")
+    cache = status["cache"]
+    lines.append(f"\ncache: {cache['dir']} ({cache['bytes'] / 1048576:.1f} MB)")
+    for entry in cache["entries"]:
+        lines.append(f"  {entry['name']} ({entry['bytes'] / 1048576:.1f} MB)")
+    lines.append(f"\nOverall: {'healthy' if status['healthy'] else 'unhealthy'}")
+    return "\n".join(lines)
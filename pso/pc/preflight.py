@@ -0,0 +1,152 @@
+import os
+import glob
+import resource
+
+# host checks right before launch. fixes what it can without root (the fd limit),
+# reports the rest: anything here costs frames or makes esync/fsync quietly fall back
+# zeroz/tj
+
+# wine's esync wants one fd per sync object, its docs ask for this much
+ESYNC_MIN_FDS = 524288
+# the kernel default. PsoBB is 32 bit and can't map more than that anyway, so only a lowered value hurts
+MIN_MAP_COUNT = 65530
+# futex_waitv, what fsync needs, landed in 5.16
+FSYNC_KERNEL = (5, 16)
+
+NETWORK_FILESYSTEMS = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "9p", "afs", "ceph", "fuse.sshfs",
+                       "fuse.glusterfs", "fuse.davfs", "fuse.gvfsd-fuse", "fuse.rclone"}
+# local but slow for lots of small files
+SLOW_FILESYSTEMS = {"fuseblk", "fuse.ntfs-3g", "vfat", "exfat"}
+# these drivers handle scaling themselves, powersave under them is normal
+PSTATE_DRIVERS = {"intel_pstate", "amd-pstate-epp"}
+
+def _result(check, ok, detail="", fixed=False):
+    return {"check": check, "ok": ok, "detail": detail, "fixed": fixed}
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def raise_fd_limit():
+    """Raise the soft RLIMIT_NOFILE to the hard limit. Returns (old soft, new soft, hard)"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = hard
+    if target == resource.RLIM_INFINITY:
+        # macos refuses infinity for files, the kernel's own cap is the useful number
+        target = max(soft, ESYNC_MIN_FDS)
+    if soft != resource.RLIM_INFINITY and soft < target:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+        except (ValueError, OSError):
+            return soft, soft, hard
+        return soft, target, hard
+    return soft, soft, hard
+
+def check_fd_limit(env):
+    old, soft, hard = raise_fd_limit()
+    fixed = soft > old
+    esync = env.get("WINEESYNC") == "1"
+    detail = f"{old} -> {soft}" if fixed else f"{soft}"
+    if soft >= ESYNC_MIN_FDS or soft == resource.RLIM_INFINITY:
+        return _result("fd limit", True, detail, fixed)
+    if not esync:
+        return _result("fd limit", True, f"{detail}, esync is off", fixed)
+    return _result("fd limit", False, f"{detail}, hard limit {hard}. esync wants {ESYNC_MIN_FDS}, raise "
+                   "DefaultLimitNOFILE in systemd or nofile in /etc/security/limits.conf", fixed)
+
+def check_map_count():
+    value = _read("/proc/sys/vm/max_map_count")
+    if value is None:
+        return None
+    if int(value) >= MIN_MAP_COUNT:
+        return _result("vm.max_map_count", True, value)
+    return _result("vm.max_map_count", False, f"{value}, below the kernel default. Set vm.max_map_count=1048576 with sysctl")
+
+def kernel_version():
+    parts = []
+    for part in os.uname().release.split("-")[0].split(".")[:2]:
+        digits = "".join(c for c in part if c.isdigit())
+        parts.append(int(digits or 0))
+    return tuple(parts)
+
+def check_fsync(env):
+    if os.uname().sysname != "Linux":
+        return None
+    supported = kernel_version() >= FSYNC_KERNEL
+    release = os.uname().release
+    if supported:
+        return _result("fsync", True, f"kernel {release} has futex_waitv")
+    if env.get("WINEFSYNC") == "1":
+        fallback = "esync" if env.get("WINEESYNC") == "1" else "plain wineserver sync"
+        return _result("fsync", False, f"kernel {release} is older than 5.16, wine falls back to {fallback}")
+    return _result("fsync", True, f"kernel {release} has no futex_waitv, not requested")
+
+def check_governor():
+    governors = {}
+    for path in glob.glob("/sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_governor"):
+        governor = _read(path)
+        if governor:
+            governors[governor] = governors.get(governor, 0) + 1
+    if not governors:
+        return None
+    driver = _read("/sys/devices/system/cpu/cpu0/cpufreq/scaling_driver") or "?"
+    summary = ", ".join(f"{name} x{count}" for name, count in sorted(governors.items()))
+    slow = {"powersave", "conservative"} & set(governors)
+    if driver in PSTATE_DRIVERS:
+        slow.discard("powersave")
+    if slow:
+        return _result("cpu governor", False, f"{summary} ({driver}), clocks ramp slowly. "
+                       "Try performance or schedutil, e.g. with powerprofilesctl or cpupower")
+    return _result("cpu governor", True, f"{summary} ({driver})")
+
+def find_mount(path):
+    """(mount point, fstype) of the mount holding path, from /proc/self/mountinfo"""
+    real = os.path.realpath(path)
+    best = None
+    try:
+        with open("/proc/self/mountinfo") as f:
+            for line in f:
+                fields = line.split()
+                # mount point is field 5, fstype comes right after the " - " separator
+                mount_point = fields[4].replace("\\040", " ").replace("\\011", "\t").replace("\\134", "\\")
+                fstype = fields[fields.index("-") + 1]
+                inside = real == mount_point or real.startswith(mount_point.rstrip("/") + "/")
+                if inside and (best is None or len(mount_point) >= len(best[0])):
+                    best = (mount_point, fstype)
+    except (OSError, ValueError, IndexError):
+        return None
+    return best
+
+def check_filesystem(prefix_path):
+    mount = find_mount(prefix_path)
+    if mount is None:
+        return None
+    mount_point, fstype = mount
+    if fstype in NETWORK_FILESYSTEMS:
+        return _result("prefix filesystem", False, f"{fstype} at {mount_point}, a network filesystem. "
+                       "Loading and saving will stall, move the prefix to a local disk")
+    if fstype in SLOW_FILESYSTEMS:
+        return _result("prefix filesystem", False, f"{fstype} at {mount_point}, slow for wine's many small files "
+                       "and no unix permissions")
+    return _result("prefix filesystem", True, f"{fstype} at {mount_point}")
+
+def run_preflight(prefix_path, env):
+    """Every check that applies to this host, fd limit first since it also fixes things"""
+    results = [check_fd_limit(env), check_map_count(), check_fsync(env),
+               check_governor(), check_filesystem(prefix_path)]
+    return [result for result in results if result is not None]
+
+def format_preflight(results):
+    """One line when all is well, otherwise just the problems"""
+    problems = [r for r in results if not r["ok"]]
+    fixed = [r for r in results if r["fixed"]]
+    lines = [f"Preflight: raised {r['check']} {r['detail'].split(',')[0]}" for r in fixed]
+    if not problems:
+        lines.append(f"Preflight: {len(results)} checks ok")
+        return "\n".join(lines)
+    lines.append(f"Preflight: {len(problems)} performance issue{'s' if len(problems) != 1 else ''}")
+    lines.extend(f"  ✗ {r['check']}: {r['detail']}" for r in problems)
+    return "\n".join(lines)
@@ -0,0 +1,194 @@
+import os
+import time
+import shutil
+import threading
+import subprocess
+from resource_sampler import find_prefix_processes
+from launch_profiles import TUNING_KEYS
+
+# cpu affinity, nice and io class for the game and wineserver
+# wine spawns everything itself, so we watch /proc and tune the processes as they show up
+# zeroz/tj
+
+class ProcessTuningError(Exception):
+    """Bad affinity, nice or ionice setting"""
+    pass
+
+GAME_PROCESSES = ("psobb.exe", "online.exe")
+
+IONICE_CLASSES = {"realtime": "1", "best-effort": "2", "idle": "3"}
+
+def parse_cpu_list(spec):
+    """'2,3,6-7' -> {2, 3, 6, 7}"""
+    cpus = set()
+    try:
+        for part in str(spec).split(","):
+            part = part.strip()
+            if not part:
+                continue
+            if "-" in part:
+                start, end = part.split("-", 1)
+                cpus.update(range(int(start), int(end) + 1))
+            else:
+                cpus.add(int(part))
+    except ValueError:
+        raise ProcessTuningError(f"Invalid CPU list '{spec}'. Use something like 2,3 or 2-5")
+    if not cpus:
+        raise ProcessTuningError(f"Empty CPU list '{spec}'")
+    return cpus
+
+def parse_ionice(spec):
+    """'best-effort:4' / 'idle' -> ionice args"""
+    name, _, level = str(spec).partition(":")
+    if name not in IONICE_CLASSES:
+        raise ProcessTuningError(f"Invalid ionice class '{name}'. Use one of: {', '.join(IONICE_CLASSES)}")
+    args = ["-c", IONICE_CLASSES[name]]
+    if level:
+        if name == "idle":
+            raise ProcessTuningError("The idle ionice class doesn't take a level")
+        if not level.isdigit() or int(level) > 7:
+            raise ProcessTuningError(f"Invalid ionice level '{level}'. Use 0-7")
+        args += ["-n", level]
+    return args
+
+def tuning_from_profile(profile):
+    return {key: profile[key] for key in TUNING_KEYS if profile.get(key) is not None}
+
+def format_cpus(cpus):
+    return ",".join(str(cpu) for cpu in sorted(cpus))
+
+class ProcessTuner:
+    def __init__(self, prefix_path, settings, watch_seconds=30, settle_seconds=5, poll_interval=0.5):
+        self.prefix_path = prefix_path
+        self.watch_seconds = watch_seconds
+        # keep catching new threads for a bit after the game first shows up
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.roles = self._build_roles(settings)
+        self.tuned = {}
+        self.errors = []
+        self._thread = None
+
+    def _build_roles(self, settings):
+        available = os.sched_getaffinity(0)
+        reserve_core0 = bool(settings.get("reserve_core0"))
+
+        roles = {}
+        for role in ("game", "wineserver"):
+            affinity = None
+            if settings.get(f"{role}_affinity") is not None:
+                affinity = parse_cpu_list(settings[f"{role}_affinity"])
+            elif reserve_core0:
+                affinity = set(available)
+            if affinity is not None:
+                if reserve_core0:
+                    affinity.discard(0)
+                unusable = affinity - available
+                if unusable:
+                    raise ProcessTuningError(f"CPUs {format_cpus(unusable)} are not available (have {format_cpus(available)})")
+                if not affinity:
+                    raise ProcessTuningError(f"No CPUs left for {role} after reserving core 0")
+
+            nice = settings.get(f"{role}_nice")
+            if nice is not None:
+                try:
+                    nice = int(nice)
+                except (TypeError, ValueError):
+                    raise ProcessTuningError(f"Invalid {role} nice value '{nice}'")
+                if not -20 <= nice <= 19:
+                    raise ProcessTuningError(f"{role} nice must be between -20 and 19")
+
+            ionice = None
+            if settings.get(f"{role}_ionice"):
+                ionice = parse_ionice(settings[f"{role}_ionice"])
+
+            if affinity is not None or nice is not None or ionice is not None:
+                roles[role] = {"affinity": affinity, "nice": nice, "ionice": ionice}
+        return roles
+
+    def _role_for(self, name):
+        if name == "wineserver":
+            return "wineserver"
+        if name.lower() in GAME_PROCESSES:
+            return "game"
+        return None
+
+    def _tune(self, pid, role):
+        settings = self.roles[role]
+        known = self.tuned.setdefault(pid, {"role": role, "threads": set()})
+        try:
+            threads = {int(tid) for tid in os.listdir(f"/proc/{pid}/task")}
+        except OSError:
+            return
+        # affinity and priority are per thread on linux, so hit every thread we haven't yet
+        new_threads = threads - known["threads"]
+        if not new_threads:
+            return
+        for tid in new_threads:
+            try:
+                if settings["affinity"] is not None:
+                    os.sched_setaffinity(tid, settings["affinity"])
+                if settings["nice"] is not None:
+                    os.setpriority(os.PRIO_PROCESS, tid, settings["nice"])
+            except ProcessLookupError:
+                continue
+            except OSError as e:
+                self.errors.append(f"{role} pid {pid} tid {tid}: {e}")
+        if settings["ionice"] is not None:
+            if shutil.which("ionice"):
+                result = subprocess.run(["ionice"] + settings["ionice"] + ["-p"] + [str(tid) for tid in sorted(new_threads)],
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                if result.returncode != 0:
+                    self.errors.append(f"{role} pid {pid} ionice: {result.stderr.decode(errors='ignore').strip()}")
+            elif "ionice missing" not in self.errors:
+                self.errors.append("ionice missing")
+        known["threads"] |= new_threads
+
+    def poll(self):
+        for pid, name in find_prefix_processes(self.prefix_path).items():
+            role = self._role_for(name)
+            if role in self.roles:
+                self.tuned.setdefault(pid, {"role": role, "threads": set()})["name"] = name
+                self._tune(pid, role)
+
+    def _run(self, on_done):
+        deadline = time.time() + self.watch_seconds
+        game_seen = None
+        while time.time() < deadline:
+            self.poll()
+            if game_seen is None and any(info["role"] == "game" for info in self.tuned.values()):
+                game_seen = time.time()
+                deadline = min(deadline, game_seen + self.settle_seconds)
+            time.sleep(self.poll_interval)
+        if on_done:
+            on_done()
+
+    def start(self, on_done=None):
+        if not self.roles:
+            return
+        self._thread = threading.Thread(target=self._run, args=(on_done,), name="process-tuner", daemon=True)
+        self._thread.start()
+
+    def join(self, timeout=None):
+        if self._thread:
+            self._thread.join(timeout)
+
+    def report(self):
+        lines = ["Process tuning:"]
+        if not self.tuned:
+            lines.append("  No game or wineserver process showed up to tune")
+        for pid, info in sorted(self.tuned.items()):
+            try:
+                affinity = format_cpus(os.sched_getaffinity(pid))
+                nice = os.getpriority(os.PRIO_PROCESS, pid)
+            except OSError:
+                lines.append(f"  {info.get('name', info['role'])} (pid {pid}) exited")
+                continue
+            lines.append(f"  {info.get('name', info['role'])} (pid {pid}): cpus {affinity}, nice {nice}, "
+                         f"{len(info['threads'])} threads tuned")
+        for error in self.errors:
+            if error == "ionice missing":
+                lines.append("  Warning: ionice not found, I/O class not applied (install util-linux)")
+            else:
+                lines.append(f"  Warning: {error}")
+        return "\n".join(lines)
@@ -1,48 +1,179 @@
 #!/usr/bin/env python3
 import os
 import sys
+import json
+import time
+import shutil
 import argparse
+import contextlib
 #import argcomplete #taking this away. its an added dependency that will never get enough usage
 from prefix_cmds import WineUtils, WineSetupError
-from shortcut_manager import ShortcutManager
+from launch_profiles import LaunchProfileError, load_profiles, resolve_profile, profile_env
+# everything else is imported where it's used, most runs only need one of them
+
+# MetricsRecorder of the running operation when --metrics-dir/PSO_METRICS_DIR is set
+metrics = None
 
 # made by zeroz - tj
 
-def install_ephinea(install_dxvk=True):
+def install_ephinea(install_dxvk=True, use_payload=True, lazy_components=False, dxvk_preset=None):
+    from shortcut_manager import ShortcutManager
     # Get script path based on resources dir env var if set
     script_base = os.environ.get('PSO_RESOURCES_DIR') or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     pso_bat_path = os.path.join(script_base, "scripts", "pso.bat")
+    installer_path = os.path.join(script_base, "bin", "Ephinea_PSOBB_Installer.exe")
     
     if not os.path.exists(pso_bat_path):
         print(f"Error: pso.bat script not found at {pso_bat_path}")
         sys.exit(1)
 
     wine = WineUtils()
+    if metrics:
+        metrics.track(wine)
+    start_install_progress(wine, "install")
+    ok = False
     try:
-        wine.setup_prefix(install_dxvk=install_dxvk)
-    except WineSetupError as e:
-        print(f"Error: {e}")
-        sys.exit(1)
+        try:
+            wine.setup_prefix(install_dxvk=install_dxvk, lazy_components=lazy_components)
+        except WineSetupError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+        from game_payload import PayloadStore, PayloadError
+        store = PayloadStore()
+        installer_hash, payload = store.find(installer_path) if use_payload else (None, None)
 
-    print("Installing Ephinea...")
-    command = ["wine", "cmd", "/c", pso_bat_path, "-i"]
+        print("Installing Ephinea...")
+        command = ["wine", "cmd", "/c", pso_bat_path, "-i"]
+        if payload:
+            with wine.run_phase("payload"):
+                if not install_from_payload(wine, store, installer_hash):
+                    sys.exit(1)
+            # pso.bat still does the start menu entries, -p skips its installer run
+            command = ["wine", "cmd", "/c", pso_bat_path, "-p", "-i"]
     
-    exit_code = wine.run_command(command, timeout=None)
-    if exit_code != 0:
-        print(f"Installation failed with exit code {exit_code}")
-        sys.exit(1)
+        with wine.run_phase("game"):
+            exit_code = wine.run_command(command, timeout=None, step="shortcuts" if payload else "installer")
+        report_install_phases(wine)
+        if metrics:
+            metrics.add("exit_code", int(exit_code))
+        if exit_code != 0:
+            print(f"Installation failed with exit code {exit_code}")
+            sys.exit(1)
+
+        if install_dxvk:
+            try:
+                wine.apply_dxvk_preset(dxvk_preset)
+            except WineSetupError as e:
+                print(f"Warning: {e}")
+        # after the preset, the manifest should match what the first launch sees
+        record_game_manifest(wine.prefix_path)
+
+        if use_payload and not payload:
+            # first install of this client version, keep the tree so the next prefix skips the installer
+            from prefix_status import get_install_dir
+            installer_hash = installer_hash or store.find(installer_path)[0]
+            install_dir = get_install_dir(wine.prefix_path)
+            if installer_hash and os.path.isdir(install_dir):
+                print("Saving game files to the payload store...")
+                try:
+                    store.record(installer_hash, wine.prefix_path, install_dir)
+                except (PayloadError, OSError) as e:
+                    print(f"Warning: Could not save the game payload: {e}")
 
-    # Only create shortcuts if not in system mode
-    if not os.environ.get('PSO_SYSTEM_INSTALL'):
-        print("Creating desktop shortcuts...")
-        shortcut_manager = ShortcutManager()
-        shortcut_manager.create_shortcuts()
-        shortcut_manager.remove_wine_generated_shortcuts()
+        # Only create shortcuts if not in system mode
+        if not os.environ.get('PSO_SYSTEM_INSTALL'):
+            print("Creating desktop shortcuts...")
+            shortcut_manager = ShortcutManager()
+            shortcut_manager.create_shortcuts()
+            shortcut_manager.remove_wine_generated_shortcuts()
     
+        collect_cache_garbage(wine, quiet=True)
+        ok = True
+    finally:
+        # failed installs go into the history too, sys.exit included
+        finish_install_progress(wine, ok)
     print("Installation completed successfully!")
+    if lazy_components:
+        print("PSOBB (-e) is ready. Mono and Gecko install on the first launcher (-l) start, "
+              "or now with --install-components")
+
+def report_install_phases(wine):
+    """Where the install's time went, per phase, also kept as json in the logs folder"""
+    if not wine.phase_results:
+        return
+    print("\nInstall timing:")
+    print(wine.format_phase_report())
+    log_dir = wine.get_log_dir()
+    try:
+        os.makedirs(log_dir, exist_ok=True)
+        with open(os.path.join(log_dir, "install_phases.json"), "w") as f:
+            json.dump({"created": time.time(), "phases": wine.phase_totals(),
+                       "commands": {name: [r.as_dict() for r in results]
+                                    for name, results in wine.phase_results.items()}}, f, indent=2)
+    except OSError as e:
+        print(f"Warning: Could not write install timing: {e}")
+
+def install_from_payload(wine, store, installer_hash):
+    """Copy the stored game tree into the prefix and point the registry at it instead of running the installer"""
+    from game_payload import PayloadError, DEFAULT_INSTALL_DIR
+    from prefix_status import windows_to_prefix_path
+    install_dir = windows_to_prefix_path(wine.prefix_path, DEFAULT_INSTALL_DIR)
+    print(f"Installer {installer_hash[:12]} already in the payload store, copying the game files...")
+    started = time.time()
+    try:
+        stats = store.materialize(installer_hash, install_dir, prefix_path=wine.prefix_path)
+    except (PayloadError, OSError) as e:
+        print(f"Error: {e}")
+        print("Use --fresh-install to run the installer instead")
+        return False
+    print(f"{stats['files']} files ({stats['bytes'] / 1048576:.1f} MB) in {time.time() - started:.1f}s: "
+          f"{stats['reflinked']} reflinked, {stats['linked']} hardlinked, {stats['copied']} copied")
+    # the only per prefix state the installer leaves that pso.bat and the launcher care about
+    exit_code = wine.run_command(["wine", "reg", "add", "HKCU\\Software\\EphineaPSO", "/v", "Install_Dir",
+                                  "/t", "REG_SZ", "/d", DEFAULT_INSTALL_DIR, "/f"], timeout=30)
+    if exit_code != 0:
+        print(f"Error: Could not set Install_Dir in the registry (exit code {exit_code})")
+        return False
+    return True
+
+def record_game_manifest(prefix_path):
+    """Hash the fresh install so --verify-game has something to compare against"""
+    from game_integrity import record_manifest
+    from prefix_status import get_install_dir
+    install_dir = get_install_dir(prefix_path)
+    if not os.path.isdir(install_dir):
+        print(f"Warning: {install_dir} not found, no game manifest recorded")
+        return
+    print("Recording game file manifest...")
+    stats = record_manifest(prefix_path, install_dir)
+    print(f"Manifest: {stats['files']} files ({stats['bytes'] / 1048576:.1f} MB)")
+
+def verify_game(as_json=False):
+    from game_integrity import load_manifest, verify_install, format_report
+    from prefix_status import get_install_dir
+    wine = WineUtils()
+    install_dir = get_install_dir(wine.prefix_path)
+    if not os.path.isdir(install_dir):
+        print(f"Error: No install at {install_dir}. Install first with -i")
+        sys.exit(1)
+    manifest = load_manifest(wine.prefix_path)
+    if manifest is None:
+        print("No game manifest for this prefix (installed before manifests existed).")
+        print("Use --record-game-manifest once the game is known to work")
+        sys.exit(1)
+    report = verify_install(wine.prefix_path, install_dir, manifest)
+    if as_json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(report))
+    sys.exit(0 if report["ok"] else 1)
 
 def uninstall_ephinea():
+    from shortcut_manager import ShortcutManager
     wine = WineUtils()
+    if metrics:
+        metrics.track(wine)
 
     print("Removing all desktop shortcuts and icons")
     shortcut_manager = ShortcutManager()
@@ -80,15 +211,240 @@ def uninstall_ephinea():
     else:
         print("Nothing to uninstall - prefix directory doesn't exist.")
 
+def show_status(as_json=False):
+    from prefix_status import collect_status, format_status
+    # host side only. no wine processes, just the hive files and the filesystem
+    wine = WineUtils()
+    status = collect_status(wine.prefix_path, wine.get_cache_dir(),
+                            check_shortcuts=not os.environ.get('PSO_SYSTEM_INSTALL'))
+    if as_json:
+        print(json.dumps(status, indent=2))
+    else:
+        print(format_status(status))
+    sys.exit(0 if status["healthy"] else 1)
+
+def cache_dirs(wine):
+    """The user's artifact cache, plus the shared one when we may clean it up"""
+    from artifact_cache import get_shared_cache_dir
+    dirs = [wine.get_cache_dir()]
+    shared_dir = get_shared_cache_dir()
+    if shared_dir and shared_dir not in dirs and os.access(shared_dir, os.W_OK):
+        dirs.append(shared_dir)
+    return dirs
+
+def show_cache_stats(as_json=False):
+    from cache_gc import cache_stats, format_stats, get_cache_cap_bytes
+    wine = WineUtils()
+    cap = get_cache_cap_bytes(args.cache_max_mb)
+    stats = [cache_stats(cache_dir, cap) for cache_dir in cache_dirs(wine)]
+    if as_json:
+        print(json.dumps(stats, indent=2))
+    else:
+        print("\n\n".join(format_stats(s) for s in stats))
+
+def collect_cache_garbage(wine, quiet=False):
+    """Trim the artifact caches to the size cap, least recently used first, keeping what live prefixes use"""
+    from cache_gc import collect_garbage, get_cache_cap_bytes
+    cap = get_cache_cap_bytes(getattr(args, "cache_max_mb", None))
+    for cache_dir in cache_dirs(wine):
+        try:
+            result = collect_garbage(cache_dir, cap)
+        except OSError as e:
+            print(f"Warning: Could not clean up {cache_dir}: {e}")
+            continue
+        freed = result["before"] - result["after"]
+        if result["evicted"]:
+            print(f"Cache {cache_dir}: evicted {len(result['evicted'])} entries, freed {freed / 1048576:.1f} MB")
+        elif not quiet:
+            print(f"Cache {cache_dir}: {result['before'] / 1048576:.1f} MB, nothing to evict")
+        if result["after"] > cap and not quiet:
+            print(f"  still {result['after'] / 1048576:.1f} MB over a {cap / 1048576:.0f} MB cap, "
+                  f"{result['kept_referenced']} entries are in use by installed prefixes")
+
+def start_install_progress(wine, operation):
+    """Time every install step against this machine's history: adaptive timeouts, slow step warnings, an ETA"""
+    import sqlite3
+    from step_history import StepHistory, InstallProgress, format_seconds
+    probe = wine.run_probe(["wine", "--version"])
+    version = (probe.output.strip().split("\n", 1)[0] or None) if probe == 0 else None
+    try:
+        history = StepHistory(version)
+        wine.progress = InstallProgress(history, operation, adaptive=not args.fixed_timeouts)
+    except (sqlite3.Error, OSError) as e:
+        print(f"Warning: Could not open the install history, using the built in timeouts: {e}")
+        return
+    eta = wine.progress.eta()
+    if eta:
+        print(f"Last {operation} on this machine and Wine took about {format_seconds(eta)}")
+
+def finish_install_progress(wine, ok):
+    if wine.progress is None:
+        return
+    import sqlite3
+    try:
+        wine.progress.finish(ok)
+    except sqlite3.Error as e:
+        print(f"Warning: Could not record the install history: {e}")
+    if wine.progress.slow_steps:
+        print(f"Slower than usual: {', '.join(wine.progress.slow_steps)}")
+    wine.progress = None
+
+def install_components():
+    """Install what --lazy-components deferred, e.g. in the background right after -i"""
+    from prefix_status import get_pending_components
+    wine = WineUtils()
+    if metrics:
+        metrics.track(wine)
+    if not os.path.exists(wine.prefix_path):
+        print("Error: Ephinea is not installed. Please install it first with -i")
+        sys.exit(1)
+    pending = get_pending_components(wine.prefix_path)
+    if not pending:
+        print("Nothing deferred, Mono and Gecko are installed")
+        return
+    print(f"Installing deferred components: {', '.join(pending)}")
+    start_install_progress(wine, "components")
+    ok = False
+    try:
+        ok = wine.install_pending_components()
+    finally:
+        finish_install_progress(wine, ok)
+    if not ok:
+        print("Error: Component install failed, the launcher (-l) will try again")
+        sys.exit(1)
+    print("Components installed, the launcher is ready")
+
+def verify_components(as_json=False):
+    from prefix_cmds import VERIFY_COMPONENTS
+    wine = WineUtils()
+    if not os.path.exists(wine.prefix_path):
+        print(f"Error: Prefix {wine.prefix_path} doesn't exist. Install first with -i")
+        sys.exit(1)
+    try:
+        # wine chatter goes to stderr so --json output stays parseable
+        with contextlib.redirect_stdout(sys.stderr if as_json else sys.stdout):
+            report = wine.verify_components(("mono", "gecko") if args.directx_runtime else VERIFY_COMPONENTS)
+    except WineSetupError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if metrics:
+        metrics.add("verification_failures", sum(1 for r in report.results if r.required and not r.ok))
+    if as_json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print(report.format())
+    sys.exit(0 if report.ok else 1)
+
+def list_profiles():
+    try:
+        profiles = load_profiles()
+        for name in sorted(profiles):
+            profile, source = profiles[name]
+            print(f"{name} ({source})")
+            if profile.get("description"):
+                print(f"  {profile['description']}")
+            env = profile_env(resolve_profile(name, profiles))
+            if not env:
+                print("  (no environment changes)")
+            for key in sorted(env):
+                print(f"  {key}={env[key]}")
+    except LaunchProfileError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+def list_dxvk_presets():
+    from dxvk_config import DXVK_PRESETS, read_preset
+    current, _ = read_preset(WineUtils().prefix_path)
+    for name, preset in DXVK_PRESETS.items():
+        print(f"{name}{' (current)' if name == current else ''}")
+        print(f"  {preset['description']}")
+        for key, value in sorted(preset["options"].items()):
+            print(f"  {key} = {value}")
+
+def set_dxvk_preset(name):
+    """Switch the prefix's dxvk.conf without launching"""
+    wine = WineUtils()
+    try:
+        preset = wine.apply_dxvk_preset(name)
+    except WineSetupError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"DXVK preset: {preset}")
+
+def benchmark_probes(count):
+    """Per spawn cost of run_command's pty path vs run_probe, for checking the probe path still pays off"""
+    from cmd_runner import benchmark_spawn
+    commands = [["true"]] + ([["wine", "--version"]] if shutil.which("wine") else [])
+    for command in commands:
+        timings = benchmark_spawn(command, count)
+        pty_ms, probe_ms = timings["pty"]["median"] * 1000, timings["probe"]["median"] * 1000
+        print(f"{' '.join(command)} x{count}: pty {pty_ms:.2f} ms, probe {probe_ms:.2f} ms per spawn (median), "
+              f"{pty_ms - probe_ms:.2f} ms saved")
+
+def analyze_frames(logs):
+    from frame_stats import FrameLogError, analyze_log, format_report, format_diff
+    if len(logs) > 2:
+        print("Error: --analyze-frames takes one log, or two to compare")
+        sys.exit(1)
+    try:
+        results = [analyze_log(log, args.stutter_ms) for log in logs]
+    except FrameLogError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if len(results) == 1:
+        print(f"Frame analysis: {logs[0]}")
+        print(format_report(results[0], args.stutter_ms))
+    else:
+        print(f"A: {logs[0]}")
+        print(f"B: {logs[1]}")
+        print(format_diff(results[0], results[1], args.stutter_ms))
+
 def execute_ephinea(launcher=False):
+    from process_tuning import ProcessTuner, ProcessTuningError, tuning_from_profile
 
-    #must set wine env variables before wineutils initialize
+    profile = args.profile
     if args.directx_runtime:
+        if profile and profile != "compat":
+            print("Error: --directx-runtime is the compat profile, it can't be combined with --profile")
+            sys.exit(1)
         print("LAUNCHING IN VM COMPATIBILITY MODE (NO HARDWARE GRAPHICS)")
-        os.environ['WINEESYNC'] = "1"
-        os.environ['WINEDLLOVERRIDES'] = "dxvk_config=b;d3d9,d3d11,dxgi=b"
+        profile = "compat"
+
+    # fail on a bad profile before touching wine at all
+    resolved_profile = {}
+    if profile:
+        try:
+            resolved_profile = resolve_profile(profile)
+        except LaunchProfileError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    # cli flags win over whatever the profile says
+    tuning = tuning_from_profile(resolved_profile)
+    for key, value in (("game_affinity", args.cpu_affinity), ("wineserver_affinity", args.wineserver_affinity),
+                       ("game_nice", args.nice), ("wineserver_nice", args.wineserver_nice),
+                       ("game_ionice", args.ionice), ("wineserver_ionice", args.wineserver_ionice)):
+        if value is not None:
+            tuning[key] = value
+    if args.reserve_core0:
+        tuning["reserve_core0"] = True
+
+    core_sets = None
+    if args.instances != 1:
+        core_sets = plan_instances(launcher, tuning)
 
     wine = WineUtils()
+    if metrics:
+        metrics.track(wine)
+
+    tuner = None
+    if tuning:
+        try:
+            tuner = ProcessTuner(wine.prefix_path, tuning)
+        except ProcessTuningError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
     
     # Check if prefix exists first
     if not os.path.exists(wine.prefix_path):
@@ -100,16 +456,392 @@ def execute_ephinea(launcher=False):
         print(f"Error: pso.bat script not found at {pso_bat_path}")
         sys.exit(1)
 
+    from prefix_status import get_pending_components
+    from prefix_cmds import LAZY_DLL_OVERRIDES
+    pending = get_pending_components(wine.prefix_path)
+    if pending and launcher:
+        # online.exe is what needs .NET and MSHTML, so the deferred install happens now
+        print(f"The launcher needs {' and '.join(pending)}, installing them first (deferred at install)...")
+        if not wine.install_pending_components():
+            print("Error: Component install failed. PSOBB itself still runs with -e")
+            sys.exit(1)
+    elif pending:
+        # don't start the game while a --install-components run is about to restart wineserver
+        with wine.component_lock():
+            pass
+
+    from preflight import run_preflight, format_preflight
+    # raises the fd limit in this process, so wine and everything it starts inherit it
+    launch_env = dict(os.environ)
+    launch_env.update(profile_env(resolved_profile))
+    preflight = run_preflight(wine.prefix_path, launch_env)
+    print(format_preflight(preflight))
+    if metrics:
+        metrics.add("preflight_issues", sum(1 for result in preflight if not result["ok"]))
+    if args.strict and any(not result["ok"] for result in preflight):
+        print("Error: Not launching with preflight issues (--strict)")
+        sys.exit(1)
+
+    from dxvk_config import read_preset
+    # prefixes that never picked a preset keep whatever dxvk.conf they have
+    if not args.directx_runtime and (args.dxvk_preset or read_preset(wine.prefix_path)[0]):
+        try:
+            wine.apply_dxvk_preset(args.dxvk_preset)
+        except WineSetupError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
     print("Executing Ephinea...")
     command = ["wine", "cmd", "/c", pso_bat_path, "-e"]
     if launcher:
         command.append("-l")
+
+    extra_env = None
+    if args.log_frames:
+        # dxvk has no per-frame log of its own. mangohud hooks both dxvk (vulkan) and wined3d (opengl)
+        if not shutil.which("mangohud"):
+            print("Error: --log-frames needs MangoHud installed (mangohud on PATH)")
+            sys.exit(1)
+        frame_dir = os.path.join(wine.get_log_dir(), "frames", time.strftime("session-%Y%m%d-%H%M%S"))
+        os.makedirs(frame_dir, exist_ok=True)
+        command = ["mangohud"] + command
+        extra_env = {"MANGOHUD_CONFIG": f"output_folder={frame_dir},autostart_log=1,log_interval=0,no_display"}
+        print(f"Logging frame times to {frame_dir}")
+
+    if pending and not launcher:
+        extra_env = dict(extra_env or {})
+        overrides = launch_env.get("WINEDLLOVERRIDES")
+        extra_env["WINEDLLOVERRIDES"] = f"{overrides};{LAZY_DLL_OVERRIDES}" if overrides else LAZY_DLL_OVERRIDES
+
+    sampler = None
+    if args.sample_resources:
+        sample_path = os.path.join(wine.get_log_dir(), time.strftime("resources-%Y%m%d-%H%M%S.csv"))
+        from resource_sampler import ResourceSampler
+        sampler = ResourceSampler(wine.prefix_path, sample_path, interval=args.sample_interval)
+        print(f"Sampling wine process resources every {args.sample_interval:g}s to {sample_path}")
+
+    if core_sets:
+        launch_instances(wine, core_sets, profile, extra_env, sampler, tuner)
+        return
+
     print(f"Command: {' '.join(command)}")
+    if args.detach:
+        # metrics for a detached launch stop at the handoff, the session itself is the supervisor's.
+        # no prefetch either, cancelling it means staying until the game has loaded
+        game_pid = wine.execute_game(command, detach=True, profile=profile, extra_env=extra_env,
+                                     sampler=sampler, tuner=tuner)
+        if game_pid is None:
+            print("Error: Detached launch failed. Check the session state in the logs folder")
+            sys.exit(1)
+        log_dir = wine.get_log_dir()
+        print(f"Game running under supervisor (pid {game_pid})")
+        print(f"Output: {os.path.join(log_dir, 'game.log')}")
+        print(f"Session state: {os.path.join(log_dir, 'session_state.json')}")
+        return
     # Use execute_game instead of run_command
-    exit_code = wine.execute_game(command)
+    prefetcher = start_prefetch(wine)
+    with wine.run_phase("game"):
+        exit_code = wine.execute_game(command, profile=profile, extra_env=extra_env, sampler=sampler, tuner=tuner)
+    finish_prefetch(prefetcher)
     print(f"Execution finished with exit code: {exit_code}")
+    if metrics:
+        metrics.add("exit_code", int(exit_code))
+
+def start_prefetch(wine):
+    """Warm the page cache with the game files while wine starts. None when off or unsupported"""
+    if args.no_prefetch:
+        return None
+    from prefetch import Prefetcher, get_budget_bytes, supported
+    from prefix_status import get_install_dir
+    install_dir = get_install_dir(wine.prefix_path)
+    if not supported() or not os.path.isdir(install_dir):
+        return None
+    prefetcher = Prefetcher(wine.prefix_path, install_dir, get_budget_bytes(args.prefetch_mb))
+    prefetcher.start()
+    return prefetcher
+
+def finish_prefetch(prefetcher):
+    """pso.bat returns as soon as the game is started, stay until it has loaded so the prefetch can be cancelled"""
+    if prefetcher is None:
+        return
+    try:
+        prefetcher.wait_loaded()
+    except KeyboardInterrupt:
+        pass
+    prefetcher.stop()
+    print(prefetcher.summary())
+
+def plan_instances(launcher, tuning):
+    """Check --instances against the other flags and split the game's cpus between the clients"""
+    from process_tuning import ProcessTuningError, format_cpus, parse_cpu_list
+    from multibox import MultiboxError, plan_core_sets
+    if launcher:
+        print("Error: --instances starts PsoBB.exe clients, use it with -e")
+        sys.exit(1)
+    if args.log_frames:
+        print("Error: --log-frames records one session, it can't be combined with --instances")
+        sys.exit(1)
+    if args.detach and args.sample_resources:
+        print("Error: --sample-resources with --instances needs the foreground, drop --detach")
+        sys.exit(1)
+    try:
+        available = os.sched_getaffinity(0)
+        pool = parse_cpu_list(tuning.pop("game_affinity")) if "game_affinity" in tuning else set(available)
+        if tuning.pop("reserve_core0", False):
+            pool.discard(0)
+            # the clients are pinned below, core 0 only has to be kept from wineserver
+            tuning.setdefault("wineserver_affinity", format_cpus(available - {0}))
+        if tuning.get("wineserver_affinity") is not None:
+            # keep the clients off wineserver's cpus when there's room for that
+            rest = pool - parse_cpu_list(tuning["wineserver_affinity"])
+            pool = rest or pool
+        return plan_core_sets(args.instances, pool & available)
+    except (ProcessTuningError, MultiboxError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+def launch_instances(wine, core_sets, profile, extra_env, sampler, tuner):
+    """Start one PsoBB.exe per core set on a shared wineserver, staggered, and report each"""
+    from multibox import MultiboxLauncher
+    from prefix_status import get_install_dir
+    install_dir = get_install_dir(wine.prefix_path)
+    if not os.path.isfile(os.path.join(install_dir, "PsoBB.exe")):
+        print(f"Error: PsoBB.exe not found in {install_dir}")
+        sys.exit(1)
+
+    wine.enable_gui(profile)
+    if extra_env:
+        wine.env.update(extra_env)
+    multibox = MultiboxLauncher(wine, install_dir, core_sets, stagger=args.stagger)
+    print(f"Starting {len(core_sets)} PSOBB instances, up to {args.stagger:g}s apart")
+    prefetcher = start_prefetch(wine)
+    with wine.run_phase("warmup"):
+        if multibox.warm_up():
+            print("Started a shared wineserver")
+    if tuner:
+        tuner.start(on_done=None if args.detach else lambda: print(tuner.report()))
+    if sampler:
+        sampler.start()
+
+    with wine.run_phase("game"):
+        multibox.launch_all()
+    finish_prefetch(prefetcher)
+    running = multibox.poll()
+    print(f"{running} of {len(core_sets)} instances running. State: {multibox.state_path}")
+    if args.detach:
+        if tuner:
+            tuner.join()
+            print(tuner.report())
+        if not running:
+            sys.exit(1)
+        return
+
+    try:
+        multibox.wait(on_exit=lambda instance: print(multibox.describe(instance)))
+    except KeyboardInterrupt:
+        print("\nStopped waiting, the instances keep running")
+    finally:
+        if sampler:
+            sampler.finish()
+            print(sampler.summary())
+    if metrics:
+        for instance in multibox.instances:
+            if instance["exit_code"] is not None:
+                metrics.add("exit_code", int(instance["exit_code"]), instance=str(instance["instance"]))
+
+def export_bundle(output_path):
+    from prefix_bundle import BundleError, export_bundle as write_bundle
+    wine = WineUtils()
+    user_params = args.user_params
+    if user_params is None:
+        default_params = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "android", "USER_PARAMS.txt")
+        user_params = default_params if os.path.exists(default_params) else None
+    elif not os.path.exists(user_params):
+        print(f"Error: {user_params} not found")
+        sys.exit(1)
+
+    print(f"Exporting {wine.prefix_path} to {output_path}")
+    if user_params:
+        print(f"Applying settings from {user_params}")
+    started = time.time()
+    try:
+        stats = write_bundle(wine.prefix_path, output_path, user_params, level=args.zstd_level)
+    except (BundleError, OSError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Bundled {stats['install_dir']}: {stats['files']} files ({stats['bytes'] / 1048576:.1f} MB), "
+          f"{stats['duplicates']} duplicates stored as links ({stats['deduped_bytes'] / 1048576:.1f} MB saved)")
+    print(f"Wrote {stats['output_bytes'] / 1048576:.1f} MB in {time.time() - started:.1f}s")
+
+def import_bundle(bundle_path):
+    from prefix_bundle import BundleError, import_bundle as read_bundle
+    target = args.import_target or WineUtils().prefix_path
+    if not os.path.exists(bundle_path):
+        print(f"Error: {bundle_path} not found")
+        sys.exit(1)
+    if not os.path.isdir(target):
+        print(f"Error: {target} doesn't exist. Create the prefix (wineboot) or the drive folder first")
+        sys.exit(1)
+    if args.drive_letter and not (len(args.drive_letter) == 1 and args.drive_letter.isalpha()):
+        print(f"Error: Invalid drive letter '{args.drive_letter}'")
+        sys.exit(1)
+
+    print(f"Importing {bundle_path} into {target}")
+    started = time.time()
+    try:
+        result = read_bundle(bundle_path, target, drive_letter=args.drive_letter)
+    except (BundleError, OSError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Unpacked {result['files']} files to {result['path']} in {time.time() - started:.1f}s")
+    print(f"Install_Dir: {result['install_dir']}")
+    if result["registry"]:
+        print(f"Registry keys written to {result['registry']}")
+    else:
+        print(f"Registry keys saved to {result['reg_file']}")
+        print(f"Apply them inside the container with: regedit /S {result['reg_file_windows']}")
+
+def manage_snapshots():
+    from prefix_snapshot import SnapshotError, SnapshotStore
+    wine = WineUtils()
+    store = SnapshotStore()
+    started = time.time()
+    try:
+        if args.snapshot:
+            print(f"Snapshotting {wine.prefix_path} as '{args.snapshot}'")
+            stats = store.snapshot(wine.prefix_path, args.snapshot)
+            print(f"{stats['files']} files ({stats['bytes'] / 1048576:.1f} MB), {stats['hashed']} hashed, "
+                  f"{stats['stored']} new in the store ({stats['stored_bytes'] / 1048576:.1f} MB, "
+                  f"{stats['reflinked']} reflinked)")
+        elif args.restore:
+            print(f"Restoring '{args.restore}' into {wine.prefix_path}")
+            stats = store.restore(wine.prefix_path, args.restore)
+            print(f"{stats['written']} written ({stats['written_bytes'] / 1048576:.1f} MB), "
+                  f"{stats['removed']} removed, {stats['unchanged']} unchanged")
+        elif args.delete_snapshot:
+            freed, freed_bytes = store.delete(args.delete_snapshot)
+            print(f"Deleted '{args.delete_snapshot}', freed {freed} objects ({freed_bytes / 1048576:.1f} MB)")
+        else:
+            snapshots = store.list()
+            if not snapshots:
+                print(f"No snapshots in {store.root}")
+            for snapshot in snapshots:
+                created = time.strftime("%Y-%m-%d %H:%M", time.localtime(snapshot["created"]))
+                print(f"{snapshot['name']:<24} {created}  {snapshot['files']} files, "
+                      f"{snapshot['bytes'] / 1048576:.1f} MB  {snapshot['prefix']}")
+            return
+    except (SnapshotError, OSError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Done in {time.time() - started:.1f}s")
+
+def run_via_daemon():
+    """Hand install, uninstall, status and plain launches to a running daemon. False means run here"""
+    from daemon_client import DaemonError, client_env, daemon_available, request
+    if not daemon_available():
+        return False
+
+    prefix_path = os.environ.get('WINEPREFIX') or os.path.expanduser("~/.local/share/ephinea-prefix")
+    payload = {"prefix": prefix_path}
+    if args.uninstall:
+        action = "uninstall"
+    elif args.install:
+        action = "install"
+        payload["skip_dxvk"] = args.skip_dxvk_install
+        payload["fresh_install"] = args.fresh_install
+        payload["lazy_components"] = args.lazy_components
+        payload["dxvk_preset"] = args.dxvk_preset
+        payload["fixed_timeouts"] = args.fixed_timeouts
+        payload["cache_max_mb"] = args.cache_max_mb
+    elif args.status:
+        action = "status"
+    elif args.execute or args.launcher:
+        # tuning, sampling and frame logs all watch the game from this process
+        local_only = (args.cpu_affinity, args.wineserver_affinity, args.nice, args.wineserver_nice,
+                      args.ionice, args.wineserver_ionice)
+        if any(value is not None for value in local_only) or args.reserve_core0 or args.detach \
+                or args.log_frames or args.sample_resources or args.strict or args.dxvk_preset \
+                or args.instances != 1:
+            return False
+        if args.directx_runtime and args.profile and args.profile != "compat":
+            return False
+        action = "launch"
+        payload.update({"launcher": args.launcher, "profile": "compat" if args.directx_runtime else args.profile,
+                        "no_prefetch": args.no_prefetch, "prefetch_mb": args.prefetch_mb})
+    else:
+        return False
+    if action in ("install", "uninstall", "launch"):
+        payload["env"] = client_env()
+
+    try:
+        result = request(action, payload, on_output=lambda line: print(line, flush=True))
+    except (DaemonError, ValueError, OSError) as e:
+        # crashed or stale daemon, same as no daemon at all
+        print(f"Warning: {e}. Running locally")
+        return False
+    if result is None or result.get("fallback"):
+        return False
+    if not result["ok"] and "error" in result:
+        print(f"Error: {result['error']}")
+        sys.exit(1)
+
+    if action == "status":
+        from prefix_status import format_status
+        if args.json:
+            print(json.dumps(result["status"], indent=2))
+        else:
+            print(format_status(result["status"]))
+            print(f"(via daemon pid {result['daemon']['pid']})")
+        sys.exit(0 if result["status"]["healthy"] else 1)
+    if action == "launch":
+        print(f"Game started by the daemon (pid {result['pid']})")
+        print(f"Output: {result['log']}")
+        return True
+    sys.exit(result["exit_code"])
+
+def run_daemon():
+    from daemon_client import DaemonError
+    from pso_daemon import serve
+    try:
+        serve()
+    except DaemonError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+def stop_daemon():
+    from daemon_client import get_socket_path, request
+    if not os.path.exists(get_socket_path()) or request("shutdown") is None:
+        print("No daemon running")
+        return
+    print("Daemon stopping")
+
+def run_with_metrics(operation, func, *func_args, **func_kwargs):
+    """Run an operation and leave its metrics for node_exporter's textfile collector, if asked to"""
+    global metrics
+    from metrics import get_metrics_dir
+    metrics_dir = args.metrics_dir or get_metrics_dir()
+    if not metrics_dir:
+        return func(*func_args, **func_kwargs)
+    from metrics import MetricsRecorder
+    metrics = MetricsRecorder(operation)
+    success = False
+    try:
+        result = func(*func_args, **func_kwargs)
+        success = True
+        return result
+    except SystemExit as e:
+        success = e.code in (None, 0)
+        raise
+    finally:
+        metrics.finish(success)
+        try:
+            metrics.write(metrics_dir)
+        except OSError as e:
+            print(f"Warning: Could not write metrics to {metrics_dir}: {e}")
 
 def get_arg_parser():
+    from dxvk_config import DXVK_PRESETS
+    from multibox import DEFAULT_STAGGER
     parser = argparse.ArgumentParser(description="Ephinea installer script")
     parser.add_argument("-i", "--install", action="store_true", 
                        help="Install Ephinea")
@@ -121,8 +853,105 @@ def get_arg_parser():
                        help="Start Ephinea Launcher")
     parser.add_argument("--directx-runtime", action="store_true",
                        help="Use Wine's DirectX runtime instead of DXVK. Useful for compatibility issues. Run with -e or -l")
+    parser.add_argument("--profile", metavar="NAME",
+                       help="Launch profile to apply (sync primitives, DXVK options, DLL overrides, env). Run with -e or -l")
+    parser.add_argument("--status", action="store_true",
+                       help="Check prefix, components, install and shortcuts without starting Wine. Exit code 1 if anything is missing")
+    parser.add_argument("--json", action="store_true",
+                       help="Machine readable output for --status, --verify and --verify-game")
+    parser.add_argument("--verify", action="store_true",
+                       help="Verify Mono, Gecko and DXVK in the prefix with Wine, all checks run in parallel. Exit code 1 on failure")
+    parser.add_argument("--verify-game", action="store_true",
+                       help="Hash every game file and compare against the manifest taken at install. Reports missing, modified and extra files")
+    parser.add_argument("--record-game-manifest", action="store_true",
+                       help="Take the current game files as known good, e.g. after the launcher patched the game")
+    parser.add_argument("--list-profiles", action="store_true",
+                       help="List built in and user launch profiles with the environment each one sets")
+    parser.add_argument("--cpu-affinity", metavar="CPUS",
+                       help="Pin PsoBB.exe/online.exe to these cores, e.g. 2,3 or 2-5. Run with -e or -l")
+    parser.add_argument("--wineserver-affinity", metavar="CPUS",
+                       help="Pin wineserver to these cores")
+    parser.add_argument("--reserve-core0", action="store_true",
+                       help="Keep the game and wineserver off core 0")
+    parser.add_argument("--nice", type=int, metavar="N",
+                       help="Nice value for the game process (negative values need privileges)")
+    parser.add_argument("--wineserver-nice", type=int, metavar="N",
+                       help="Nice value for wineserver")
+    parser.add_argument("--ionice", metavar="CLASS[:LEVEL]",
+                       help="I/O class for the game: realtime, best-effort or idle, with an optional 0-7 level")
+    parser.add_argument("--wineserver-ionice", metavar="CLASS[:LEVEL]",
+                       help="I/O class for wineserver")
+    parser.add_argument("--strict", action="store_true",
+                       help="Refuse to launch if the preflight finds anything that costs performance (fd limit, max_map_count, fsync, governor, network filesystem)")
+    parser.add_argument("--detach", action="store_true",
+                       help="Launch under a detached supervisor and return immediately. Game output goes to logs/. Run with -e or -l")
+    parser.add_argument("--no-prefetch", action="store_true",
+                       help="Don't warm the page cache with the game files while Wine starts")
+    parser.add_argument("--prefetch-mb", type=float, metavar="MB",
+                       help="Most game data to prefetch per launch (default: 512, or PSO_PREFETCH_MB, at most half the free memory)")
+    parser.add_argument("--instances", type=int, default=1, metavar="N",
+                       help="Start N PSOBB clients in the prefix on one shared wineserver, each on its own cores. Run with -e")
+    parser.add_argument("--stagger", type=float, default=DEFAULT_STAGGER, metavar="SECONDS",
+                       help=f"Longest wait for a client to finish loading before starting the next (default: {DEFAULT_STAGGER:g})")
+    parser.add_argument("--log-frames", action="store_true",
+                       help="Record per-frame times to logs/frames/ via MangoHud. Run with -e or -l")
+    parser.add_argument("--sample-resources", action="store_true",
+                       help="Sample RSS, CPU, context switches and I/O of the prefix's wine processes to logs/. Run with -e or -l")
+    parser.add_argument("--sample-interval", type=float, default=1.0, metavar="SECONDS",
+                       help="Seconds between resource samples (default: 1)")
+    parser.add_argument("--analyze-frames", nargs="+", metavar="LOG",
+                       help="Report FPS, lows, percentiles and stutters for a frame log (file or session folder). Pass two to compare")
+    parser.add_argument("--stutter-ms", type=float, default=50.0,
+                       help="Frame time in ms that counts as a stutter for --analyze-frames (default: 50)")
     parser.add_argument("--skip-dxvk-install", action="store_true",
                        help="Install using Wine's DirectX runtime instead of DXVK. Run with -i")
+    parser.add_argument("--dxvk-preset", metavar="NAME", choices=list(DXVK_PRESETS),
+                       help=f"Write dxvk.conf from a preset ({', '.join(DXVK_PRESETS)}) and keep using it. "
+                            "Works with -i, -e/-l or on its own")
+    parser.add_argument("--list-dxvk-presets", action="store_true",
+                       help="Show the DXVK presets and the options each sets")
+    parser.add_argument("--fresh-install", action="store_true",
+                       help="Always run the Ephinea installer, even if the payload store has this client version. Run with -i")
+    parser.add_argument("--lazy-components", action="store_true",
+                       help="Skip Mono and Gecko at install so PSOBB (-e) is playable sooner. They install on the first -l. Run with -i")
+    parser.add_argument("--install-components", action="store_true",
+                       help="Install the Mono and Gecko that --lazy-components deferred now, e.g. in the background")
+    parser.add_argument("--fixed-timeouts", action="store_true",
+                       help="Use the built in step timeouts instead of ones from this machine's install history. Run with -i")
+    parser.add_argument("--cache-stats", action="store_true",
+                       help="Show the download cache's entries, sizes, last use and which prefixes use them")
+    parser.add_argument("--cache-gc", action="store_true",
+                       help="Evict least recently used downloads no installed prefix uses until the cache is under its cap")
+    parser.add_argument("--cache-max-mb", type=float, metavar="MB",
+                       help="Size cap for --cache-gc and the cleanup after -i (default: 1024, or PSO_CACHE_MAX_MB)")
+    parser.add_argument("--export-bundle", metavar="FILE",
+                       help="Stream the installed game and its registry keys into a bundle (.tar.zst, .tar.gz or .tar)")
+    parser.add_argument("--import-bundle", metavar="FILE",
+                       help="Unpack a bundle into a fresh prefix, or a container drive folder with --import-target")
+    parser.add_argument("--user-params", metavar="FILE",
+                       help="USER_PARAMS.txt to apply to an exported bundle (default: android/USER_PARAMS.txt)")
+    parser.add_argument("--zstd-level", type=int, default=10, metavar="N",
+                       help="zstd level for --export-bundle (default: 10)")
+    parser.add_argument("--import-target", metavar="DIR",
+                       help="Prefix or drive folder for --import-bundle (default: the prefix)")
+    parser.add_argument("--drive-letter", metavar="LETTER",
+                       help="Windows drive the --import-target folder shows up as (default: the bundle's drive for a prefix, D for a folder)")
+    parser.add_argument("--snapshot", metavar="NAME",
+                       help="Save an incremental snapshot of the prefix (only changed files are stored)")
+    parser.add_argument("--restore", metavar="NAME",
+                       help="Roll the prefix back to a snapshot, rewriting only files that differ")
+    parser.add_argument("--list-snapshots", action="store_true",
+                       help="List saved prefix snapshots")
+    parser.add_argument("--delete-snapshot", metavar="NAME",
+                       help="Delete a snapshot and free store space nothing else uses")
+    parser.add_argument("--metrics-dir", metavar="DIR",
+                       help="Write Prometheus textfile metrics for -i, -u, -e/-l and --verify to DIR (or set PSO_METRICS_DIR)")
+    # developer check, not worth a line in --help
+    parser.add_argument("--benchmark-probes", type=int, nargs="?", const=50, metavar="N", help=argparse.SUPPRESS)
+    parser.add_argument("--daemon", action="store_true",
+                       help="Run the pso_wine daemon in the foreground. -i, -u, --status and plain launches then go through it")
+    parser.add_argument("--stop-daemon", action="store_true",
+                       help="Ask a running daemon to shut down")
     return parser
 
 if __name__ == "__main__":
@@ -131,12 +960,50 @@ if __name__ == "__main__":
     #argcomplete.autocomplete(parser) #removing need for argcomplete
     args = parser.parse_args()
 
-    if args.uninstall:
-        uninstall_ephinea()
+    if args.daemon:
+        run_daemon()
+    elif args.stop_daemon:
+        stop_daemon()
+    elif not args.metrics_dir and run_via_daemon():
+        pass
+    elif args.uninstall:
+        run_with_metrics("uninstall", uninstall_ephinea)
     elif args.install:
-        install_ephinea(install_dxvk=not args.skip_dxvk_install)
+        run_with_metrics("install", install_ephinea, install_dxvk=not args.skip_dxvk_install,
+                         use_payload=not args.fresh_install, lazy_components=args.lazy_components,
+                         dxvk_preset=args.dxvk_preset)
+    elif args.install_components:
+        run_with_metrics("install_components", install_components)
+    elif args.status:
+        show_status(as_json=args.json)
+    elif args.cache_stats:
+        show_cache_stats(as_json=args.json)
+    elif args.cache_gc:
+        collect_cache_garbage(WineUtils())
+    elif args.snapshot or args.restore or args.list_snapshots or args.delete_snapshot:
+        manage_snapshots()
+    elif args.export_bundle:
+        export_bundle(args.export_bundle)
+    elif args.import_bundle:
+        import_bundle(args.import_bundle)
+    elif args.verify:
+        run_with_metrics("verify", verify_components, as_json=args.json)
+    elif args.verify_game:
+        verify_game(as_json=args.json)
+    elif args.record_game_manifest:
+        record_game_manifest(WineUtils().prefix_path)
+    elif args.analyze_frames:
+        analyze_frames(args.analyze_frames)
+    elif args.list_profiles:
+        list_profiles()
+    elif args.list_dxvk_presets:
+        list_dxvk_presets()
     elif args.execute or args.launcher:
-        execute_ephinea(launcher=args.launcher)
+        run_with_metrics("launch", execute_ephinea, launcher=args.launcher)
+    elif args.dxvk_preset:
+        set_dxvk_preset(args.dxvk_preset)
+    elif args.benchmark_probes:
+        benchmark_probes(args.benchmark_probes)
     else:
         script_name = os.path.basename(sys.argv[0])
         print(f"No action specified. Run with `./{script_name} -h` for help")
\ No newline at end of file
@@ -0,0 +1,306 @@
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import threading
+import subprocess
+import socketserver
+from daemon_client import DaemonError, get_socket_path, socket_dir_trusted, socket_trusted
+from prefix_cmds import WineUtils
+from game_supervisor import GameSupervisor
+from launch_profiles import LaunchProfileError, TUNING_KEYS, resolve_profile, profile_env
+from prefix_status import collect_status, get_pending_components
+from resource_sampler import find_prefix_processes
+from process_tuning import GAME_PROCESSES
+from preflight import raise_fd_limit
+from dxvk_config import config_env
+
+# optional user level daemon. owns the prefix, a persistent wineserver and the host probes,
+# so pso.py and the desktop shortcuts can just ask it to do things over a unix socket
+# protocol: client sends one json line {"action": ..., ...}, we answer with any number of
+# {"output": line} followed by one {"result": {...}}
+# zeroz/tj
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    def send(self, **message):
+        try:
+            self.wfile.write((json.dumps(message) + "\n").encode())
+            self.wfile.flush()
+        except OSError:
+            # client went away. whatever it asked for keeps running
+            pass
+
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            message = json.loads(line)
+            action = message["action"]
+        except (ValueError, KeyError, TypeError):
+            self.send(result={"ok": False, "error": "Malformed request"})
+            return
+        daemon = self.server.pso_daemon
+        handler = getattr(daemon, f"do_{action}", None)
+        if handler is None:
+            self.send(result={"ok": False, "error": f"Unknown action '{action}'"})
+            return
+        try:
+            result = handler(message, lambda text: self.send(output=text))
+        except Exception as e:
+            result = {"ok": False, "error": f"{action} failed: {e}"}
+        self.send(result=result)
+
+class PsoDaemon:
+    def __init__(self, prefix_path=None):
+        self.wine = WineUtils()
+        if prefix_path:
+            self.wine.prefix_path = prefix_path
+            self.wine.env["WINEPREFIX"] = prefix_path
+        self.prefix_path = self.wine.prefix_path
+        self.pso_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pso.py")
+        self.pso_bat_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "pso.bat")
+        self.supervisor = GameSupervisor(self.wine.get_log_dir())
+        self.started = time.time()
+        # install and uninstall rewrite the prefix, only one of them at a time and no launches meanwhile
+        self.busy = threading.Lock()
+        self.busy_action = None
+        self.probes = {}
+        self.probe_lock = threading.Lock()
+        self.server = None
+
+    def probe(self, name, func):
+        """Host probes are cached for the daemon's lifetime, install and uninstall clear them"""
+        with self.probe_lock:
+            if name not in self.probes:
+                self.probes[name] = func()
+            return self.probes[name]
+
+    def wine_version(self):
+        def run():
+            try:
+                result = subprocess.run(["wine", "--version"], stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                        stderr=subprocess.PIPE, universal_newlines=True, timeout=10, env=self.wine.env)
+            except (OSError, subprocess.TimeoutExpired):
+                return None
+            return result.stdout.strip() if result.returncode == 0 else None
+        return self.probe("wine_version", run)
+
+    def ensure_wineserver(self):
+        """Keep one persistent wineserver warm so launches skip wine's startup"""
+        if not os.path.isdir(self.prefix_path) or not self.wine_version():
+            return False
+        if "wineserver" in find_prefix_processes(self.prefix_path).values():
+            return True
+        subprocess.run(["wineserver", "-p"], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, env=self.wine.env)
+        return True
+
+    def info(self):
+        return {
+            "pid": os.getpid(),
+            "prefix": self.prefix_path,
+            "uptime": round(time.time() - self.started, 1),
+            "busy": self.busy_action,
+            "wine_version": self.wine_version(),
+        }
+
+    def _check_prefix(self, message):
+        requested = message.get("prefix")
+        if requested and os.path.realpath(requested) != os.path.realpath(self.prefix_path):
+            return {"ok": False, "fallback": True, "error": f"Daemon serves {self.prefix_path}, not {requested}"}
+        return None
+
+    def do_ping(self, message, output):
+        return {"ok": True, "daemon": self.info()}
+
+    def do_status(self, message, output):
+        mismatch = self._check_prefix(message)
+        if mismatch:
+            return mismatch
+        status = collect_status(self.prefix_path, self.wine.get_cache_dir(),
+                                check_shortcuts=not os.environ.get('PSO_SYSTEM_INSTALL'))
+        return {"ok": True, "status": status, "daemon": self.info()}
+
+    def do_launch(self, message, output):
+        mismatch = self._check_prefix(message)
+        if mismatch:
+            return mismatch
+        if self.busy_action:
+            return {"ok": False, "error": f"Daemon is busy with {self.busy_action}"}
+        if not os.path.exists(self.prefix_path):
+            return {"ok": False, "error": "Ephinea is not installed. Please install it first with -i"}
+        if not os.path.exists(self.pso_bat_path):
+            return {"ok": False, "error": f"pso.bat script not found at {self.pso_bat_path}"}
+
+        # deferred mono/gecko need installing or locking out first, pso.py handles that
+        if get_pending_components(self.prefix_path):
+            return {"ok": False, "fallback": True, "error": "Components still deferred"}
+
+        running = [name for name in find_prefix_processes(self.prefix_path).values() if name.lower() in GAME_PROCESSES]
+        if running:
+            return {"ok": False, "error": f"{running[0]} is already running in this prefix"}
+
+        # client's environment, so the game lands on the caller's display and audio session
+        env = dict(message.get("env") or os.environ)
+        env["WINEPREFIX"] = self.prefix_path
+        env["WINEDEBUG"] = "-all"
+        env.update(config_env(self.prefix_path))
+        profile = message.get("profile")
+        if profile:
+            try:
+                resolved = resolve_profile(profile)
+            except LaunchProfileError as e:
+                return {"ok": False, "error": str(e)}
+            # tuning watches the game from the launching process, leave it to pso.py
+            if any(resolved.get(key) is not None for key in TUNING_KEYS):
+                return {"ok": False, "fallback": True, "error": "Profile uses process tuning"}
+            env.update(profile_env(resolved))
+
+        self.ensure_wineserver()
+        command = ["wine", "cmd", "/c", self.pso_bat_path, "-e"]
+        if message.get("launcher"):
+            command.append("-l")
+        output(f"Command: {' '.join(command)}")
+        prefetcher = self.start_prefetch(message, env)
+        # persistent wineserver never exits, so don't wait on it
+        game_pid = self.supervisor.start(command, env, wait_wineserver=False)
+        if game_pid is None:
+            if prefetcher:
+                prefetcher.stop()
+            return {"ok": False, "error": "Launch failed. Check the session state in the logs folder"}
+        if prefetcher:
+            output("Prefetching the game files while it loads")
+            threading.Thread(target=self.finish_prefetch, args=(prefetcher,), name="prefetch-finish", daemon=True).start()
+        return {"ok": True, "pid": game_pid, "log": os.path.join(self.supervisor.log_dir, "game.log")}
+
+    def start_prefetch(self, message, env):
+        """Same prefetch as a pso.py launch. The daemon outlives the request, so it waits for the game instead"""
+        if message.get("no_prefetch"):
+            return None
+        from prefetch import Prefetcher, get_budget_bytes, supported
+        from prefix_status import get_install_dir
+        install_dir = get_install_dir(self.prefix_path)
+        if not supported() or not os.path.isdir(install_dir):
+            return None
+        prefetcher = Prefetcher(self.prefix_path, install_dir, get_budget_bytes(message.get("prefetch_mb"), env))
+        prefetcher.start()
+        return prefetcher
+
+    def finish_prefetch(self, prefetcher):
+        prefetcher.wait_loaded()
+        prefetcher.stop()
+        print(prefetcher.summary())
+        sys.stdout.flush()
+
+    def _run_pso(self, action, flags, message, output):
+        """Run pso.py locally for the heavy operations and stream its output back"""
+        if not self.busy.acquire(blocking=False):
+            return {"ok": False, "error": f"Daemon is busy with {self.busy_action}"}
+        self.busy_action = action
+        try:
+            env = dict(message.get("env") or os.environ)
+            env["WINEPREFIX"] = self.prefix_path
+            env["PSO_NO_DAEMON"] = "1"
+            process = subprocess.Popen([sys.executable, self.pso_script] + flags, stdin=subprocess.DEVNULL,
+                                       stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env)
+            for line in process.stdout:
+                output(line.decode(errors="replace").rstrip("\n"))
+            exit_code = process.wait()
+        finally:
+            # the prefix changed under us, probe again next time
+            with self.probe_lock:
+                self.probes.clear()
+            self.busy_action = None
+            self.busy.release()
+        if action == "install" and exit_code == 0:
+            self.ensure_wineserver()
+        return {"ok": exit_code == 0, "exit_code": exit_code}
+
+    def do_install(self, message, output):
+        mismatch = self._check_prefix(message)
+        if mismatch:
+            return mismatch
+        flags = ["-i"] + (["--skip-dxvk-install"] if message.get("skip_dxvk") else [])
+        flags += ["--fresh-install"] if message.get("fresh_install") else []
+        flags += ["--lazy-components"] if message.get("lazy_components") else []
+        flags += ["--dxvk-preset", message["dxvk_preset"]] if message.get("dxvk_preset") else []
+        flags += ["--fixed-timeouts"] if message.get("fixed_timeouts") else []
+        flags += ["--cache-max-mb", str(message["cache_max_mb"])] if message.get("cache_max_mb") is not None else []
+        return self._run_pso("install", flags, message, output)
+
+    def do_uninstall(self, message, output):
+        mismatch = self._check_prefix(message)
+        if mismatch:
+            return mismatch
+        return self._run_pso("uninstall", ["-u"], message, output)
+
+    def do_shutdown(self, message, output):
+        # shutdown() blocks until serve_forever returns, so it can't run on a request thread
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+        return {"ok": True}
+
+    def stop_wineserver(self):
+        """Drop the persistent wineserver unless something is still running in the prefix"""
+        if not os.path.isdir(self.prefix_path):
+            return
+        if any(name != "wineserver" for name in find_prefix_processes(self.prefix_path, wine_only=True).values()):
+            return
+        subprocess.run(["wineserver", "-k"], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, env=self.wine.env)
+
+def _claim_socket(socket_path):
+    """Remove a stale socket, refuse if another daemon still answers on it"""
+    # the private fallback directory under /tmp, only ever created by us
+    os.makedirs(os.path.dirname(os.path.abspath(socket_path)), mode=0o700, exist_ok=True)
+    if not socket_dir_trusted(socket_path):
+        raise DaemonError(f"{os.path.dirname(socket_path)} is not ours or others can write to it")
+    if not os.path.lexists(socket_path):
+        return
+    if not socket_trusted(socket_path):
+        raise DaemonError(f"{socket_path} belongs to someone else, refusing to use it")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.unlink(socket_path)
+        return
+    finally:
+        probe.close()
+    raise DaemonError(f"A daemon is already listening on {socket_path}")
+
+def serve(prefix_path=None):
+    """Run the daemon in the foreground until shutdown or SIGTERM"""
+    socket_path = get_socket_path()
+    _claim_socket(socket_path)
+
+    # games we launch inherit our limits, esync needs the higher fd limit
+    raise_fd_limit()
+    daemon = PsoDaemon(prefix_path)
+    # socket is only for us
+    old_umask = os.umask(0o077)
+    try:
+        server = socketserver.ThreadingUnixStreamServer(socket_path, DaemonRequestHandler)
+    finally:
+        os.umask(old_umask)
+    server.daemon_threads = True
+    server.pso_daemon = daemon
+    daemon.server = server
+
+    def on_signal(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+    signal.signal(signal.SIGTERM, on_signal)
+    signal.signal(signal.SIGINT, on_signal)
+
+    if daemon.ensure_wineserver():
+        print(f"Persistent wineserver running for {daemon.prefix_path}")
+    print(f"pso_wine daemon listening on {socket_path} (pid {os.getpid()})")
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        daemon.stop_wineserver()
+        print("pso_wine daemon stopped")
@@ -0,0 +1,183 @@
+import os
+import time
+import threading
+
+# samples /proc for every wine process running in our prefix while the game is up
+# only reads a few small proc files per process per tick, so 1 Hz costs next to nothing
+# zeroz/tj
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+CSV_HEADER = "time,pid,name,rss_kb,cpu_pct,voluntary_ctxt,nonvoluntary_ctxt,read_bytes,write_bytes\n"
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8", "ignore")
+
+def is_wine_process(name):
+    # wine, wineserver, the preloaders and every windows program (services.exe, PsoBB.exe ...)
+    return name.startswith("wine") or name.lower().endswith(".exe")
+
+def find_prefix_processes(prefix_path, wine_only=False):
+    """Return {pid: name} for our own processes whose WINEPREFIX is prefix_path"""
+    wanted = f"WINEPREFIX={os.path.realpath(prefix_path)}".encode()
+    wanted_raw = f"WINEPREFIX={prefix_path}".encode()
+    uid = os.getuid()
+    # shortcuts export WINEPREFIX into our own env too, never count ourselves
+    own_pid = os.getpid()
+    found = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return found
+
+    for entry in entries:
+        if not entry.isdigit() or int(entry) == own_pid:
+            continue
+        proc_dir = f"/proc/{entry}"
+        try:
+            if os.stat(proc_dir).st_uid != uid:
+                continue
+            with open(f"{proc_dir}/environ", "rb") as f:
+                environ = f.read().split(b"\0")
+            if wanted not in environ and wanted_raw not in environ:
+                continue
+            name = _read(f"{proc_dir}/comm").strip()
+            # a shell or script with WINEPREFIX exported isn't wine
+            if wine_only and not is_wine_process(name):
+                continue
+            found[int(entry)] = name
+        except OSError:
+            continue
+    return found
+
+def read_process_sample(pid):
+    """One reading of cpu ticks, rss, context switches and io for pid"""
+    stat = _read(f"/proc/{pid}/stat")
+    # comm can have spaces and parens in it, fields after the last ')' are fixed
+    fields = stat[stat.rindex(")") + 2:].split()
+    cpu_ticks = int(fields[11]) + int(fields[12])
+
+    rss_kb = voluntary = nonvoluntary = 0
+    for line in _read(f"/proc/{pid}/status").splitlines():
+        if line.startswith("VmRSS:"):
+            rss_kb = int(line.split()[1])
+        elif line.startswith("voluntary_ctxt_switches:"):
+            voluntary = int(line.split()[1])
+        elif line.startswith("nonvoluntary_ctxt_switches:"):
+            nonvoluntary = int(line.split()[1])
+
+    read_bytes = write_bytes = 0
+    try:
+        for line in _read(f"/proc/{pid}/io").splitlines():
+            if line.startswith("read_bytes:"):
+                read_bytes = int(line.split()[1])
+            elif line.startswith("write_bytes:"):
+                write_bytes = int(line.split()[1])
+    except OSError:
+        # io needs ptrace access, some kernels/yama settings block it
+        pass
+
+    return cpu_ticks, rss_kb, voluntary, nonvoluntary, read_bytes, write_bytes
+
+class ResourceSampler:
+    def __init__(self, prefix_path, output_path, interval=1.0, rescan_every=5):
+        self.prefix_path = prefix_path
+        self.output_path = output_path
+        self.interval = interval
+        # full /proc scans are the expensive part, only redo them every few ticks
+        self.rescan_every = rescan_every
+        self.processes = {}
+        self.stats = {}
+        self._previous = {}
+        self._stop = threading.Event()
+        self._command_done = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+
+    def finish(self, timeout=None):
+        """Launch command is done. Keep sampling until the prefix goes idle, then stop"""
+        self._command_done.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+        with open(self.output_path, "w") as out:
+            out.write(CSV_HEADER)
+            tick = 0
+            while not self._stop.is_set():
+                command_done = self._command_done.is_set()
+                # once the launch command is done, an empty process list gets a fresh scan before we give up
+                if tick % self.rescan_every == 0 or (command_done and not self.processes):
+                    self.processes = find_prefix_processes(self.prefix_path)
+                out.writelines(self.sample(time.time()))
+                if command_done and not self.processes:
+                    break
+                tick += 1
+                self._stop.wait(self.interval)
+
+    def sample(self, now):
+        rows = []
+        for pid, name in list(self.processes.items()):
+            try:
+                cpu_ticks, rss_kb, voluntary, nonvoluntary, read_bytes, write_bytes = read_process_sample(pid)
+            except (OSError, ValueError, IndexError):
+                del self.processes[pid]
+                continue
+
+            cpu_pct = 0.0
+            previous = self._previous.get(pid)
+            if previous and now > previous[0]:
+                cpu_pct = (cpu_ticks - previous[1]) / CLOCK_TICKS / (now - previous[0]) * 100
+            self._previous[pid] = (now, cpu_ticks)
+
+            stats = self.stats.get(pid)
+            if stats is None:
+                stats = self.stats[pid] = {
+                    "name": name, "samples": 0, "first_rss_kb": rss_kb, "peak_rss_kb": 0,
+                    "cpu_total": 0.0, "peak_cpu": 0.0,
+                    "first_ctxt": (voluntary, nonvoluntary), "first_io": (read_bytes, write_bytes),
+                    "started": now,
+                }
+            stats["samples"] += 1
+            stats["last_rss_kb"] = rss_kb
+            stats["peak_rss_kb"] = max(stats["peak_rss_kb"], rss_kb)
+            stats["cpu_total"] += cpu_pct
+            stats["peak_cpu"] = max(stats["peak_cpu"], cpu_pct)
+            stats["last_ctxt"] = (voluntary, nonvoluntary)
+            stats["last_io"] = (read_bytes, write_bytes)
+            stats["ended"] = now
+
+            rows.append(f"{now:.3f},{pid},{name},{rss_kb},{cpu_pct:.1f},"
+                        f"{voluntary},{nonvoluntary},{read_bytes},{write_bytes}\n")
+        return rows
+
+    def summary(self):
+        if not self.stats:
+            return "Resource sampler: no wine processes seen in the prefix"
+        lines = [f"Resource summary ({self.output_path}):"]
+        lines.append(f"  {'process':<16}{'pid':>8}{'time':>8}{'rss peak':>11}{'rss growth':>12}"
+                     f"{'cpu avg':>9}{'cpu peak':>10}{'ctxt vol':>10}{'ctxt inv':>10}{'read':>10}{'written':>10}")
+        for pid, stats in sorted(self.stats.items()):
+            duration = stats["ended"] - stats["started"]
+            growth = stats["last_rss_kb"] - stats["first_rss_kb"]
+            voluntary = stats["last_ctxt"][0] - stats["first_ctxt"][0]
+            nonvoluntary = stats["last_ctxt"][1] - stats["first_ctxt"][1]
+            read_mb = (stats["last_io"][0] - stats["first_io"][0]) / 1048576
+            write_mb = (stats["last_io"][1] - stats["first_io"][1]) / 1048576
+            # first sample has no cpu delta yet, leave it out of the average
+            cpu_avg = stats["cpu_total"] / max(1, stats["samples"] - 1)
+            lines.append(f"  {stats['name'][:15]:<16}{pid:>8}{duration:>7.0f}s"
+                         f"{stats['peak_rss_kb'] / 1024:>8.1f} MB{growth / 1024:>+9.1f} MB"
+                         f"{cpu_avg:>8.1f}%{stats['peak_cpu']:>9.1f}%{voluntary:>10}{nonvoluntary:>10}"
+                         f"{read_mb:>7.1f} MB{write_mb:>7.1f} MB")
+        return "\n".join(lines)
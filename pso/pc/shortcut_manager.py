@@ -15,6 +15,8 @@ class ShortcutManager(CommandRunner):
         # Get script paths
         self.pso_script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pso.py")
         self.pso_script_dir = os.path.dirname(self.pso_script_path)
+        # shortcuts use the fast start entry, it hands anything it doesn't know to pso.py
+        self.launch_script_path = os.path.join(self.pso_script_dir, "launch.py")
 
         self.resources_dir = os.environ.get('PSO_RESOURCES_DIR') or os.path.join(os.path.dirname(self.pso_script_dir), "resources")
 
@@ -74,8 +76,8 @@ class ShortcutManager(CommandRunner):
 
         # Update system caches
         applications_dir = os.path.expanduser("~/.local/share/applications")
-        self.run_command(["update-desktop-database", applications_dir], timeout=10)
-        self.run_command(["gtk-update-icon-cache", self.local_icons_dir, "-f"], timeout=10)
+        self.run_probe(["update-desktop-database", applications_dir], timeout=10)
+        self.run_probe(["gtk-update-icon-cache", self.local_icons_dir, "-f"], timeout=10)
 
     def _remove_mac_wine_shortcuts(self):
         wineicons_dir = os.path.expanduser("~/Applications/Wine")
@@ -146,7 +148,7 @@ class ShortcutManager(CommandRunner):
             desktop_entry = desktop_entry_template.format(
                 name=shortcut["name"],
                 wine_prefix=self.prefix_path,
-                script_path=self.pso_script_path,
+                script_path=self.launch_script_path,
                 args=shortcut["args"],
                 icon_path=icon_path,
                 work_path=self.pso_script_dir,
@@ -160,8 +162,8 @@ class ShortcutManager(CommandRunner):
 
         # update icon cache
         # needs sudo sometimes. nbd
-        self.run_command(["update-desktop-database", applications_dir], timeout=10)
-        self.run_command(["gtk-update-icon-cache", self.local_icons_dir, "-f"], timeout=10)
+        self.run_probe(["update-desktop-database", applications_dir], timeout=10)
+        self.run_probe(["gtk-update-icon-cache", self.local_icons_dir, "-f"], timeout=10)
 
 
     def _create_macos_shortcuts(self):
@@ -203,7 +205,7 @@ class ShortcutManager(CommandRunner):
                     # various sizes
                     sizes = [16, 32, 128, 256, 512]
                     for size in sizes:
-                        self.run_command([
+                        self.run_probe([
                             "sips",
                             "-z", str(size), str(size),
                             shortcut["icon"],
@@ -212,7 +214,7 @@ class ShortcutManager(CommandRunner):
                         ], timeout=30)
                         # 2x versions for Retina
                         if size <= 256:
-                            self.run_command([
+                            self.run_probe([
                                 "sips",
                                 "-z", str(size*2), str(size*2),
                                 shortcut["icon"],
@@ -221,7 +223,7 @@ class ShortcutManager(CommandRunner):
                             ], timeout=30)
                     
                     # convert iconset to icns
-                    self.run_command(["iconutil", "-c", "icns", iconset_path, "-o", icon_dest], timeout=30)
+                    self.run_probe(["iconutil", "-c", "icns", iconset_path, "-o", icon_dest], timeout=30)
                     
                     # cleanup
                     shutil.rmtree(iconset_path)
@@ -255,7 +257,7 @@ class ShortcutManager(CommandRunner):
                 <true/>
                 <key>CFBundleExecutableParameters</key>
                 <array>
-                    <string>{self.pso_script_path}</string>
+                    <string>{self.launch_script_path}</string>
                     <string>{shortcut['args']}</string>
                 </array>
                 <key>WorkingDirectory</key>
@@ -290,8 +292,8 @@ class ShortcutManager(CommandRunner):
                 if os.path.exists(icon_path):
                     os.remove(icon_path)
 
-        self.run_command(["update-desktop-database", applications_dir], timeout=10)
-        self.run_command(["gtk-update-icon-cache", self.local_icons_dir, "-f"], timeout=10)
+        self.run_probe(["update-desktop-database", applications_dir], timeout=10)
+        self.run_probe(["gtk-update-icon-cache", self.local_icons_dir, "-f"], timeout=10)
 
     def _cleanup_macos_shortcuts(self):
         applications_dir = os.path.expanduser("~/Applications")
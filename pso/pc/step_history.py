@@ -0,0 +1,202 @@
+import os
+import time
+import platform
+import threading
+from cmd_runner import CommandResult
+
+# how long each install step took on this host with this wine, in a small sqlite file.
+# past runs set the timeouts (a hung msiexec gets killed instead of blocking forever),
+# flag a step that runs well past its usual time, and give the install an ETA
+# zeroz/tj
+
+# timeout is the 95th percentile of past runs times this
+SAFETY_FACTOR = 3
+# and at least this many seconds over it, so quick steps don't get hair trigger timeouts
+MIN_HEADROOM = 15
+# successful runs needed before history replaces the built in timeout
+MIN_SAMPLES = 3
+# only the most recent runs count, hosts and prefixes change
+MAX_SAMPLES = 20
+# a step past its 95th percentile times this, and at least SLOW_MARGIN over its median, gets a warning
+SLOW_FACTOR = 1.5
+SLOW_MARGIN = 10
+# steps that usually finish quicker than this don't get an ETA line
+ANNOUNCE_SECONDS = 3
+# steps that wait on someone clicking through a wizard. history still feeds the ETA, but they never time out
+INTERACTIVE_STEPS = ("game:installer",)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY, operation TEXT, host TEXT, wine_version TEXT,
+    started REAL, finished REAL, ok INTEGER
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER, seq INTEGER, host TEXT, wine_version TEXT, step TEXT,
+    duration REAL, ok INTEGER, recorded REAL
+);
+CREATE INDEX IF NOT EXISTS steps_key ON steps (host, wine_version, step);
+"""
+
+def get_history_path():
+    if 'PSO_HISTORY_DB' in os.environ:
+        return os.environ['PSO_HISTORY_DB']
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.expanduser("~/.local/share")
+    return os.path.join(data_home, "pso_wine", "step_history.sqlite")
+
+def step_name(phase, command, label=None):
+    """'mono:wine msiexec wine-mono-8.1.0-x86.msi'. Installers are told apart by the file they run"""
+    name = label or CommandResult(0, command).name
+    if not label:
+        for arg in reversed(command):
+            if str(arg).lower().endswith((".msi", ".exe")):
+                name = f"{name} {os.path.basename(str(arg))}"
+                break
+    return f"{phase or 'other'}:{name}"
+
+def percentile(values, fraction):
+    """Nearest rank percentile, fine for twenty samples"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def format_seconds(seconds):
+    seconds = int(round(seconds))
+    return f"{seconds // 60}m{seconds % 60:02d}s" if seconds >= 60 else f"{seconds}s"
+
+class StepHistory:
+    def __init__(self, wine_version, path=None, host=None):
+        # sqlite3 is only worth importing for installs
+        import sqlite3
+        self.path = path or get_history_path()
+        self.host = host or platform.node()
+        self.wine_version = wine_version or "unknown"
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # a second install at the same time waits for the write lock instead of failing
+        self.db = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def durations(self, step):
+        """Recent successful durations of a step, newest first"""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT duration FROM steps WHERE host = ? AND wine_version = ? AND step = ? AND ok = 1 "
+                "ORDER BY recorded DESC LIMIT ?", (self.host, self.wine_version, step, MAX_SAMPLES)).fetchall()
+        return [row[0] for row in rows]
+
+    def stats(self, step):
+        """{'median', 'p95', 'samples'} or None until there are enough runs"""
+        durations = self.durations(step)
+        if len(durations) < MIN_SAMPLES:
+            return None
+        return {"median": percentile(durations, 0.5), "p95": percentile(durations, 0.95), "samples": len(durations)}
+
+    def timeout_for(self, step, default):
+        stats = self.stats(step)
+        if stats is None:
+            return default
+        return max(stats["p95"] * SAFETY_FACTOR, stats["p95"] + MIN_HEADROOM)
+
+    def last_run_steps(self, operation):
+        """Step sequence of the last finished run of operation, for the ETA"""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT id FROM runs WHERE operation = ? AND host = ? AND wine_version = ? AND ok = 1 "
+                "ORDER BY finished DESC LIMIT 1", (operation, self.host, self.wine_version)).fetchone()
+            if row is None:
+                return []
+            return [r[0] for r in self.db.execute("SELECT step FROM steps WHERE run_id = ? ORDER BY seq", (row[0],))]
+
+    def start_run(self, operation):
+        with self.lock, self.db:
+            cursor = self.db.execute("INSERT INTO runs (operation, host, wine_version, started) VALUES (?, ?, ?, ?)",
+                                     (operation, self.host, self.wine_version, time.time()))
+        return cursor.lastrowid
+
+    def finish_run(self, run_id, ok):
+        with self.lock, self.db:
+            self.db.execute("UPDATE runs SET finished = ?, ok = ? WHERE id = ?", (time.time(), 1 if ok else 0, run_id))
+
+    def record(self, run_id, seq, step, duration, ok):
+        with self.lock, self.db:
+            self.db.execute("INSERT INTO steps VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            (run_id, seq, self.host, self.wine_version, step, duration, 1 if ok else 0, time.time()))
+
+class InstallProgress:
+    """Adaptive timeouts, slow step warnings and a running ETA for one install"""
+    def __init__(self, history, operation, adaptive=True, output=print):
+        self.history = history
+        self.operation = operation
+        self.adaptive = adaptive
+        self.output = output
+        self.run_id = history.start_run(operation)
+        self.planned = history.last_run_steps(operation)
+        self.done = []
+        self.slow_steps = []
+        self._timer = None
+
+    def eta(self):
+        """Seconds left going by the last run's steps that haven't run yet, None without history"""
+        if not self.planned:
+            return None
+        remaining = list(self.planned)
+        for step in self.done:
+            if step in remaining:
+                remaining.remove(step)
+        total = 0.0
+        for step in remaining:
+            stats = self.history.stats(step)
+            if stats is None:
+                # new step since then, the older history is all we can go by
+                durations = self.history.durations(step)
+                total += durations[0] if durations else 0
+            else:
+                total += stats["median"]
+        return total
+
+    def start_step(self, step, timeout):
+        """Announce the step and return the timeout to run it with"""
+        try:
+            stats = self.history.stats(step)
+        except Exception as e:
+            # a locked or broken history file shouldn't stop the install, run with the built in timeout
+            self.output(f"Warning: Could not read the install history: {e}")
+            stats = None
+        interactive = step in INTERACTIVE_STEPS
+        if self.adaptive and stats is not None and not interactive:
+            timeout = self.history.timeout_for(step, timeout)
+        if stats is not None and stats["median"] >= ANNOUNCE_SECONDS:
+            eta = self.eta()
+            self.output(f"Step {step}: usually {format_seconds(stats['median'])}"
+                        + (f", timeout {format_seconds(timeout)}" if timeout else "")
+                        + (f". Install ETA ~{format_seconds(eta)}" if eta is not None else ""))
+        self.started = time.monotonic()
+        if stats is not None and not interactive:
+            threshold = max(stats["p95"] * SLOW_FACTOR, stats["median"] + SLOW_MARGIN)
+            self._timer = threading.Timer(threshold, self._warn_slow, args=(step, stats))
+            self._timer.daemon = True
+            self._timer.start()
+        return timeout
+
+    def _warn_slow(self, step, stats):
+        self.slow_steps.append(step)
+        self.output(f"Warning: {step} is running slow, {format_seconds(time.monotonic() - self.started)} so far, "
+                    f"usually {format_seconds(stats['median'])} (95% under {format_seconds(stats['p95'])})")
+
+    def finish_step(self, step, result):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        ok = result == 0 and not result.timed_out and not result.killed
+        if result.timed_out and self.adaptive:
+            self.output(f"{step} went past its timeout from the install history. "
+                        "Use --fixed-timeouts if this machine is just slower today")
+        try:
+            self.history.record(self.run_id, len(self.done), step, result.wall_time, ok)
+        except Exception as e:
+            # the history is a nice to have, never let it break an install
+            self.output(f"Warning: Could not record step timing: {e}")
+        self.done.append(step)
+
+    def finish(self, ok):
+        self.history.finish_run(self.run_id, ok)
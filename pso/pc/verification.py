@@ -0,0 +1,102 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# runs component checks as independent tasks on a thread pool
+# a task can produce several checks (one registry export feeds mono, gecko and dxvk)
+# zeroz/tj
+
+class CheckResult:
+    def __init__(self, component, name, ok, detail="", seconds=0.0, required=True):
+        self.component = component
+        self.name = name
+        self.ok = bool(ok)
+        self.detail = detail
+        self.seconds = seconds
+        # informational checks show up in the report but don't fail verification
+        self.required = required
+
+    def to_dict(self):
+        return {
+            "component": self.component,
+            "check": self.name,
+            "ok": self.ok,
+            "detail": self.detail,
+            "seconds": round(self.seconds, 4),
+            "required": self.required,
+        }
+
+class VerificationReport:
+    def __init__(self, results, wall_seconds, task_seconds):
+        self.results = results
+        self.wall_seconds = wall_seconds
+        # what the same checks would have cost run one after another
+        self.serial_seconds = sum(task_seconds)
+
+    @property
+    def ok(self):
+        return all(result.ok for result in self.results if result.required)
+
+    def components(self):
+        components = {}
+        for result in self.results:
+            components.setdefault(result.component, []).append(result)
+        return components
+
+    def component_ok(self, component):
+        return all(r.ok for r in self.results if r.component == component and r.required)
+
+    def to_dict(self):
+        return {
+            "ok": self.ok,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "serial_seconds": round(self.serial_seconds, 4),
+            "components": {name: {"ok": self.component_ok(name), "checks": [r.to_dict() for r in results]}
+                           for name, results in self.components().items()},
+        }
+
+    def format(self):
+        lines = []
+        for component, results in self.components().items():
+            lines.append(f"\n{component}: {'passed' if self.component_ok(component) else 'failed'}")
+            for result in results:
+                mark = "✓" if result.ok else ("✗" if result.required else "-")
+                detail = f" ({result.detail})" if result.detail else ""
+                lines.append(f"  {mark} {result.name}{detail} [{result.seconds * 1000:.0f} ms]")
+        lines.append(f"\nVerification {'passed' if self.ok else 'failed'} in {self.wall_seconds:.2f}s "
+                     f"(checks took {self.serial_seconds:.2f}s back to back)")
+        return "\n".join(lines)
+
+class VerificationEngine:
+    def __init__(self, max_workers=8):
+        self.max_workers = max_workers
+        self.tasks = []
+
+    def add(self, component, name, func, required=True):
+        """func returns (ok, detail) for a single check, or a list of (component, name, ok, detail)"""
+        self.tasks.append((component, name, func, required))
+
+    def _run_task(self, component, name, func, required):
+        start = time.time()
+        try:
+            outcome = func()
+        except Exception as e:
+            seconds = time.time() - start
+            return seconds, [CheckResult(component, name, False, f"error: {e}", seconds, required)]
+        seconds = time.time() - start
+        # checks from one task all share its time
+        if isinstance(outcome, list):
+            return seconds, [CheckResult(c, n, ok, detail, seconds, required) for c, n, ok, detail in outcome]
+        ok, detail = outcome
+        return seconds, [CheckResult(component, name, ok, detail, seconds, required)]
+
+    def run(self):
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self._run_task, *task) for task in self.tasks]
+            results = []
+            task_seconds = []
+            for future in futures:
+                seconds, task_results = future.result()
+                task_seconds.append(seconds)
+                results.extend(task_results)
+        return VerificationReport(results, time.time() - start, task_seconds)
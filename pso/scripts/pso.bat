@@ -6,6 +6,7 @@ set "install=0"
 set "uninstall=0"
 set "launcher=0"
 set "desktop_shortcuts=0"
+set "payload_installed=0"
 
 :: made by zeroz41, tj
 
@@ -68,10 +69,17 @@ for %%a in (%*) do (
         if "%%a"=="-s" (
             set "desktop_shortcuts=1"
         )
+        if "%%a"=="-p" (
+            set "payload_installed=1"
+        )
     )
 )
 
 :: Only check for installer if installing
+:: -p means pso.py already laid the game files out from its payload store, no installer needed
+if %payload_installed% equ 1 (
+    goto continue
+)
 if %install% equ 1 (
     if not defined installer_path (
         echo Installer path not provided. Trying default path...
@@ -203,6 +211,10 @@ set "total_size=1334232"
 ::want to put a live progress bar in batch. having trouble...removing for now (better with python)
 :: again cmd script is trash and requires creativity. multithreading...
 setlocal enabledelayedexpansion
+if %payload_installed% equ 1 (
+    echo Game files already in place from the payload store, skipping the installer
+    goto installed
+)
 echo Running the installer in silent mode...
 :: Debugging echo to ensure paths are correct
 echo Installer Path: !installer_path!
@@ -214,6 +226,8 @@ echo "!installer_path!" /S /D=!install_dir!
 
 echo Installation completed.
 
+:installed
+
 call :remove_unwanted_shortcuts
 call :create_wanted_shortcuts
 